@@ -1,5 +1,7 @@
 import pygame
 
+from ui.fonts import get_font, render_text
+
 class Camera:
     
     def __init__(self, width, height):
@@ -61,8 +63,8 @@ class Camera:
         return (x, y)
     
     def death_screen(self, screen, player, reset_callback):
-        fonte = pygame.font.SysFont(None, 60)
-        texto = fonte.render('Colisão Detectada! Pressione R para reiniciar', True, (255, 0, 0))
+        fonte = get_font(None, 60)
+        texto = render_text(fonte, 'Colisão Detectada! Pressione R para reiniciar', (255, 0, 0))
         # Use event.pump() + key polling to avoid pygame.event.get() internal
         # conversion errors which on some systems raise SystemError(KeyError).
         while player.is_dead():
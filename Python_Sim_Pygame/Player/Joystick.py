@@ -9,35 +9,106 @@ to process pending CAN messages non-blocking. The class exposes:
 - getJoystickValues() -> (lx, ly, rx, ry)
 - getLightsValues() -> list of booleans
 - currentMode, hasChangedMode for selector messages
+- snapshot() -> JoystickState, the decoded state as one immutable tuple
+
+Reader modes (`reader=`):
+- 'poll' (default): poll() drains the bus and decodes, on the render loop.
+- 'notifier': a can.Notifier thread decodes every frame as it arrives and
+  publishes a new JoystickState; getJoystickValues()/getTractionValue() (read
+  by the logic tick) return the latest one, and poll() only applies it to the
+  attributes above and forwards image ids to the UI manager (main thread).
+  refresh(), called by every logic tick, applies it too, so mode, speed and
+  lights come from the same snapshot as the axes the tick reads. This takes
+  the decoding off the main loop; it does not lower the input latency, as
+  the ticks run right after poll() (benchmarks/bench_input_latency.py).
+  The snapshot is replaced as a whole (one reference swap), so a reader never
+  sees half of an update and needs no lock.
+
+Transmit modes (`tx=`) for send_inclinometer()/send_sim_traction():
+- 'sync' (default): bus.send() right away, in the logic tick.
+- 'scheduler': the frame is handed to a CanTxScheduler (Player/can_tx.py),
+  which keeps the latest value per id and sends it from its own thread at
+  tx_rate_hz, on change plus a heartbeat. tx_stats() reports its counters.
 
 If CAN is not available the adapter will set `available = False` and
-main should fall back to keyboard control.
+main should fall back to keyboard control. A bus can be passed in (e.g.
+python-can's 'virtual' interface) instead of opening the PCAN adapter.
+
+Payloads are decoded and encoded with the codec table of Player/can_codec.py
+(one precompiled struct.Struct per arbitration id).
 """
-import struct
 import time
+from collections import namedtuple
 try:
     import can
 except Exception:
     can = None
 from Player import GLV as GVL
 import Player.Player as player
+from Player.can_codec import (
+    RX_CODECS, TX_CODECS, JOYSTICK_ID, SELECTOR_ID, LIGHTS_ID, SPEED_ID, TRACTION_ID, IMAGE_ID_ID,
+    INCLINOMETER_ID, SIM_TRACTION_ID,
+)
+from Player.can_tx import CanTxScheduler, DEFAULT_TX_HEARTBEAT_S, DEFAULT_TX_RATE_HZ
+
+
+CAN_READER_MODES = ('poll', 'notifier')
+CAN_TX_MODES = ('sync', 'scheduler')
+
+# Traction falls back to 0 (parado) when no traction frame arrived for this long
+TRACTION_TIMEOUT_S = 0.5
+
+# Decoded joystick state. *_seq count the changes of mode/speed/image id (so a
+# consumer can tell a new value from a repeated one) and *_time are the
+# time.time() the last frame of each kind was received.
+JoystickState = namedtuple('JoystickState', (
+    'lx', 'ly', 'rx', 'ry',
+    'mode', 'speed', 'lights', 'traction', 'image_id',
+    'mode_seq', 'speed_seq', 'image_seq', 'frames',
+    'axes_time', 'mode_time', 'speed_time', 'lights_time', 'traction_time', 'image_time',
+))
+
+EMPTY_STATE = JoystickState(
+    0.0, 0.0, 0.0, 0.0,
+    0, 0, (False, False, False, False, False), 0, None,
+    0, 0, 0, 0,
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+)
+
+
+def traction_at(state, now):
+    """Traction of `state`, 0 if its last traction frame is older than TRACTION_TIMEOUT_S."""
+    if now - state.traction_time > TRACTION_TIMEOUT_S:
+        return 0
+    return state.traction
 
 
 class Joystick:
-    def __init__(self, ui_manager=None):
+    def __init__(self, ui_manager=None, reader='poll', bus=None, tx='sync',
+                 tx_rate_hz=DEFAULT_TX_RATE_HZ, tx_heartbeat_s=DEFAULT_TX_HEARTBEAT_S):
         # CAN configuration (same as original)
         self.BITRATE = 500000
-        self.CAN_CHANNEL_JOYSTICK = 0x200
-        self.CAN_CHANNEL_SELETORA = 0x201
-        self.CAN_CHANNEL_LIGHTS = 0x202
-        self.CAN_CHANNEL_SPEED = 0x203
+        # ids and payload layouts: Player/can_codec.py
+        self.CAN_CHANNEL_JOYSTICK = JOYSTICK_ID
+        self.CAN_CHANNEL_SELETORA = SELECTOR_ID
+        self.CAN_CHANNEL_LIGHTS = LIGHTS_ID
+        self.CAN_CHANNEL_SPEED = SPEED_ID
         # additional channel: external system sends image IDs (e.g. ASCII '0C')
-        self.CAN_CHANNEL_IMAGE_ID = 0x210
-        self.CAN_CHANNEL_TRACTION = 0x204  
+        self.CAN_CHANNEL_IMAGE_ID = IMAGE_ID_ID
+        self.CAN_CHANNEL_TRACTION = TRACTION_ID
         # channel to send virtual inclinometer/accelerometer
-        self.CAN_CHANNEL_INCLINOMETER = 0x220
+        self.CAN_CHANNEL_INCLINOMETER = INCLINOMETER_ID
         # channel to send simulated traction
-        self.CAN_CHANNEL_SIM_TRACTION = 0x222
+        self.CAN_CHANNEL_SIM_TRACTION = SIM_TRACTION_ID
+        # arbitration id -> (codec decode, state update)
+        self._rx_table = {
+            self.CAN_CHANNEL_JOYSTICK: (RX_CODECS[JOYSTICK_ID].decode, self._rx_axes),
+            self.CAN_CHANNEL_SELETORA: (RX_CODECS[SELECTOR_ID].decode, self._rx_mode),
+            self.CAN_CHANNEL_LIGHTS: (RX_CODECS[LIGHTS_ID].decode, self._rx_lights),
+            self.CAN_CHANNEL_SPEED: (RX_CODECS[SPEED_ID].decode, self._rx_speed),
+            self.CAN_CHANNEL_IMAGE_ID: (RX_CODECS[IMAGE_ID_ID].decode, self._rx_image_id),
+            self.CAN_CHANNEL_TRACTION: (RX_CODECS[TRACTION_ID].decode, self._rx_traction),
+        }
 
         # state
         self.lights = [False, False, False, False, False]
@@ -55,23 +126,52 @@ class Joystick:
         self._last_image_id = None
         # optional UI manager (or any callable with set_image_id method)
         self.ui_manager = ui_manager
+        # optional game.latency.InputLatencyTracer: told when each frame is decoded
+        self.latency_tracer = None
+        # optional Player.can_injector.JoystickInjector feeding a virtual bus (stopped by close())
+        self.injector = None
+
+        # decoded state, replaced as a whole on every frame (see snapshot())
+        self._state = EMPTY_STATE
+        self._applied = EMPTY_STATE
+        self.reader = reader if reader in CAN_READER_MODES else 'poll'
+        self._notifier = None
+        self.tx = tx if tx in CAN_TX_MODES else 'sync'
+        self._tx = None
 
         self.bus = None
         self.available = False
 
         # try to open CAN bus
         try:
-            self.configCan()
+            self.configCan(bus)
             self.available = True
         except Exception as e:
             # keep available False and continue; main will fallback to keyboard
             print(f"[Joystick] CAN not available: {e}. Falling back to keyboard.")
+            return
 
-    def configCan(self):
+        if self.reader == 'notifier':
+            try:
+                self._notifier = can.Notifier(self.bus, [self._on_frame], timeout=0.1)
+            except Exception as e:
+                print(f"[Joystick] CAN reader thread failed: {e}. Polling from the main loop.")
+                self.reader = 'poll'
+
+        if self.tx == 'scheduler':
+            try:
+                self._tx = CanTxScheduler(self.bus, rate_hz=tx_rate_hz, heartbeat_s=tx_heartbeat_s).start()
+            except Exception as e:
+                print(f"[Joystick] CAN transmit thread failed: {e}. Sending from the logic tick.")
+                self.tx = 'sync'
+
+    def configCan(self, bus=None):
         if can is None:
             raise RuntimeError("python-can is not installed")
         # create bus (this may raise if no hardware)
-        self.bus = can.interface.Bus(channel='PCAN_USBBUS1', interface='pcan', bitrate=self.BITRATE)
+        if bus is None:
+            bus = can.interface.Bus(channel='PCAN_USBBUS1', interface='pcan', bitrate=self.BITRATE)
+        self.bus = bus
         # drain any existing messages
         while True:
             msg = self.bus.recv(timeout=0.01)
@@ -80,6 +180,27 @@ class Joystick:
 
     def close(self):
         """Release CAN resources so a new controller instance can reconnect cleanly."""
+        tx = self._tx
+        self._tx = None
+        if tx is not None:
+            try:
+                tx.stop()
+            except Exception:
+                pass
+        notifier = self._notifier
+        self._notifier = None
+        injector = self.injector
+        self.injector = None
+        if injector is not None:
+            try:
+                injector.stop()
+            except Exception:
+                pass
+        if notifier is not None:
+            try:
+                notifier.stop()
+            except Exception:
+                pass
         bus = self.bus
         self.bus = None
         self.available = False
@@ -93,117 +214,180 @@ class Joystick:
     def poll(self):
         """Non-blocking: read available CAN messages and update internal state.
 
-        Call this once per frame from the Pygame main loop.
+        Call this once per frame from the Pygame main loop. In 'notifier' mode
+        the frames were already decoded by the reader thread: this only applies
+        the latest snapshot.
         """
         if not self.available or self.bus is None:
             return
 
-        # read all currently-queued messages without blocking
-        while True:
-            try:
-                msg = self.bus.recv(timeout=0.0)
-            except Exception:
-                # if bus errors happen, mark unavailable and stop
+        if self._notifier is not None:
+            if getattr(self._notifier, 'exception', None) is not None:
+                # the reader thread stopped on a bus error
                 self.available = False
                 return
-            if msg is None:
-                break
-            try:
-                # only handle standard 11-bit frames as before
-                if msg.is_extended_id:
-                    continue
-                data = msg.data
-                if msg.arbitration_id == self.CAN_CHANNEL_JOYSTICK:
-                    # expect 8 bytes: 4 signed 16-bit (little-endian)
-                    if len(data) >= 8:
-                        Joystick_X_1 = struct.unpack('<h', data[0:2])[0]
-                        Joystick_Y_1 = struct.unpack('<h', data[2:4])[0]
-                        Joystick_X_2 = struct.unpack('<h', data[4:6])[0]
-                        Joystick_Y_2 = struct.unpack('<h', data[6:8])[0]
-                        # original converted to float with 1 decimal place
-                        self.eixo_esquerdo_x = Joystick_X_1 / 10.0
-                        self.eixo_esquerdo_y = Joystick_Y_1 / 10.0
-                        self.eixo_direito_x = Joystick_X_2 / 10.0
-                        self.eixo_direito_y = Joystick_Y_2 / 10.0
-                elif msg.arbitration_id == self.CAN_CHANNEL_SELETORA:
-                    if len(data) >= 2:
-                        selectedMode = struct.unpack('<h', data[0:2])[0]
-                        if selectedMode != self.currentMode:
-                            self.currentMode = selectedMode
-                            self.hasChangedMode = True
-                elif msg.arbitration_id == self.CAN_CHANNEL_LIGHTS:
-                    if len(data) >= 1:
-                        lightsState = struct.unpack('<B', data[0:1])[0]
-                        # keep 5 lights as original
-                        self.lights = [(lightsState & (1 << i)) != 0 for i in range(5)]
-                elif msg.arbitration_id == self.CAN_CHANNEL_SPEED:
-                    if len(data) >= 1:
-                        selectedSpeed = struct.unpack('<B', data[0:1])[0]
-                        if selectedSpeed != self.currentSpeed:
-                            self.currentSpeed = selectedSpeed
-                            self.hasChangedSpeed = True
-                elif msg.arbitration_id == self.CAN_CHANNEL_IMAGE_ID:
-                    # Converte os bytes do CAN diretamente para string hex (maiúscula)
-                    id_str = data.hex().upper()
-                    #print(id_str)
-                    if id_str != self._last_image_id:
-                        self._last_image_id = id_str
-
-                        if self.ui_manager is not None:
-                            # Se tiver método específico, usa ele
-                            if hasattr(self.ui_manager, 'set_image_id'):
-                                #print("ALO")
-                                self.ui_manager.set_image_id(id_str)
-                            # Se for chamável, chama
-                            elif callable(self.ui_manager):
-                                self.ui_manager(id_str)
-                elif msg.arbitration_id == self.CAN_CHANNEL_TRACTION:
-                    self.last_traction_time = time.time()
-                    if len(data) >= 2:
-                        traction_value = struct.unpack('<h', data[:2])[0]
-                        self.valor_tracao = traction_value
-                    elif len(data) == 1:
-                        traction_value = struct.unpack('<b', data)[0]
-                        self.valor_tracao = traction_value
-            except Exception as e:
-                print(f"CAN processing error: {e}")
-                pass
-        
+        else:
+            # read all currently-queued messages without blocking
+            while True:
+                try:
+                    msg = self.bus.recv(timeout=0.0)
+                except Exception:
+                    # if bus errors happen, mark unavailable and stop
+                    self.available = False
+                    return
+                if msg is None:
+                    break
+                self._on_frame(msg)
+
+        self._apply(self._state, time.time())
+
+    def _on_frame(self, msg):
+        """Decode one frame into a new snapshot (reader thread in 'notifier' mode)."""
+        try:
+            now = time.time()
+            self._state = self._decode(self._state, msg, now)
+            tracer = self.latency_tracer
+            if tracer is not None:
+                tracer.frame_decoded(msg.arbitration_id, msg.timestamp, now)
+        except Exception as e:
+            print(f"CAN processing error: {e}")
+
+    def _decode(self, state, msg, now):
+        """`state` updated with one received frame (state itself if the frame is ignored)."""
+        # only handle standard 11-bit frames as before
+        if msg.is_extended_id:
+            return state
+        entry = self._rx_table.get(msg.arbitration_id)
+        if entry is None:
+            return state
+        decode, update = entry
+        return update(state, decode(msg.data), now)
+
+    # State updates of RX_CODECS values; value None: payload too short for its layout
+
+    def _rx_axes(self, state, value, now):
+        if value is None:
+            return state
+        lx, ly, rx, ry = value
+        return state._replace(lx=lx, ly=ly, rx=rx, ry=ry, frames=state.frames + 1, axes_time=now)
+
+    def _rx_mode(self, state, value, now):
+        if value is None:
+            return state
+        if value != state.mode:
+            state = state._replace(mode=value, mode_seq=state.mode_seq + 1)
+        return state._replace(frames=state.frames + 1, mode_time=now)
+
+    def _rx_lights(self, state, value, now):
+        if value is None:
+            return state
+        return state._replace(lights=value, frames=state.frames + 1, lights_time=now)
+
+    def _rx_speed(self, state, value, now):
+        if value is None:
+            return state
+        if value != state.speed:
+            state = state._replace(speed=value, speed_seq=state.speed_seq + 1)
+        return state._replace(frames=state.frames + 1, speed_time=now)
+
+    def _rx_image_id(self, state, value, now):
+        if value != state.image_id:
+            state = state._replace(image_id=value, image_seq=state.image_seq + 1)
+        return state._replace(frames=state.frames + 1, image_time=now)
+
+    def _rx_traction(self, state, value, now):
+        # an empty traction frame still counts (keeps the previous value)
+        if value is None:
+            value = state.traction
+        return state._replace(traction=value, frames=state.frames + 1, traction_time=now)
+
+    def _apply(self, state, now):
+        """Copy a snapshot to the attributes the main loop reads (main thread)."""
+        applied = self._applied
+        self.eixo_esquerdo_x, self.eixo_esquerdo_y = state.lx, state.ly
+        self.eixo_direito_x, self.eixo_direito_y = state.rx, state.ry
+        if state.mode_seq != applied.mode_seq:
+            self.currentMode = state.mode
+            self.hasChangedMode = True
+        if state.speed_seq != applied.speed_seq:
+            self.currentSpeed = state.speed
+            self.hasChangedSpeed = True
+        self.lights = list(state.lights)
+        if state.traction_time:
+            self.last_traction_time = state.traction_time
         # Reset traction to neutral if timeout (parado sem enviar msg)
-        if time.time() - self.last_traction_time > 0.5:
-            self.valor_tracao = 0  # 0 => Parado
+        self.valor_tracao = traction_at(state, now)
+        if state.image_seq != applied.image_seq:
+            self._last_image_id = state.image_id
+            if self.ui_manager is not None:
+                # Se tiver método específico, usa ele
+                if hasattr(self.ui_manager, 'set_image_id'):
+                    self.ui_manager.set_image_id(state.image_id)
+                # Se for chamável, chama
+                elif callable(self.ui_manager):
+                    self.ui_manager(state.image_id)
+        self._applied = state
+
+    def refresh(self):
+        """
+        'notifier' mode: apply the latest snapshot if the reader thread
+        published one since the last poll()/refresh() (main thread, logic
+        tick). Returns True if the attributes changed; no-op in 'poll' mode.
+        """
+        if self._notifier is None or not self.available:
+            return False
+        state = self._state
+        if state is self._applied:
+            return False
+        self._apply(state, time.time())
+        return True
+
+    def snapshot(self):
+        """The latest decoded JoystickState (immutable; safe to read from any thread)."""
+        return self._state
 
     def getJoystickValues(self):
         # return left_x, left_y, right_x, right_y
+        if self._notifier is not None:
+            # latest frame from the reader thread, not the one applied at the last poll()
+            state = self._state
+            return state.lx, state.ly, state.rx, state.ry
         return self.eixo_esquerdo_x, self.eixo_esquerdo_y, self.eixo_direito_x, self.eixo_direito_y
 
     def getLightsValues(self):
         return self.lights
 
     def getTractionValue(self):
+        if self._notifier is not None:
+            return traction_at(self._state, time.time())
         return self.valor_tracao
 
+    def _transmit(self, arbitration_id, value):
+        """Encode `value` with TX_CODECS and send it now ('sync') or hand it to the TX scheduler."""
+        codec = TX_CODECS[arbitration_id]
+        data = codec.encode(value)
+        if self._tx is not None:
+            return self._tx.submit(arbitration_id, data, is_extended_id=codec.extended)
+        msg = can.Message(
+            arbitration_id=arbitration_id,
+            data=data,
+            is_extended_id=codec.extended
+        )
+        self.bus.send(msg, timeout=0.01)
+        return True
+
+    def tx_stats(self):
+        """CanTxScheduler counters (queue depth, sent, coalesced, errors), None with tx='sync'."""
+        if self._tx is None:
+            return None
+        return self._tx.stats()
+
     def send_inclinometer(self, value):
         if not self.available or self.bus is None:
             return False
         try:
-            v = int(float(value))   # mantém compatibilidade
-
-            data = bytearray(8)
-
-            # INT32 little-endian
-            int_bytes = struct.pack('<i', v)
-
-            # Coloca como big-endian nos bytes 4..7
-            data[4:] = int_bytes[::-1]
-
-            msg = can.Message(
-                arbitration_id=self.CAN_CHANNEL_INCLINOMETER,
-                data=data,
-                is_extended_id=True
-            )
-            self.bus.send(msg, timeout=0.01)
-            return True
+            # INT32 big-endian nos bytes 4..7 (can_codec.encode_int32_high)
+            return self._transmit(self.CAN_CHANNEL_INCLINOMETER, value)
         except Exception as e:
             print(e)
             return False
@@ -214,27 +398,9 @@ class Joystick:
         if not self.available or self.bus is None:
             return False
         try:
-            data = bytearray(8)
-            if isinstance(value, list) and len(value) >= 4:
-                # 4 rodas (cada uma 2 bytes <h) = 8 bytes
-                for i in range(4):
-                    v = int(value[i])
-                    v = max(-32768, min(32767, v))
-                    struct.pack_into('<h', data, i*2, v)
-            else:
-                # Fallback antigo: 1 valor no final do array byte [4:]
-                v = int(float(value))
-                int_bytes = struct.pack('<i', v)
-                data[4:] = int_bytes[::-1]
-
-            msg = can.Message(
-                arbitration_id=self.CAN_CHANNEL_SIM_TRACTION,
-                data=data,
-                is_extended_id=True
-            )
-
-            self.bus.send(msg, timeout=0.01)
-            return True
+            # 4 rodas (cada uma 2 bytes <h) = 8 bytes, ou o fallback antigo:
+            # 1 valor no final do array byte [4:] (can_codec.encode_sim_traction)
+            return self._transmit(self.CAN_CHANNEL_SIM_TRACTION, value)
         except Exception as e:
             print(e)
             return False
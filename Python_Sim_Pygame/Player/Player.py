@@ -3,6 +3,9 @@ import math
 from Player.Wheels import Wheel
 from Player import GLV
 from Player.Pathing.Curvature import Curvature  # adaptado para pygame
+from Player.lights import LightClusterRenderer
+from Player.sprites import RotatedSpriteCache, SpriteAtlas, body_surface
+from ui.fonts import get_font, render_text
 
 # Configurações do player
 ROBOT_LENGTH   = 130 # Comprimento do robô ...... 350 cm
@@ -31,7 +34,14 @@ class Player:
         self.lenght = ROBOT_LENGTH
         self.width = ROBOT_WIDTH
         self.color = PLAYER_COLOR
+        # sprites do corpo rotacionados (ver _body_sprite)
+        self.body_sprites = RotatedSpriteCache(symmetry=180)
+        self._body_sprite_shape = None
+        # sprites das rodas na escala atual da câmera, compartilhados pelas 4 rodas
+        self.wheel_sprites = SpriteAtlas(symmetry=180)
         self.state = 'vivo'  # estados: 'vivo', 'morto'
+        # game.latency.InputLatencyTracer opcional: marca o consumo dos frames do joystick
+        self.latency_tracer = None
         self.curve_mode = "straight"
         self.heading = 0
         self.camera = camera
@@ -41,6 +51,9 @@ class Player:
         self.available_modes = ["straight", "curve", "pivotal", "diagonal"]
         self.lights = [False, False, False, False, False]  # Estado das luzes (4 luzes)
         self.sirene = False  # Estado da sirene (ligada/desligada)
+        # barras de luz pré-desenhadas (acesas e apagadas) e conjuntos rotacionados
+        self.light_sprites = LightClusterRenderer()
+        self.light_sprites.bake()
         
 
         self.icr_global = None  # Centro Instantâneo de Rotação (ICR) global
@@ -259,6 +272,32 @@ class Player:
 
     def getPosition(self):
         return (self.x, self.y)
+
+    def get_pose(self):
+        """
+        Snapshot of the geometric state that defines the hitbox: body center
+        and heading plus the position/heading of each wheel.
+        """
+        return {
+            'x': self.x,
+            'y': self.y,
+            'heading': self.heading,
+            'wheels': [(wheel.pos, wheel.heading) for wheel in self.wheels],
+        }
+
+    def set_pose(self, pose):
+        """Restore a pose from get_pose() (no map clamping, no steering logic)."""
+        self.x = pose['x']
+        self.y = pose['y']
+        self.heading = pose['heading']
+        for wheel, (pos, heading) in zip(self.wheels, pose['wheels']):
+            wheel.pos = pos
+            wheel.heading = heading
+            try:
+                wheel.fixed_axes.updateOrientation()
+                wheel.moving_axes.updateOrientation()
+            except Exception:
+                pass
     
     def getCameraRelativePosition(self, camera_or_offset=None):
         """Return screen coordinates for the player's center. Accepts either a Camera
@@ -319,77 +358,19 @@ class Player:
         return new_x / math.sqrt(1 - (ly**2)/2), new_y / math.sqrt(1 - (lx**2)/2)
     
     def drawLights(self, camera_or_offset=(0,0)):
-
-         # Configurações das luzes (posição local x, y e cor)
-        # Layout:
-        #  R R
-        #   B
-        #  G G
-        light_positions = [
-            (-8, -13, (255, 0, 0), self.lights[0],0),   # vermelho esquerdo
-            (8, -13, (255, 0, 0), self.lights[0],0),    # vermelho direito
-
-            (0, 0, (0, 0, 255), self.lights[4],0),      # azul no centro
-
-            (-8,0, (255,200,0), self.lights[2],0),
-            (8,0, (255,200,0), self.lights[2],0),
-
-            (-8, 13, (0, 225, 0), self.lights[1],0),    # verde esquerdo
-            (8, 13, (0, 225, 0), self.lights[1],0),     # verde direito
-
-
-
-
-            (12, 45, (200, 200, 255), self.lights[3], 15),
-            (-12, 45, (200, 200, 255), self.lights[3], 15), # branco
-            (12, -45, (200, 200, 255), self.lights[3], 15),
-            (-12, -45, (200, 200, 255), self.lights[3], 15), 
-        ]
-
-        # Dimensões da barra (largura x altura)
-        BAR_WIDTH = 7  # comprimento da barra
-        BAR_HEIGHT = 20  # espessura da barra
-        OUTLINE_COLOR = (0, 0, 0)
-        OUTLINE_WIDTH = 1
-
-        cx, cy = self.getPosition()
-
-        # Função de conversão pra tela (com ou sem câmera)
+        # Luzes (ver Player/lights.py): o conjunto inteiro vem pronto do cache,
+        # por (luzes acesas, heading, escala), e é desenhado com um blit só
         if hasattr(camera_or_offset, 'world_to_screen'):
-            to_screen = lambda x, y: camera_or_offset.world_to_screen((x, y))
+            center = camera_or_offset.world_to_screen(self.getPosition())
+            scale = getattr(camera_or_offset, 'scale', 1.0)
         else:
             camx, camy = camera_or_offset
-            to_screen = lambda x, y: (x - camx, y - camy)
+            center = (self.x - camx, self.y - camy)
+            scale = 1.0
 
-        # Ângulo do robô em radianos
-        theta = math.radians(self.getHeading())
-        cos_t = math.cos(theta)
-        sin_t = math.sin(theta)
-
-        for lx, ly, color, isOn, size in light_positions:
-            # Rotaciona posição da luz
-            rx = lx * cos_t - ly * sin_t
-            ry = lx * sin_t + ly * cos_t
-            wx, wy = cx + rx, cy + ry
-
-            colorToUse = color if isOn else (150, 150, 150)
-            # Cria superfície temporária para a barra
-            if size != 0:
-                BAR_HEIGHT = size
-                BAR_WIDTH = size
-            bar_surf = pygame.Surface((BAR_WIDTH, BAR_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.rect(bar_surf, colorToUse, (0, 0, BAR_WIDTH, BAR_HEIGHT))
-            pygame.draw.rect(bar_surf, OUTLINE_COLOR, (0, 0, BAR_WIDTH, BAR_HEIGHT), OUTLINE_WIDTH)
-
-            # Rotaciona a barra conforme o heading
-            rotated_bar = pygame.transform.rotate(bar_surf, -self.getHeading())
-
-            # Converte posição para tela
-            sx, sy = to_screen(wx, wy)
-            rect = rotated_bar.get_rect(center=(int(sx), int(sy)))
-
-            # Desenha no surface principal
-            self.surface.blit(rotated_bar, rect.topleft)
+        sprite = self.light_sprites.get(self.lights, self.getHeading(), scale)
+        rect = sprite.get_rect(center=(int(center[0]), int(center[1])))
+        self.surface.blit(sprite, rect.topleft)
 
 
     def blink_alert(self, hz, mode='critico'):
@@ -444,6 +425,17 @@ class Player:
 
 
 
+    def _body_sprite(self, sw, sh, border):
+        """Contorno do corpo (sw x sh px, borda `border`) rotacionado pelo heading, via cache."""
+        # mudou tamanho ou cor do robô: os sprites guardados não valem mais
+        shape = (self.width, self.lenght, tuple(self.color))
+        if shape != self._body_sprite_shape:
+            self.body_sprites.clear()
+            self._body_sprite_shape = shape
+        color = self.color
+        return self.body_sprites.get((sw, sh, border), self.heading,
+                                     lambda: body_surface(sw, sh, border, color))
+
     def draw(self, camera_or_offset=(0,0)):
         # Draw robot scaled to camera: create base surface in world units then scale to screen pixels
         cam = camera_or_offset if camera_or_offset is not None else self.camera
@@ -452,16 +444,13 @@ class Player:
         sw = max(1, int(round(self.width * (cam.scale if hasattr(cam, 'scale') else 1.0))))
         sh = max(1, int(round(self.lenght * (cam.scale if hasattr(cam, 'scale') else 1.0))))
 
-        rect_surf = pygame.Surface((sw, sh), pygame.SRCALPHA)
         # border thickness scales with camera
         border = 6
         if hasattr(cam, 'scale'):
             border = max(1, int(round(border * cam.scale)))
-        # Draw full rect fill then border to keep visual consistent
-        pygame.draw.rect(rect_surf, self.color, (0, 0, sw, sh), border)
 
-        # rotaciona a superfície pelo heading (rotation operates on screen pixels)
-        rotated_surf = pygame.transform.rotate(rect_surf, -self.heading)
+        # contorno já rotacionado (cache por tamanho na tela e heading em passos de 1 grau)
+        rotated_surf = self._body_sprite(sw, sh, border)
 
         # centraliza no player (project world center to screen)
         if hasattr(cam, 'world_to_screen'):
@@ -646,6 +635,8 @@ class Player:
         right_x controls icr_bias (mapped from -1..1 -> 0..1).
         For icamento mode left_y moves the cursor up/down.
         """
+        if self.latency_tracer is not None:
+            self.latency_tracer.consumed()
         lx, ly, rx, ry = axes
         try:
             dt_scale = max(0.0, min(4.0, float(dt_ms) / 16.67))
@@ -1466,25 +1457,21 @@ class Player:
             try:
                 percent = int(self.icamento_cursor * 500)
                 ready_mm_threshold = 250
-                f = pygame.font.SysFont(None, 16)
+                f = get_font(None, 16)
                 color = (228, 255, 228) if active else (214, 224, 234)
-                txt = f.render(f'{percent} mm', True, color)
+                txt = render_text(f, f'{percent} mm', color)
                 tx = bar_x_l - txt.get_width() - 8
                 ty = bar_y + bar_h - txt.get_height() - 4
-                # black outline around the mm text for better contrast
-                for ox, oy in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                    outline_txt = f.render(f'{percent} mm', True, (0, 0, 0))
-                    screen.blit(outline_txt, (tx + ox, ty + oy))
-                screen.blit(txt, (tx, ty))
+                # black outline around the mm text for better contrast (8 vizinhos, já composto)
+                screen.blit(render_text(f, f'{percent} mm', color, outline=((0, 0, 0), 1)), (tx - 1, ty - 1))
                 if active and percent >= ready_mm_threshold:
-                    f2 = pygame.font.SysFont(None, 14)
-                    txt2 = f2.render('ICAMENTO READY', True, (230, 255, 230))
+                    f2 = get_font(None, 14)
+                    txt2 = render_text(f2, 'ICAMENTO READY', (230, 255, 230))
                     tx2 = bar_x_l - txt2.get_width() - 8
                     ty2 = bar_y + bar_h - txt2.get_height() - 18
-                    for ox, oy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        outline_txt2 = f2.render('ICAMENTO READY', True, (0, 0, 0))
-                        screen.blit(outline_txt2, (tx2 + ox, ty2 + oy))
-                    screen.blit(txt2, (tx2, ty2))
+                    # contorno nos 4 vizinhos
+                    screen.blit(render_text(f2, 'ICAMENTO READY', (230, 255, 230), outline=((0, 0, 0), 1, 'cross')),
+                                (tx2 - 1, ty2 - 1))
             except Exception:
                 pass
         except Exception:
@@ -2,6 +2,7 @@ import pygame
 import math
 import Player.GLV as GVL
 from Player.Pathing.Axes import Axes  # adaptado para pygame
+from Player.sprites import SpriteAtlas, wheel_surface
 
 WHEEL_RADIUS = GVL.WHEEL_RADIUS
 TIRE_THICKNESS = GVL.TIRE_THICKNESS
@@ -12,6 +13,7 @@ class Wheel:
         self.name = f"{self.parent.getName()}_{name}_wheel"
         self.width = width
         self.length = length
+        self.color = color
         self.relative_position = (x_offset, y_offset)
 
         self.current_steering_angle = None
@@ -19,7 +21,7 @@ class Wheel:
         self.last_desired_angle = None
         self.angular_limits = 130
 
-        # Store a base surface in world units (unscaled). We'll scale it at draw time
+        # Store a base surface in world units (unscaled). draw() takes the screen size from it
         self.base_surface = pygame.Surface((max(1, int(self.width)), max(1, int(self.length))), pygame.SRCALPHA)
         self.base_surface.fill((0, 0, 0, 0))  # fundo transparente
 
@@ -131,17 +133,18 @@ class Wheel:
             screen_x = self.pos[0] - camera_or_offset[0]
             screen_y = self.pos[1] - camera_or_offset[1]
 
-        # Scale base_surface from world pixels to screen pixels according to camera.scale
+        # Size in screen pixels of base_surface at camera.scale
         cam = camera_or_offset if hasattr(camera_or_offset, 'world_to_screen') else None
-        if cam is not None and hasattr(cam, 'scale'):
-            scale = cam.scale
-            sw = max(1, int(round(self.base_surface.get_width() * scale)))
-            sh = max(1, int(round(self.base_surface.get_height() * scale)))
-            scaled = pygame.transform.smoothscale(self.base_surface, (sw, sh))
-        else:
-            scaled = self.base_surface
-
-        rotated_surface = pygame.transform.rotate(scaled, -self.heading)
+        scale = cam.scale if cam is not None and hasattr(cam, 'scale') else 1.0
+        sw = max(1, int(round(self.base_surface.get_width() * scale)))
+        sh = max(1, int(round(self.base_surface.get_height() * scale)))
+
+        # frame já rotacionado do atlas compartilhado (refeito quando o zoom muda)
+        atlas = getattr(self.parent, 'wheel_sprites', None)
+        if atlas is None:
+            atlas = self.parent.wheel_sprites = SpriteAtlas(symmetry=180)
+        color = self.color
+        rotated_surface = atlas.get((sw, sh, color), self.heading, lambda: wheel_surface(sw, sh, color))
         rect = rotated_surface.get_rect(center=(screen_x, screen_y))
         surface.blit(rotated_surface, rect)
 
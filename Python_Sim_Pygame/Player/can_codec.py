@@ -0,0 +1,113 @@
+"""
+CAN codec module - Declarative table of the CAN frames of the TRAFO simulators.
+
+One CanCodec per arbitration id: the payload layout as a precompiled
+struct.Struct and the function that decodes a received payload (RX) or
+encodes a value to send (TX). The joystick readers dispatch on
+RX_CODECS[arbitration_id] instead of an if/elif chain with one
+struct.unpack per field.
+
+decode(data) returns None when the payload is too short for its layout
+(the frame is ignored, as the readers did); encode(value) returns the 8
+bytes to send.
+
+Kept byte-identical in Python_Sim_Pygame/Player/can_codec.py and
+Python_Sim_Turtle/Application/can_codec.py (each simulator runs from its
+own folder; benchmarks/bench_can_codec.py fails if they differ); only the
+struct module is needed.
+"""
+
+import struct
+from collections import namedtuple
+
+
+# RX: sent by the TTC / external system (standard 11-bit ids)
+JOYSTICK_ID = 0x200      # 4 x int16 LE: left x/y, right x/y (tenths)
+SELECTOR_ID = 0x201      # int16 LE: selected mode
+LIGHTS_ID = 0x202        # uint8: one bit per light
+SPEED_ID = 0x203         # uint8: selected speed
+TRACTION_ID = 0x204      # int16 LE (int8 if a single byte): traction
+IMAGE_ID_ID = 0x210      # raw bytes, shown as hex (e.g. b'\x0c' -> '0C')
+# TX: sent by the simulator (extended 29-bit ids)
+INCLINOMETER_ID = 0x220  # int32 BE in bytes 4..7
+SIM_TRACTION_ID = 0x222  # 4 x int16 LE wheel speeds (or int32 BE in bytes 4..7)
+
+LIGHT_COUNT = 5
+
+CanCodec = namedtuple('CanCodec', ('name', 'arbitration_id', 'extended', 'struct', 'decode', 'encode'))
+
+AXES = struct.Struct('<4h')
+INT16 = struct.Struct('<h')
+INT8 = struct.Struct('<b')
+UINT8 = struct.Struct('<B')
+INT32_HIGH = struct.Struct('>4xi')
+WHEELS = struct.Struct('<4h')
+
+
+def decode_axes(data):
+    """(lx, ly, rx, ry) in units (tenths on the wire)."""
+    if len(data) < 8:
+        return None
+    x1, y1, x2, y2 = AXES.unpack_from(data)
+    return x1 / 10.0, y1 / 10.0, x2 / 10.0, y2 / 10.0
+
+
+def decode_int16(data):
+    if len(data) < 2:
+        return None
+    return INT16.unpack_from(data)[0]
+
+
+def decode_uint8(data):
+    if len(data) < 1:
+        return None
+    return UINT8.unpack_from(data)[0]
+
+
+# lights byte -> tuple of LIGHT_COUNT booleans, built once
+_LIGHTS = tuple(tuple((bits & (1 << i)) != 0 for i in range(LIGHT_COUNT)) for bits in range(256))
+
+
+def decode_lights(data):
+    if len(data) < 1:
+        return None
+    return _LIGHTS[data[0]]
+
+
+def decode_traction(data):
+    if len(data) >= 2:
+        return INT16.unpack_from(data)[0]
+    if len(data) == 1:
+        return INT8.unpack_from(data)[0]
+    return None
+
+
+def decode_image_id(data):
+    return bytes(data).hex().upper()
+
+
+def encode_int32_high(value):
+    """int(value) as int32 big-endian in bytes 4..7, zeros before."""
+    return INT32_HIGH.pack(int(float(value)))
+
+
+def encode_sim_traction(value):
+    """Four wheel speeds (clamped int16 LE), or one value as encode_int32_high."""
+    if isinstance(value, list) and len(value) >= 4:
+        return WHEELS.pack(*(max(-32768, min(32767, int(v))) for v in value[:4]))
+    return encode_int32_high(value)
+
+
+CODECS = (
+    CanCodec('joystick', JOYSTICK_ID, False, AXES, decode_axes, None),
+    CanCodec('selector', SELECTOR_ID, False, INT16, decode_int16, None),
+    CanCodec('lights', LIGHTS_ID, False, UINT8, decode_lights, None),
+    CanCodec('speed', SPEED_ID, False, UINT8, decode_uint8, None),
+    CanCodec('traction', TRACTION_ID, False, INT16, decode_traction, None),
+    CanCodec('image_id', IMAGE_ID_ID, False, None, decode_image_id, None),
+    CanCodec('inclinometer', INCLINOMETER_ID, True, INT32_HIGH, None, encode_int32_high),
+    CanCodec('sim_traction', SIM_TRACTION_ID, True, WHEELS, None, encode_sim_traction),
+)
+
+RX_CODECS = {codec.arbitration_id: codec for codec in CODECS if codec.decode is not None}
+TX_CODECS = {codec.arbitration_id: codec for codec in CODECS if codec.encode is not None}
@@ -0,0 +1,93 @@
+"""
+CAN injector module - Virtual stand-in for the TTC joystick.
+
+JoystickInjector sends joystick frames (0x200, encoded with can_codec.AXES)
+on a python-can 'virtual' channel from a daemon thread, at rate_hz on a
+fixed schedule, with the axes given by pattern(t). The Joystick reads the
+same channel through open_virtual_bus(channel) instead of the PCAN adapter
+(game/config.py CAN_VIRTUAL_CHANNEL), so the input path and its latency
+(game/latency.py) can be measured without the hardware: the virtual bus
+stamps msg.timestamp with the send time, and sent_times keeps the time of
+the last frames sent.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+try:
+    import can
+except Exception:
+    can = None
+
+from Player.can_codec import AXES, JOYSTICK_ID
+
+
+def sweep_pattern(t):
+    """(lx, ly, rx, ry) in -1..1: forward at 0.6 with the curve axis sweeping every 4 s."""
+    return 0.0, 0.0, 0.5 * math.sin(2.0 * math.pi * t / 4.0), 0.6
+
+
+def open_virtual_bus(channel):
+    if can is None:
+        raise RuntimeError("python-can is not installed")
+    return can.Bus(channel, interface='virtual')
+
+
+class JoystickInjector:
+    """Joystick frames sent on a virtual CAN channel at rate_hz."""
+
+    def __init__(self, channel, rate_hz=100.0, pattern=sweep_pattern, bus=None):
+        self.channel = channel
+        self.period = 1.0 / max(1.0, float(rate_hz))
+        self.pattern = pattern
+        self.bus = bus
+        self.sent = 0
+        self.errors = 0
+        self.sent_times = deque(maxlen=1024)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            if self.bus is None:
+                self.bus = open_virtual_bus(self.channel)
+            self._thread = threading.Thread(target=self._run, name='can-injector', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        bus = self.bus
+        self.bus = None
+        if bus is not None:
+            try:
+                bus.shutdown()
+            except Exception:
+                pass
+
+    def frame(self, t):
+        """The joystick frame for time t (s since start): the axes in tenths, as the TTC sends them."""
+        raw = [max(-32768, min(32767, int(round(v * 10.0)))) for v in self.pattern(t)]
+        return can.Message(arbitration_id=JOYSTICK_ID, data=AXES.pack(*raw), is_extended_id=False)
+
+    def _run(self):
+        start = time.perf_counter()
+        next_time = start
+        while not self._stop.is_set():
+            try:
+                self.bus.send(self.frame(next_time - start))
+                self.sent_times.append(time.time())
+                self.sent += 1
+            except Exception:
+                self.errors += 1
+            next_time += self.period
+            delay = next_time - time.perf_counter()
+            if delay < 0:
+                next_time = time.perf_counter()
+                delay = 0.0
+            self._stop.wait(delay)
@@ -0,0 +1,143 @@
+"""
+CAN transmit module - Periodic, non-blocking transmit of the simulator frames.
+
+Joystick.send_inclinometer and send_sim_traction used to call
+bus.send(msg, timeout=0.01) inside the logic tick, so a busy or unplugged
+adapter could hold the tick for up to 10 ms per frame. CanTxScheduler keeps
+only the latest payload per arbitration id (0x220, 0x222): submit() stores it
+and returns at once, and a daemon thread sends at a fixed rate. Each cycle an
+id is sent when its payload changed since the last send, or again once
+heartbeat_s passed without one (the receiver still sees the simulator alive
+while the value holds).
+
+stats() reports the queue depth (ids holding a payload not sent yet) and the
+drop counters: 'coalesced', payloads replaced by a newer one before the
+thread sent them, and 'errors', sends that failed (retried next cycle).
+"""
+
+import threading
+import time
+
+try:
+    import can
+except Exception:
+    can = None
+
+
+DEFAULT_TX_RATE_HZ = 60.0
+DEFAULT_TX_HEARTBEAT_S = 0.1
+# Same timeout the synchronous send used; now it only holds the TX thread
+SEND_TIMEOUT_S = 0.01
+
+
+class CanTxScheduler:
+    """Latest-value-per-id transmit queue, sent by a daemon thread at rate_hz."""
+
+    def __init__(self, bus, rate_hz=DEFAULT_TX_RATE_HZ, heartbeat_s=DEFAULT_TX_HEARTBEAT_S,
+                 send_timeout=SEND_TIMEOUT_S):
+        self.bus = bus
+        self.period = 1.0 / max(1.0, float(rate_hz))
+        self.heartbeat_s = max(0.0, float(heartbeat_s))
+        self.send_timeout = send_timeout
+
+        self._lock = threading.Lock()
+        self._latest = {}     # arbitration id -> (data, is_extended_id)
+        self._pending = set()  # ids whose latest payload was not sent yet
+        self._last_sent = {}  # arbitration id -> (data, monotonic time of the send)
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.submitted = 0
+        self.sent = 0
+        self.heartbeats = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='can-tx', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, arbitration_id, data, is_extended_id=True):
+        """Store `data` as the latest payload of arbitration_id; never blocks on the bus."""
+        data = bytes(data)
+        with self._lock:
+            self.submitted += 1
+            previous = self._latest.get(arbitration_id)
+            if arbitration_id in self._pending and previous[0] != data:
+                self.coalesced += 1
+            self._latest[arbitration_id] = (data, bool(is_extended_id))
+            last = self._last_sent.get(arbitration_id)
+            if last is None or last[0] != data:
+                self._pending.add(arbitration_id)
+                self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+            else:
+                # back to the value on the bus: nothing new to send
+                self._pending.discard(arbitration_id)
+        return True
+
+    def _due(self, now):
+        """(id, data, is_extended_id, heartbeat) to send this cycle; clears their pending flag."""
+        due = []
+        with self._lock:
+            for arbitration_id, (data, extended) in self._latest.items():
+                if arbitration_id in self._pending:
+                    self._pending.discard(arbitration_id)
+                    due.append((arbitration_id, data, extended, False))
+                else:
+                    last = self._last_sent.get(arbitration_id)
+                    if last is not None and now - last[1] >= self.heartbeat_s:
+                        due.append((arbitration_id, data, extended, True))
+        return due
+
+    def _run(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for arbitration_id, data, extended, heartbeat in self._due(now):
+                try:
+                    msg = can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=extended)
+                    self.bus.send(msg, timeout=self.send_timeout)
+                except Exception:
+                    with self._lock:
+                        self.errors += 1
+                        if not heartbeat and self._latest[arbitration_id][0] == data:
+                            self._pending.add(arbitration_id)
+                    continue
+                with self._lock:
+                    self._last_sent[arbitration_id] = (data, now)
+                    self.sent += 1
+                    if heartbeat:
+                        self.heartbeats += 1
+
+            next_time += self.period
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                # fell behind (slow bus): skip the missed cycles instead of bursting
+                next_time = time.monotonic()
+                delay = 0.0
+            self._stop.wait(delay)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queue_depth': len(self._pending),
+                'max_queue_depth': self.max_queue_depth,
+                'submitted': self.submitted,
+                'sent': self.sent,
+                'heartbeats': self.heartbeats,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+            }
@@ -0,0 +1,132 @@
+"""
+Lights module - Baked light-bar sprites for Player.drawLights.
+
+drawLights used to create, draw and rotate one surface per light (11 of
+them) every frame. LightClusterRenderer bakes every light shape once, on and
+off (and keeps their rotated copies per heading bucket), then composites the
+whole cluster, already rotated, for a lights bitmask and camera scale. The
+clusters are kept in a RotatedSpriteCache keyed by (bitmask, scale) and the
+heading bucket, so a frame is one blit. Blinking (blink_alert) only flips
+bits of player.lights, i.e. alternates between two cached sprites.
+
+Bars keep their size in screen pixels at every zoom; only their distance
+from the robot center follows camera.scale, as before.
+"""
+
+import math
+
+import pygame
+
+from Player.sprites import RotatedSpriteCache, keyed_surface
+
+
+# (x, y) local ao robô, cor, índice em player.lights, tamanho (0 = barra)
+# Layout:
+#  R R
+#   B
+#  G G
+LIGHT_LAYOUT = (
+    (-8, -13, (255, 0, 0), 0, 0),     # vermelho esquerdo
+    (8, -13, (255, 0, 0), 0, 0),      # vermelho direito
+
+    (0, 0, (0, 0, 255), 4, 0),        # azul no centro
+
+    (-8, 0, (255, 200, 0), 2, 0),
+    (8, 0, (255, 200, 0), 2, 0),
+
+    (-8, 13, (0, 225, 0), 1, 0),      # verde esquerdo
+    (8, 13, (0, 225, 0), 1, 0),       # verde direito
+
+    (12, 45, (200, 200, 255), 3, 15),
+    (-12, 45, (200, 200, 255), 3, 15),  # branco
+    (12, -45, (200, 200, 255), 3, 15),
+    (-12, -45, (200, 200, 255), 3, 15),
+)
+
+# Dimensões da barra (largura x altura)
+BAR_WIDTH = 7
+BAR_HEIGHT = 20
+OFF_COLOR = (150, 150, 150)
+OUTLINE_COLOR = (0, 0, 0)
+OUTLINE_WIDTH = 1
+
+LIGHT_COLORS = sorted({color for _x, _y, color, _i, _s in LIGHT_LAYOUT}) + [OFF_COLOR, OUTLINE_COLOR]
+
+# Camera scales closer than this share a cluster sprite
+LIGHT_SCALE_STEP = 0.01
+
+
+def light_mask(lights):
+    """Bitmask of the lights that are on (bit i = lights[i])."""
+    mask = 0
+    for i, on in enumerate(lights):
+        if on:
+            mask |= 1 << i
+    return mask
+
+
+def bar_size(size):
+    return (size, size) if size else (BAR_WIDTH, BAR_HEIGHT)
+
+
+class LightClusterRenderer:
+    """Baked light bars and rotated light clusters of one robot."""
+
+    def __init__(self):
+        self._bars = {}
+        self.bars = RotatedSpriteCache()
+        self.sprites = RotatedSpriteCache()
+
+    def bar(self, size, color):
+        """Baked bar (8-bit, LIGHT_COLORS palette) of `size` lit with `color`."""
+        key = (size, color)
+        bar = self._bars.get(key)
+        if bar is None:
+            width, height = bar_size(size)
+            bar = self._bars[key] = keyed_surface((width, height), LIGHT_COLORS)
+            pygame.draw.rect(bar, color, (0, 0, width, height))
+            pygame.draw.rect(bar, OUTLINE_COLOR, (0, 0, width, height), OUTLINE_WIDTH)
+        return bar
+
+    def bake(self):
+        """Bake every light shape, on and off."""
+        for _x, _y, color, _i, size in LIGHT_LAYOUT:
+            self.bar(size, color)
+            self.bar(size, OFF_COLOR)
+
+    def cluster(self, mask, scale, angle):
+        """
+        Every bar rotated by `angle` degrees (counterclockwise) at its local
+        position times `scale` rotated the same way, around the sprite center.
+        """
+        theta = math.radians(-angle)
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+        placed = []
+        half_w = half_h = 0
+        for lx, ly, color, index, size in LIGHT_LAYOUT:
+            color = color if mask & (1 << index) else OFF_COLOR
+            bar = self.bars.get((size, color), -angle, lambda: self.bar(size, color))
+            dx = int(math.floor((lx * cos_t - ly * sin_t) * scale))
+            dy = int(math.floor((lx * sin_t + ly * cos_t) * scale))
+            placed.append((bar, dx, dy))
+            half_w = max(half_w, abs(dx) + bar.get_width())
+            half_h = max(half_h, abs(dy) + bar.get_height())
+
+        surface = keyed_surface((2 * half_w, 2 * half_h), LIGHT_COLORS)
+        for bar, dx, dy in placed:
+            surface.blit(bar, bar.get_rect(center=(half_w + dx, half_h + dy)))
+        surface.set_colorkey(surface.get_colorkey(), pygame.RLEACCEL)
+        return surface
+
+    def get(self, lights, heading, scale=1.0):
+        """Cluster sprite for the lights states, rotated by -heading, centered on the robot."""
+        mask = light_mask(lights)
+        scale_key = int(round(scale / LIGHT_SCALE_STEP))
+        return self.sprites.get_rotated((mask, scale_key), heading,
+                                        lambda angle: self.cluster(mask, scale_key * LIGHT_SCALE_STEP, angle))
+
+    def stats(self):
+        stats = self.sprites.stats()
+        stats['bars'] = len(self._bars)
+        return stats
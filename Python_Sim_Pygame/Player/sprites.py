@@ -0,0 +1,216 @@
+"""
+Sprites module - Pre-rendered, rotated robot sprites.
+
+Drawing the robot used to build SRCALPHA surfaces, scale and rotate them
+every frame. The rotated copies are kept instead, keyed by the sprite (its
+size in screen pixels, so the camera scale is part of the key) and the
+heading quantized to SPRITE_HEADING_STEP_DEG:
+- RotatedSpriteCache: an LRU bounded by memory, for the body outline;
+- SpriteAtlas: every rotated frame of one sprite at the current camera
+  scale, shared by the four wheels and regenerated lazily on zoom.
+A frame then costs one blit per sprite.
+
+Sprites are 8-bit surfaces with a colorkey (RLE accelerated) rather than
+per-pixel alpha: they are flat shapes, rotate() keeps the colorkey, and the
+result on screen is identical while using a quarter of the memory and
+blitting faster.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+# Heading quantization of the rotated sprites
+SPRITE_HEADING_STEP_DEG = 1.0
+
+# Memory kept by each RotatedSpriteCache
+SPRITE_CACHE_BUDGET_MB = 32
+
+# Unrotated sprites kept per cache (one per size seen while zooming)
+SPRITE_BASES_MAX = 8
+
+
+def surface_nbytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def keyed_surface(size, colors):
+    """
+    8-bit surface filled with a colorkey that differs from every color in
+    `colors` (which then map to their own palette entries).
+    """
+    colors = [tuple(int(c) for c in color[:3]) for color in colors]
+    key = (255 - colors[0][0], 255 - colors[0][1], 255 - colors[0][2]) if colors else (255, 0, 255)
+    while key in colors:
+        key = ((key[0] + 85) % 256, (key[1] + 170) % 256, key[2])
+    # new surfaces are zeroed: every pixel is already palette entry 0, the key
+    surface = pygame.Surface(size, 0, 8)
+    surface.set_palette([key] + colors + [key] * (255 - len(colors)))
+    surface.set_colorkey(key)
+    return surface
+
+
+def rotate_sprite(base, angle):
+    """base rotated by `angle` degrees (counterclockwise), keeping its colorkey with RLE."""
+    sprite = pygame.transform.rotate(base, angle)
+    colorkey = base.get_colorkey()
+    if colorkey is not None:
+        sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+    return sprite
+
+
+def body_surface(width, height, border, color):
+    """Unrotated robot body outline (keyed_surface) for RotatedSpriteCache."""
+    surface = keyed_surface((width, height), [color])
+    pygame.draw.rect(surface, color, (0, 0, width, height), border)
+    return surface
+
+
+def wheel_surface(width, height, color):
+    """Unrotated solid wheel (keyed_surface) for SpriteAtlas."""
+    surface = keyed_surface((width, height), [color])
+    surface.fill(color)
+    return surface
+
+
+class RotatedSpriteCache:
+    """
+    LRU cache of rotated sprites. `symmetry` is the rotation (degrees) that
+    maps the sprites onto themselves, e.g. 180 for a rectangle, so headings
+    that differ by it share one entry.
+    """
+
+    def __init__(self, heading_step=SPRITE_HEADING_STEP_DEG, symmetry=360,
+                 budget_bytes=SPRITE_CACHE_BUDGET_MB * 1024 * 1024):
+        self.heading_step = float(heading_step)
+        self.buckets = max(1, int(round(symmetry / self.heading_step)))
+        self.budget_bytes = int(budget_bytes)
+        self._bases = OrderedDict()
+        self._rotated = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._rotated)
+
+    def clear(self):
+        self._bases.clear()
+        self._rotated.clear()
+        self.nbytes = 0
+
+    def bucket(self, heading):
+        return int(round(heading / self.heading_step)) % self.buckets
+
+    def get(self, key, heading, render):
+        """
+        Sprite `key` rotated by -heading (screen rotation, like
+        pygame.transform.rotate(surface, -heading)). render() builds the
+        unrotated sprite the first time `key` is seen.
+        """
+        return self.get_rotated(key, heading, lambda angle: rotate_sprite(self._base(key, render), angle))
+
+    def get_rotated(self, key, heading, render_rotated):
+        """
+        Like get(), for sprites composited already rotated:
+        render_rotated(angle) builds sprite `key` rotated by `angle` degrees.
+        """
+        bucket = self.bucket(heading)
+        entry = (key, bucket)
+        sprite = self._rotated.get(entry)
+        if sprite is not None:
+            self._rotated.move_to_end(entry)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = render_rotated(-bucket * self.heading_step)
+        size = surface_nbytes(sprite)
+        while self._rotated and self.nbytes + size > self.budget_bytes:
+            _entry, old = self._rotated.popitem(last=False)
+            self.nbytes -= surface_nbytes(old)
+            self.evictions += 1
+        if size <= self.budget_bytes:
+            self._rotated[entry] = sprite
+            self.nbytes += size
+        return sprite
+
+    def _base(self, key, render):
+        base = self._bases.get(key)
+        if base is None:
+            base = self._bases[key] = render()
+            while len(self._bases) > SPRITE_BASES_MAX:
+                self._bases.popitem(last=False)
+        else:
+            self._bases.move_to_end(key)
+        return base
+
+    def stats(self):
+        return {
+            'entries': len(self._rotated),
+            'nbytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class SpriteAtlas:
+    """
+    Rotated frames of one sprite at one size (one camera scale), one per
+    heading bucket, built the first time each is drawn. Asking for another
+    key (the size changed with the zoom) drops the frames and starts over.
+    `symmetry` as in RotatedSpriteCache.
+    """
+
+    def __init__(self, heading_step=SPRITE_HEADING_STEP_DEG, symmetry=360):
+        self.heading_step = float(heading_step)
+        self.buckets = max(1, int(round(symmetry / self.heading_step)))
+        self.key = None
+        self._base = None
+        self._frames = []
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    def __len__(self):
+        return sum(1 for frame in self._frames if frame is not None)
+
+    @property
+    def nbytes(self):
+        return sum(surface_nbytes(frame) for frame in self._frames if frame is not None)
+
+    def clear(self):
+        self.key = None
+        self._base = None
+        self._frames = []
+
+    def bucket(self, heading):
+        return int(round(heading / self.heading_step)) % self.buckets
+
+    def get(self, key, heading, render):
+        """Like RotatedSpriteCache.get, for the atlas of `key`."""
+        if key != self.key:
+            self.key = key
+            self._base = render()
+            self._frames = [None] * self.buckets
+            self.rebuilds += 1
+        bucket = self.bucket(heading)
+        frame = self._frames[bucket]
+        if frame is not None:
+            self.hits += 1
+            return frame
+        self.misses += 1
+        frame = self._frames[bucket] = rotate_sprite(self._base, -bucket * self.heading_step)
+        return frame
+
+    def stats(self):
+        return {
+            'frames': len(self),
+            'nbytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'rebuilds': self.rebuilds,
+        }
@@ -4,6 +4,9 @@ from typing import Dict, Optional, Sequence, Tuple
 
 import pygame
 
+from World.map_raster import analyze_map, np, sample_dialog_grid
+from ui.fonts import get_font, render_text
+
 
 class DialogueManager:
 	COLOR_DIALOG_1 = (255, 0, 0)
@@ -56,11 +59,13 @@ class DialogueManager:
 		obstacle_map_path: str,
 		obstacle_map_size: Tuple[int, int],
 		phase: str = "Mapa Tutorial Alertas de Inclinação",
+		compiled_map=None,
 	):
 		self.project_root = project_root
 		self.obstacle_map_path = obstacle_map_path
+		self.obstacle_map_size = tuple(obstacle_map_size)
 		self.phase = phase
-		self.event_map_image: Optional[pygame.Surface] = self._load_event_map(obstacle_map_size)
+		self.event_map_image: Optional[pygame.Surface] = None
 		self.last_dialog_id: int = 0
 		self.active_dialog_id: int = 0
 		self.active_dialog_text: str = ""
@@ -68,14 +73,46 @@ class DialogueManager:
 		# Grid-based spatial hashing para detecção de eventos
 		self.grid_cell_size: int = 32  # tamanho de cada célula em pixels
 		self.event_grid: Dict[Tuple[int, int], int] = {}  # (grid_x, grid_y) -> dialog_id
-		self._build_event_grid()
+		# Raster com o dialog_id de cada pixel (gerado em uma única passada)
+		self._dialog_ids = None
+		if not self._use_compiled_map(compiled_map):
+			self.event_map_image = self._load_event_map(self.obstacle_map_size)
+			self._build_event_grid()
 
 	@property
 	def enabled(self) -> bool:
-		return self.event_map_image is not None
+		return self.event_map_image is not None or self._dialog_ids is not None
+
+	def _use_compiled_map(self, compiled_map) -> bool:
+		"""Usa o raster de diálogos do cache de mapas compilados (World/map_cache.py),
+		evitando carregar e classificar o EventMap. Só vale quando o raster foi
+		gerado com a paleta desta fase e no tamanho do mapa de obstáculos.
+		"""
+		if compiled_map is None or compiled_map.dialog_ids is None:
+			return False
+		if compiled_map.map_name != self.phase:
+			return False
+		if (compiled_map.width, compiled_map.height) != self.obstacle_map_size:
+			return False
+		self._dialog_ids = compiled_map.dialog_ids
+		self.event_grid = sample_dialog_grid(self._dialog_ids, self.grid_cell_size)
+		return True
+
+	def _event_map_size(self) -> Tuple[int, int]:
+		if self.event_map_image is not None:
+			return self.event_map_image.get_size()
+		return self.obstacle_map_size
 
 	def set_phase(self, phase: str) -> None:
+		if phase == self.phase:
+			return
 		self.phase = phase
+		# As cores de diálogo dependem da fase; reclassifica o EventMap
+		self.event_grid = {}
+		self._dialog_ids = None
+		if self.event_map_image is None:
+			self.event_map_image = self._load_event_map(self.obstacle_map_size)
+		self._build_event_grid()
 
 	def get_dialog_text(self, dialog_id: int, phase: Optional[str] = None) -> str:
 		phase_key = phase or self.phase
@@ -127,7 +164,7 @@ class DialogueManager:
 		bar_h = int(max(0, reserved_bottom))
 		pad_x = 14
 		pad_y = 8
-		text_font = pygame.font.SysFont(None, 22)
+		text_font = get_font(None, 22)
 
 		box_w = min(avail_w, max(320, int(avail_w * 0.96)))
 		wrap_w = max(80, box_w - (pad_x * 2))
@@ -163,7 +200,7 @@ class DialogueManager:
 
 		y = box_y + pad_y
 		for line in text_lines:
-			line_surf = text_font.render(line, True, (245, 245, 245))
+			line_surf = render_text(text_font, line, (245, 245, 245))
 			screen.blit(line_surf, (box_x + pad_x, y))
 			y += line_h
 
@@ -187,43 +224,62 @@ class DialogueManager:
 
 	def _build_event_grid(self) -> None:
 		"""Pré-processa o EventMap em uma grid espacial para detecção O(1).
-		Divide o mapa em células e armazena o dialog_id encontrado em cada célula.
+		Classifica todas as cores de diálogo em uma única passada vetorizada e
+		divide o mapa em células, armazenando o dialog_id encontrado em cada célula.
 		"""
 		if self.event_map_image is None:
 			return
 
-		try:
-			width = self.event_map_image.get_width()
-			height = self.event_map_image.get_height()
-			cell_size = self.grid_cell_size
+		phase_colors = self.DIALOG_COLORS_BY_PHASE.get(self.phase)
+		if not phase_colors:
+			return
 
-			# Itera sobre cada célula da grid
-			for grid_y in range(0, height, cell_size):
-				for grid_x in range(0, width, cell_size):
-					# Amostra 4 pontos estratégicos da célula
-					sample_points = [
-						(grid_x + cell_size // 4, grid_y + cell_size // 4),
-						(grid_x + 3 * cell_size // 4, grid_y + cell_size // 4),
-						(grid_x + cell_size // 4, grid_y + 3 * cell_size // 4),
-						(grid_x + 3 * cell_size // 4, grid_y + 3 * cell_size // 4),
-					]
-
-					dialog_id = 0
-					for px, py in sample_points:
-						if 0 <= px < width and 0 <= py < height:
-							try:
-								color = self.event_map_image.get_at((int(px), int(py)))
-								dialog_id = self._classify_dialog_color(color)
-								if dialog_id != 0:
-									break
-							except Exception:
-								pass
+		if np is None:
+			# Sem NumPy: mesma amostragem, pixel a pixel (get_at)
+			self.event_grid = self._sample_event_grid_per_pixel()
+			return
 
-					if dialog_id != 0:
-						grid_key = (grid_x // cell_size, grid_y // cell_size)
-						self.event_grid[grid_key] = dialog_id
-		except Exception:
-			pass
+		try:
+			analysis = analyze_map(
+				self.event_map_image,
+				labels=0,
+				dialog_colors=phase_colors,
+				dialog_tolerance=self.COLOR_TOLERANCE,
+			)
+			self._dialog_ids = analysis.dialog_ids
+			# Amostra 4 pontos estratégicos de cada célula
+			self.event_grid = analysis.sample_dialog_grid(self.grid_cell_size)
+		except Exception as e:
+			print(f"[Dialogue] Erro ao pré-processar o EventMap, usando get_at: {e}")
+			self._dialog_ids = None
+			self.event_grid = self._sample_event_grid_per_pixel()
+
+	def _sample_event_grid_per_pixel(self) -> Dict[Tuple[int, int], int]:
+		"""Grid de sample_dialog_grid lida com get_at (4 pontos por célula, sem NumPy)."""
+		grid: Dict[Tuple[int, int], int] = {}
+		try:
+			map_w, map_h = self.event_map_image.get_size()
+			cell_size = self.grid_cell_size
+			offsets = [(cell_size // 4, cell_size // 4), (3 * cell_size // 4, cell_size // 4),
+					   (cell_size // 4, 3 * cell_size // 4), (3 * cell_size // 4, 3 * cell_size // 4)]
+			for cell_y in range(0, map_h, cell_size):
+				for cell_x in range(0, map_w, cell_size):
+					for off_x, off_y in offsets:
+						px, py = cell_x + off_x, cell_y + off_y
+						if px < map_w and py < map_h:
+							dialog_id = self._classify_dialog_color(self.event_map_image.get_at((px, py)))
+							if dialog_id != 0:
+								grid[(cell_x // cell_size, cell_y // cell_size)] = dialog_id
+								break
+		except Exception as e:
+			print(f"[Dialogue] Erro ao amostrar o EventMap: {e}")
+		return grid
+
+	def _dialog_id_at(self, px: int, py: int) -> int:
+		"""Retorna o dialog_id do pixel (px, py) do EventMap."""
+		if self._dialog_ids is not None:
+			return int(self._dialog_ids[py, px])
+		return self._classify_dialog_color(self.event_map_image.get_at((px, py)))
 
 	def _detect_dialog_from_grid(self, polygon: Sequence[Tuple[float, float]]) -> int:
 		"""Detecta diálogo usando grid espacial. Muito mais rápido que varredura pixel-a-pixel."""
@@ -240,6 +296,7 @@ class DialogueManager:
 			max_y = int(math.ceil(max(ys)))
 
 			cell_size = self.grid_cell_size
+			map_w, map_h = self._event_map_size()
 
 			# Converte para coordenadas de grid
 			min_grid_x = min_x // cell_size
@@ -264,9 +321,8 @@ class DialogueManager:
 							for px in range(cell_min_x, cell_max_x, max(1, cell_size // 4)):
 								if self._point_in_polygon(float(px) + 0.5, float(py) + 0.5, polygon):
 									try:
-										if 0 <= px < self.event_map_image.get_width() and 0 <= py < self.event_map_image.get_height():
-											color = self.event_map_image.get_at((int(px), int(py)))
-											found_id = self._classify_dialog_color(color)
+										if 0 <= px < map_w and 0 <= py < map_h:
+											found_id = self._dialog_id_at(int(px), int(py))
 											if found_id != 0:
 												return found_id
 									except Exception:
@@ -312,11 +368,10 @@ class DialogueManager:
 		return inside
 
 	def detect_dialog_from_polygon(self, polygon: Sequence[Tuple[float, float]]) -> int:
-		if self.event_map_image is None or not polygon:
+		if not self.enabled or not polygon:
 			return 0
 
-		width = self.event_map_image.get_width()
-		height = self.event_map_image.get_height()
+		width, height = self._event_map_size()
 		xs = [p[0] for p in polygon]
 		ys = [p[1] for p in polygon]
 		min_x = max(int(math.floor(min(xs))), 0)
@@ -332,7 +387,7 @@ class DialogueManager:
 					continue
 
 				try:
-					dialog_id = self._classify_dialog_color(self.event_map_image.get_at((px, py)))
+					dialog_id = self._dialog_id_at(px, py)
 					if dialog_id != 0:
 						return dialog_id
 				except Exception:
@@ -9,6 +9,9 @@ import json
 import pygame
 from typing import Dict, Optional, Tuple, List
 
+from World.map_cache import CompiledMap, load_compiled_map
+from World.map_raster import LABEL_BLUE, LABEL_GREEN, LABEL_YELLOW, MapAnalysis, analyze_map
+
 
 class EventMapManager:
     """
@@ -61,85 +64,60 @@ class EventMapManager:
         # Carregar dados
         self._load()
     
-    def _find_green_center(self, img) -> Optional[Tuple[float, float]]:
+    def _analyze_event_map(self, img) -> Optional[MapAnalysis]:
         """
-        Encontra o centróide de pixels verdes (spawn do player).
-        Verde é definido como: g >= 200, r < 100, b < 100
+        Classifica todos os pixels do EventMap em uma única passada vetorizada.
+
+        A análise fornece:
+        - green_center: centróide dos pixels verdes (spawn do player),
+          verde é g >= 200, r < 100, b < 100
+        - blue_center: centróide dos pixels azuis (spawn do trafo),
+          azul é b > max(r,g) + 30 and b > 80
+        - yellow_zone: caixa delimitadora dos pixels amarelos mais fortes,
+          usada como zona de conclusão da fase
         """
         try:
-            w, h = img.get_width(), img.get_height()
-            totx = toty = count = 0
-            for y in range(h):
-                for x in range(w):
-                    r, g, b, *rest = img.get_at((x, y))
-                    if g >= 200 and r < 100 and b < 100:
-                        totx += x
-                        toty += y
-                        count += 1
-            if count == 0:
-                return None
-            return (totx / count, toty / count)
-        except Exception:
+            return analyze_map(img, labels=LABEL_GREEN | LABEL_BLUE | LABEL_YELLOW)
+        except Exception as e:
+            print(f"[EventMapManager] Erro ao analisar imagem do EventMap: {e}")
             return None
     
-    def _find_blue_center(self, img) -> Optional[Tuple[float, float]]:
+    def get_compiled_map(self) -> Optional[CompiledMap]:
         """
-        Encontra o centróide de pixels azuis (spawn do trafo).
-        Azul é definido como: b > max(r,g) + 30 and b > 80
+        Retorna os artefatos compilados do mapa (grid de colisão, spawns,
+        zona de conclusão e raster de diálogos), lidos do cache em disco
+        (World/CompiledMaps) ou recompilados se o PNG/JSON mudou.
+        
+        Returns:
+            CompiledMap ou None se a compilação falhar
         """
         try:
-            w, h = img.get_width(), img.get_height()
-            totx = toty = count = 0
-            for y in range(h):
-                for x in range(w):
-                    r, g, b, *rest = img.get_at((x, y))
-                    if b > max(r, g) + 30 and b > 80:
-                        totx += x
-                        toty += y
-                        count += 1
-            if count == 0:
-                return None
-            return (totx / count, toty / count)
-        except Exception:
+            return load_compiled_map(self.map_path, self.event_map_dir)
+        except Exception as e:
+            print(f"[EventMapManager] Erro ao compilar mapa '{self.map_name}': {e}")
             return None
-
-    def _find_yellow_completion_zone(self, img) -> Optional[Dict[str, int]]:
+    
+    def _discover_event_features(self) -> Tuple[Optional[Tuple], Optional[Tuple], Optional[Dict]]:
         """
-        Encontra a área amarela usada como zona de conclusão da fase.
-
-        A zona é detectada pelos pixels amarelos mais fortes do EventMap.
-        Se houver um retângulo amarelo desenhado no mapa, isso devolve a caixa
-        delimitadora dele para uso como área de conclusão.
+        Descobre (green_center, blue_center, yellow_zone) do EventMap, usando o
+        cache de mapas compilados e, se ele falhar, analisando a imagem.
         """
-        try:
-            w, h = img.get_width(), img.get_height()
-            min_x = w
-            min_y = h
-            max_x = -1
-            max_y = -1
-            count = 0
-
-            for y in range(h):
-                for x in range(w):
-                    r, g, b, *rest = img.get_at((x, y))
-                    if r >= 220 and g >= 200 and b <= 120 and abs(int(r) - int(g)) <= 80:
-                        min_x = min(min_x, x)
-                        min_y = min(min_y, y)
-                        max_x = max(max_x, x)
-                        max_y = max(max_y, y)
-                        count += 1
-
-            if count == 0 or max_x < min_x or max_y < min_y:
-                return None
-
-            return {
-                'x': int(min_x),
-                'y': int(min_y),
-                'width': int(max_x - min_x + 1),
-                'height': int(max_y - min_y + 1),
-            }
-        except Exception:
-            return None
+        compiled = self.get_compiled_map()
+        if compiled is not None and compiled.has_event_map:
+            return compiled.player_spawn, compiled.trafo_spawn, compiled.completion_zone
+        
+        # Garantir que pygame.display está inicializado
+        if pygame.display.get_surface() is None:
+            try:
+                pygame.display.set_mode((1, 1))
+            except Exception:
+                pass
+        
+        img = pygame.image.load(self.event_map_image_path).convert()
+        analysis = self._analyze_event_map(img)
+        if analysis is None:
+            return None, None, None
+        return analysis.green_center, analysis.blue_center, analysis.yellow_zone
     
     def _auto_discover_spawns(self) -> Dict:
         """
@@ -156,23 +134,12 @@ class EventMapManager:
         # Tentar carregar imagem do EventMap para descobrir spawns
         try:
             if os.path.exists(self.event_map_image_path):
-                # Garantir que pygame.display está inicializado
-                if pygame.display.get_surface() is None:
-                    try:
-                        pygame.display.set_mode((1, 1))
-                    except Exception:
-                        pass
-                
-                img = pygame.image.load(self.event_map_image_path).convert()
-                
-                green = self._find_green_center(img)
-                blue = self._find_blue_center(img)
+                green, blue, completion_zone = self._discover_event_features()
                 
                 if green:
                     player_spawn = list(green)
                 if blue:
                     trafo_spawn = list(blue)
-                completion_zone = self._find_yellow_completion_zone(img)
                 
                 # Log para debug
                 msg = f"[EventMapManager] Auto-descoberto para '{self.map_name}': "
@@ -222,14 +189,7 @@ class EventMapManager:
             if not os.path.exists(self.event_map_image_path):
                 return False
 
-            if pygame.display.get_surface() is None:
-                try:
-                    pygame.display.set_mode((1, 1))
-                except Exception:
-                    pass
-
-            img = pygame.image.load(self.event_map_image_path).convert()
-            completion_zone = self._find_yellow_completion_zone(img)
+            _green, _blue, completion_zone = self._discover_event_features()
             if completion_zone:
                 self._metadata['completion_zone'] = completion_zone
                 print(f"[EventMapManager] Zona de conclusão descoberta para '{self.map_name}': {completion_zone}")
@@ -389,6 +349,21 @@ class EventMapManager:
         """
         return self._metadata.get('phase_config', {})
 
+    def get_collision_backend(self) -> Optional[str]:
+        """
+        Retorna o backend de colisão escolhido para este mapa.
+
+        Definido no JSON como "collision_backend": 'raster', 'mask' ou
+        'vector' (contornos vetorizados + BVH).
+
+        Returns:
+            Nome do backend ou None para usar o padrão (COLLISION_BACKEND)
+        """
+        backend = self._metadata.get('collision_backend')
+        if isinstance(backend, str) and backend.strip():
+            return backend.strip().lower()
+        return None
+
     def get_completion_zone(self) -> Optional[pygame.Rect]:
         """
         Retorna a zona retangular de conclusão da fase, se existir.
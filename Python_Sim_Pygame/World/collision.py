@@ -6,22 +6,22 @@ Separates collision algorithms from main game loop for better maintainability.
 import math
 import pygame
 
+from World.map_raster import (
+    LABEL_BLUE, LABEL_GREEN, analyze_map, build_occupancy_array, numpy_available,
+)
+from World.occupancy import (
+    BLOCK_EMPTY, BLOCK_FULL, BLOCK_MIXED, OccupancyBitmap, point_query, rect_query, span_query,
+)
+
+from game.config import SWEEP_BISECTION_STEPS, SWEEP_MAX_STEP_PX, SWEEP_MAX_SUBSTEPS, SWEEP_MAX_TESTS
+
 
 def find_green_center(img, thresh=200):
     """
     Lightweight: find a green pixel (centroid of green area) to use as spawn 
     and to ignore in collisions.
     """
-    w, h = img.get_width(), img.get_height()
-    totx = toty = count = 0
-    for y in range(h):
-        for x in range(w):
-            r, g, b, *rest = img.get_at((x, y))
-            if g >= thresh and r < 100 and b < 100:
-                totx += x; toty += y; count += 1
-    if count == 0:
-        return None
-    return (totx / count, toty / count)
+    return analyze_map(img, labels=LABEL_GREEN, green_thresh=thresh).green_center
 
 
 def find_blue_center(img):
@@ -30,24 +30,33 @@ def find_blue_center(img):
     larger than R and G (robust to different blue intensities).
     Returns (x,y) in image/world coordinates or None if not found.
     """
-    w, h = img.get_width(), img.get_height()
-    totx = toty = count = 0
-    for y in range(h):
-        for x in range(w):
-            r, g, b, *rest = img.get_at((x, y))
-            # blue if b is notably higher than r and g and has decent intensity
-            if b > max(r, g) + 30 and b > 80:
-                totx += x; toty += y; count += 1
-    if count == 0:
-        return None
-    return (totx / count, toty / count)
+    return analyze_map(img, labels=LABEL_BLUE).blue_center
 
 
 def build_collision_grid(img):
     """
-    Build a virtual collision map once: a grid (bytearray per row) where 
-    1 means occupied. Only BLACK pixels cause collision/death.
+    Build a virtual collision map once: a grid where 1 means occupied.
+    Only BLACK pixels cause collision/death.
     Everything else (green spawn, white, gray path, blue marker) is safe.
+
+    The map is thresholded in a single vectorized pass through
+    pygame.surfarray and returned as a contiguous (height, width) uint8 array.
+    grid[y][x] indexing is the same as the per-row bytearray grid, so
+    check_poly_collision/check_line_collision work with either one (and with
+    the bit-packed OccupancyBitmap loaded from the compiled-map cache).
+    Falls back to the per-pixel builder only when NumPy is not installed;
+    any other error of the vectorized pass propagates.
+    """
+    if numpy_available():
+        return build_occupancy_array(img)
+    return build_collision_grid_per_pixel(img)
+
+
+def build_collision_grid_per_pixel(img):
+    """
+    Per-pixel (get_at) collision grid builder: a grid (bytearray per row)
+    where 1 means occupied. Kept as the NumPy-less fallback and as the
+    baseline for benchmarks/bench_collision_grid.py.
     """
     w, h = img.get_width(), img.get_height()
     grid = [bytearray(w) for _ in range(h)]
@@ -135,8 +144,57 @@ def line_rect_collision(p1, p2, rect):
     return False
 
 
+def poly_row_span(poly, py, minx, maxx):
+    """
+    Yield the inclusive x-spans of row `py` whose pixel centers
+    (px + 0.5, py + 0.5) are inside `poly`, clipped to [minx, maxx].
+
+    Uses the same crossing formula as point_in_poly: a center is inside when
+    an odd number of edge crossings lie to its right, i.e. between the
+    1st/2nd, 3rd/4th, ... sorted crossings (x >= c_odd and x < c_even).
+    The span ends are nudged with the exact point_in_poly comparisons so the
+    covered pixels are identical to testing every pixel one by one.
+    """
+    y = py + 0.5
+    crossings = []
+    j = len(poly) - 1
+    for i in range(len(poly)):
+        xi, yi = poly[i]
+        xj, yj = poly[j]
+        if (yi > y) != (yj > y):
+            crossings.append((xj - xi) * (y - yi) / (yj - yi + 1e-12) + xi)
+        j = i
+    crossings.sort()
+
+    for k in range(0, len(crossings) - 1, 2):
+        enter = crossings[k]
+        leave = crossings[k + 1]
+        # first px with px + 0.5 >= enter
+        lo = math.ceil(enter - 0.5)
+        while lo + 0.5 < enter:
+            lo += 1
+        while (lo - 1) + 0.5 >= enter:
+            lo -= 1
+        # last px with px + 0.5 < leave
+        hi = math.ceil(leave - 0.5) - 1
+        while hi + 0.5 >= leave:
+            hi -= 1
+        while (hi + 1) + 0.5 < leave:
+            hi += 1
+        lo = max(lo, minx)
+        hi = min(hi, maxx)
+        if lo <= hi:
+            yield lo, hi
+
+
 def check_poly_collision(poly, collision_grid, map_image):
-    """Check if a polygon collides with the collision grid (black pixels)."""
+    """
+    Check if a polygon collides with the collision grid (black pixels).
+    Scanline rasterizer: each row's covered x-span is computed analytically
+    (see poly_row_span) and tested against the grid row in one span query,
+    stopping at the first hit. Gives the same result as testing every pixel
+    center of the bounding box with point_in_poly.
+    """
     # compute integer bounding box of polygon to limit work
     xs = [p[0] for p in poly]
     ys = [p[1] for p in poly]
@@ -144,88 +202,664 @@ def check_poly_collision(poly, collision_grid, map_image):
     maxx = min(int(math.ceil(max(xs))), map_image.get_width() - 1)
     miny = max(int(math.floor(min(ys))), 0)
     maxy = min(int(math.ceil(max(ys))), map_image.get_height() - 1)
+    if minx > maxx or miny > maxy:
+        return False
 
-    for px in range(minx, maxx + 1):
-        for py in range(miny, maxy + 1):
-            world_x = px + 0.5
-            world_y = py + 0.5
-            if point_in_poly(world_x, world_y, poly):
-                map_x = int(world_x)
-                map_y = int(world_y)
-                if not (0 <= map_x < map_image.get_width() and 0 <= map_y < map_image.get_height()):
-                    continue
-                try:
-                    if collision_grid[map_y][map_x]:
-                        return True
-                except Exception:
-                    continue
+    # bit-packed grids answer "is anything under the bounding box?" in one query
+    if isinstance(collision_grid, OccupancyBitmap):
+        if not collision_grid.rect_occupied(minx, miny, maxx, maxy):
+            return False
+    span_occupied = span_query(collision_grid)
+
+    for py in range(miny, maxy + 1):
+        for lo, hi in poly_row_span(poly, py, minx, maxx):
+            try:
+                if span_occupied(py, lo, hi):
+                    return True
+            except Exception:
+                continue
     return False
 
 
+def clip_segment_to_rect(p1, p2, width, height, x0=0, y0=0):
+    """
+    Liang-Barsky clip of the segment p1 -> p2 against
+    [x0, x0 + width] x [y0, y0 + height].
+    Returns the parametric range (t0, t1) inside the rectangle, or None.
+    """
+    x1, y1 = p1[0] - x0, p1[1] - y0
+    dx = p2[0] - p1[0]
+    dy = p2[1] - p1[1]
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1), (dx, width - x1), (-dy, y1), (dy, height - y1)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return None
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return None
+            t1 = min(t1, t)
+    return t0, t1
+
+
+def traverse_grid(p1, p2, width, height, x0=0, y0=0):
+    """
+    Yield the grid cells crossed by the segment p1 -> p2, in order, as
+    (cell_x, cell_y, t) where t in [0, 1] is the parametric distance along the
+    segment at which it enters the cell (integer DDA / Amanatides-Woo voxel
+    traversal). Every crossed cell is visited exactly once; the segment is
+    clipped to the width x height window of cells starting at (x0, y0) first.
+    """
+    clipped = clip_segment_to_rect(p1, p2, width, height, x0, y0)
+    if clipped is None:
+        return
+    t_enter, t_exit = clipped
+
+    x1, y1 = p1
+    dx = p2[0] - x1
+    dy = p2[1] - y1
+
+    # start and end cells (points on the far window border belong to the last cell)
+    last_x, last_y = x0 + width - 1, y0 + height - 1
+    ix = min(max(int(math.floor(x1 + dx * t_enter)), x0), last_x)
+    iy = min(max(int(math.floor(y1 + dy * t_enter)), y0), last_y)
+    end_x = min(max(int(math.floor(x1 + dx * t_exit)), x0), last_x)
+    end_y = min(max(int(math.floor(y1 + dy * t_exit)), y0), last_y)
+
+    if dx > 0:
+        step_x, t_max_x, t_delta_x = 1, (ix + 1 - x1) / dx, 1.0 / dx
+    elif dx < 0:
+        step_x, t_max_x, t_delta_x = -1, (ix - x1) / dx, -1.0 / dx
+    else:
+        step_x, t_max_x, t_delta_x = 0, math.inf, math.inf
+    if dy > 0:
+        step_y, t_max_y, t_delta_y = 1, (iy + 1 - y1) / dy, 1.0 / dy
+    elif dy < 0:
+        step_y, t_max_y, t_delta_y = -1, (iy - y1) / dy, -1.0 / dy
+    else:
+        step_y, t_max_y, t_delta_y = 0, math.inf, math.inf
+
+    t = t_enter
+    # one step per crossed cell border: the walk always ends on the end cell
+    for _ in range(abs(end_x - ix) + abs(end_y - iy) + 1):
+        yield ix, iy, t
+        if ix == end_x and iy == end_y:
+            break
+        if (t_max_x < t_max_y and ix != end_x) or iy == end_y:
+            t = t_max_x
+            t_max_x += t_delta_x
+            ix += step_x
+        else:
+            t = t_max_y
+            t_max_y += t_delta_y
+            iy += step_y
+
+
+def raycast_grid(p1, p2, collision_grid, width, height):
+    """
+    Walk the grid cells crossed by the segment p1 -> p2 (traverse_grid) and
+    return the first occupied one.
+
+    Every cell the segment passes through is visited exactly once, in order,
+    so thin diagonal walls cannot be skipped. Cells outside the map are free.
+    Returns (cell_x, cell_y, t) where t in [0, 1] is the parametric distance
+    along the segment at which it enters the hit cell, or None if the
+    segment is clear. Reusable for sensor raycasts (t * length = distance).
+
+    Bit-packed grids with a pyramid (OccupancyBitmap.build_pyramid) are
+    walked coarse to fine: empty blocks are stepped over whole and only
+    occupied ones are walked cell by cell.
+    """
+    if isinstance(collision_grid, OccupancyBitmap):
+        pyramid = collision_grid.pyramid
+        if pyramid is not None:
+            top = len(pyramid.block_sizes) - 1
+            size = pyramid.block_sizes[top]
+            return _raycast_blocks(p1, p2, collision_grid, pyramid, top, 0, 0,
+                                   -(-width // size), -(-height // size))
+        # skip the walk when the segment's bounding box is free
+        if not collision_grid.rect_occupied(
+                math.floor(min(p1[0], p2[0])), math.floor(min(p1[1], p2[1])),
+                math.floor(max(p1[0], p2[0])), math.floor(max(p1[1], p2[1]))):
+            return None
+
+    is_occupied = point_query(collision_grid)
+    for ix, iy, t in traverse_grid(p1, p2, width, height):
+        try:
+            if is_occupied(ix, iy):
+                return ix, iy, t
+        except Exception:
+            pass
+    return None
+
+
+def _raycast_blocks(p1, p2, bitmap, pyramid, level, bx0, by0, cols, rows):
+    """
+    raycast_grid over the cols x rows window of `level` blocks starting at
+    block (bx0, by0): empty blocks are skipped, the first cell entered in a
+    full block is a hit, mixed blocks descend one level (or, at the finest
+    level, are walked cell by cell).
+    """
+    size = pyramid.block_sizes[level]
+    inv = 1.0 / size
+    for bx, by, _t in traverse_grid((p1[0] * inv, p1[1] * inv), (p2[0] * inv, p2[1] * inv),
+                                    cols, rows, bx0, by0):
+        state = pyramid.block_state(level, bx, by)
+        if state == BLOCK_EMPTY:
+            continue
+        if state == BLOCK_MIXED and level > 0:
+            ratio = size // pyramid.block_sizes[level - 1]
+            hit = _raycast_blocks(p1, p2, bitmap, pyramid, level - 1,
+                                  bx * ratio, by * ratio, ratio, ratio)
+        else:
+            x0, y0 = bx * size, by * size
+            w = min(size, bitmap.width - x0)
+            h = min(size, bitmap.height - y0)
+            hit = None
+            for ix, iy, t in traverse_grid(p1, p2, w, h, x0, y0):
+                if state == BLOCK_FULL or bitmap.is_occupied(ix, iy):
+                    hit = ix, iy, t
+                    break
+        if hit is not None:
+            return hit
+    return None
+
+
 def check_line_collision(p1, p2, collision_grid, map_image):
-    """Check if a line segment collides with the collision grid (black pixels)."""
+    """
+    Check if a line segment collides with the collision grid (black pixels).
+    Exact grid traversal: every cell crossed by the segment is tested once
+    (see raycast_grid).
+    """
+    width, height = map_image.get_size()
     x1, y1 = p1
     x2, y2 = p2
-    dx = x2 - x1
-    dy = y2 - y1
-    length = math.hypot(dx, dy)
-    if length < 1e-6:
+    if math.hypot(x2 - x1, y2 - y1) < 1e-6:
         # degenerate: treat single point
         ix, iy = int(round(x1)), int(round(y1))
-        if 0 <= ix < map_image.get_width() and 0 <= iy < map_image.get_height():
+        if 0 <= ix < width and 0 <= iy < height:
             try:
-                return bool(collision_grid[iy][ix])
+                return point_query(collision_grid)(ix, iy)
             except Exception:
                 return False
         return False
-
-    steps = int(math.ceil(length))
-    for i in range(steps + 1):
-        t = float(i) / float(steps)
-        wx = x1 + dx * t
-        wy = y1 + dy * t
-        ix = int(wx)
-        iy = int(wy)
-        if not (0 <= ix < map_image.get_width() and 0 <= iy < map_image.get_height()):
-            continue
-        try:
-            if collision_grid[iy][ix]:
-                return True
-        except Exception:
-            continue
-    return False
+    return raycast_grid(p1, p2, collision_grid, width, height) is not None
 
 
-def check_player_collision_with_map(player, collision_grid, map_image):
+def check_hitbox_collision_with_map(parts, collision_grid, map_image, footprints=None):
     """
-    Check all parts of the player hitbox against the collision grid.
-    Returns True if collision detected.
+    Check hitbox parts (as returned by Player.get_rotated_hitbox) against the
+    collision grid. Returns True if collision detected.
+    With a part collider as `footprints` the parts are tested by its
+    hitbox_collides(): cached pygame.mask footprints
+    (game.footprint.FootprintCollider) or the vectorized obstacle outlines
+    (VectorCollider) instead of per-part geometry.
     """
-    collided = False
-    parts = player.get_rotated_hitbox()
-    
+    if footprints is not None:
+        return footprints.hitbox_collides(parts)
     for kind, data in parts:
-        if collided:
-            break
         try:
             if kind == 'wheel':
                 # data is poly (list of points)
                 if check_poly_collision(data, collision_grid, map_image):
-                    collided = True
-                    break
+                    return True
             elif kind in ('edge', 'line', 'side'):
                 p1, p2 = data
                 if check_line_collision(p1, p2, collision_grid, map_image):
-                    collided = True
-                    break
+                    return True
             else:
                 # unknown part: if it's a polygon-like sequence assume polygon
                 if isinstance(data, (list, tuple)) and len(data) >= 3:
                     if check_poly_collision(data, collision_grid, map_image):
-                        collided = True
-                        break
+                        return True
         except Exception:
             # safe fallback: ignore this part on error
             continue
-    
-    return collided
+    return False
+
+
+def hitbox_reach(parts, cx, cy):
+    """Distance from (cx, cy) to the farthest point of the hitbox parts."""
+    return max((math.hypot(x - cx, y - cy) for _kind, data in parts for x, y in data), default=0.0)
+
+
+def check_player_collision_with_map(player, collision_grid, map_image, footprints=None,
+                                    distance_field=None):
+    """
+    Check all parts of the player hitbox against the collision grid.
+    Returns True if collision detected.
+    With a World.distance_field.DistanceField the test returns at once when
+    the clearance of the player center exceeds the hitbox radius.
+    """
+    parts = player.get_rotated_hitbox()
+    if distance_field is not None:
+        try:
+            if distance_field.clearance(player.x, player.y) > hitbox_reach(parts, player.x, player.y):
+                return False
+        except Exception:
+            pass
+    return check_hitbox_collision_with_map(parts, collision_grid, map_image, footprints)
+
+
+# ---------------------------------------------------------------------------
+# Vector backend: hitbox parts against the simplified obstacle outlines
+# ---------------------------------------------------------------------------
+
+def _orient(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def segments_touch(a1, a2, b1, b2):
+    """
+    True if two segments intersect or touch (endpoints and collinear overlap
+    included, unlike seg_intersect).
+    """
+    (ax, ay), (bx, by) = a1, a2
+    (cx, cy), (dx, dy) = b1, b2
+    if max(ax, bx) < min(cx, dx) or max(cx, dx) < min(ax, bx) \
+            or max(ay, by) < min(cy, dy) or max(cy, dy) < min(ay, by):
+        return False
+    d1 = _orient(cx, cy, dx, dy, ax, ay)
+    d2 = _orient(cx, cy, dx, dy, bx, by)
+    d3 = _orient(ax, ay, bx, by, cx, cy)
+    d4 = _orient(ax, ay, bx, by, dx, dy)
+    return d1 * d2 <= 0.0 and d3 * d4 <= 0.0
+
+
+def convex_separating_axes(poly):
+    """
+    Edge normals of a convex polygon with its projection interval on each:
+    [(nx, ny, lo, hi)], for repeated SAT tests against segments.
+    """
+    axes = []
+    n = len(poly)
+    for i in range(n):
+        (x1, y1), (x2, y2) = poly[i], poly[(i + 1) % n]
+        nx, ny = y1 - y2, x2 - x1
+        if nx == 0.0 and ny == 0.0:
+            continue
+        proj = [nx * x + ny * y for x, y in poly]
+        axes.append((nx, ny, min(proj), max(proj)))
+    return axes
+
+
+def convex_segment_overlap(poly, axes, x1, y1, x2, y2):
+    """
+    Separating axis test of a convex polygon (with its
+    convex_separating_axes) against the segment (x1, y1)-(x2, y2).
+    """
+    for nx, ny, lo, hi in axes:
+        s1 = nx * x1 + ny * y1
+        s2 = nx * x2 + ny * y2
+        if (s1 if s1 > s2 else s2) < lo or (s1 if s1 < s2 else s2) > hi:
+            return False
+    # the segment's own normal
+    nx, ny = y1 - y2, x2 - x1
+    s = nx * x1 + ny * y1
+    below = above = False
+    for x, y in poly:
+        p = nx * x + ny * y
+        if p <= s:
+            below = True
+        if p >= s:
+            above = True
+    return below and above
+
+
+class VectorCollider:
+    """
+    Hitbox test against the simplified obstacle outlines of the map
+    (World.map_vector.MapContours) instead of the pixels: the edges near the
+    hitbox come from the outline BVH, wheels are tested against them with
+    SAT, edge/side segments with a segment test and other polygons (swept
+    quads) with edge crossings plus point-in-polygon.
+
+    A part that crosses no outline edge is either fully free or fully inside
+    an obstacle; one of its vertices settles which, read from the collision
+    grid in O(1). Results match the raster test up to the outline tolerance
+    (World.map_vector.CONTOUR_TOLERANCE_PX).
+    """
+
+    def __init__(self, contours, collision_grid, map_image):
+        self.contours = contours
+        self.bvh = contours.bvh
+        self.collision_grid = collision_grid
+        self.width, self.height = map_image.get_size()
+        self._point = point_query(collision_grid)
+
+    @property
+    def nbytes(self):
+        return self.contours.nbytes + self.bvh.nbytes
+
+    def point_inside(self, x, y):
+        """True if (x, y) lies on an obstacle pixel (False off the map)."""
+        px, py = int(math.floor(x)), int(math.floor(y))
+        if 0 <= px < self.width and 0 <= py < self.height:
+            return self._point(px, py)
+        return False
+
+    def part_collides(self, kind, data, edges):
+        """Test one hitbox part against candidate outline edges (x1, y1, x2, y2)."""
+        xs = [p[0] for p in data]
+        ys = [p[1] for p in data]
+        x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+        near = [e for e in edges
+                if not (e[0] > x1 and e[2] > x1 or e[0] < x0 and e[2] < x0
+                        or e[1] > y1 and e[3] > y1 or e[1] < y0 and e[3] < y0)]
+        if near:
+            if kind in ('edge', 'line', 'side') and len(data) == 2:
+                p1, p2 = data
+                for ex1, ey1, ex2, ey2 in near:
+                    if segments_touch(p1, p2, (ex1, ey1), (ex2, ey2)):
+                        return True
+            elif kind == 'wheel' and len(data) == 4:
+                axes = convex_separating_axes(data)
+                for ex1, ey1, ex2, ey2 in near:
+                    if convex_segment_overlap(data, axes, ex1, ey1, ex2, ey2):
+                        return True
+            elif len(data) >= 3:
+                n = len(data)
+                for ex1, ey1, ex2, ey2 in near:
+                    if point_in_poly(ex1, ey1, data):
+                        return True
+                    for i in range(n):
+                        if segments_touch(data[i], data[(i + 1) % n], (ex1, ey1), (ex2, ey2)):
+                            return True
+        return self.point_inside(*data[0])
+
+    def hitbox_collides(self, parts):
+        if not parts:
+            return False
+        xs = [p[0] for _kind, data in parts for p in data]
+        ys = [p[1] for _kind, data in parts for p in data]
+        edges = self.bvh.query(min(xs), min(ys), max(xs), max(ys))
+        if not edges:
+            # no outline under the hitbox bounds: all free or all obstacle
+            return self.point_inside(xs[0], ys[0])
+        for kind, data in parts:
+            try:
+                if self.part_collides(kind, data, edges):
+                    return True
+            except Exception:
+                # safe fallback: ignore this part on error
+                continue
+        return False
+
+
+def make_vector_collider(contours, collision_grid, map_image):
+    """VectorCollider over `contours`, or None (raster test) if it cannot be built."""
+    if contours is None:
+        print("[Collision] Contornos vetoriais indisponíveis, usando o raster")
+        return None
+    try:
+        return VectorCollider(contours, collision_grid, map_image)
+    except Exception as e:
+        print(f"[Collision] Backend vetorial indisponível, usando o raster: {e}")
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Swept collision between two poses
+# ---------------------------------------------------------------------------
+
+def body_motion(start_pose, end_pose):
+    """
+    Rigid motion of the body from start_pose to end_pose (Player.get_pose()).
+    Every rigid 2D motion is a rotation about a fixed point (the ICR for
+    curve/pivotal moves) or a pure translation (straight/diagonal moves).
+    Returns (dtheta_rad, center, translation); center is None for translations.
+    """
+    dtheta_deg = ((end_pose['heading'] - start_pose['heading'] + 180.0) % 360.0) - 180.0
+    dtheta = math.radians(dtheta_deg)
+    px, py = start_pose['x'], start_pose['y']
+    qx, qy = end_pose['x'], end_pose['y']
+    if abs(dtheta) < 1e-9:
+        return 0.0, None, (qx - px, qy - py)
+
+    # solve (I - R) c = q - R p for the rotation center c
+    cos_t, sin_t = math.cos(dtheta), math.sin(dtheta)
+    rx = qx - (cos_t * px - sin_t * py)
+    ry = qy - (sin_t * px + cos_t * py)
+    a, b = 1.0 - cos_t, sin_t          # I - R = [[a, b], [-b, a]]
+    det = a * a + b * b
+    cx = (a * rx - b * ry) / det
+    cy = (b * rx + a * ry) / det
+    return dtheta, (cx, cy), (qx - px, qy - py)
+
+
+def move_point(point, motion, fraction):
+    """Apply `fraction` of a body_motion() to a point (negative moves back)."""
+    dtheta, center, (tx, ty) = motion
+    x, y = point
+    if center is None:
+        return (x + tx * fraction, y + ty * fraction)
+    angle = dtheta * fraction
+    cos_t, sin_t = math.cos(angle), math.sin(angle)
+    dx, dy = x - center[0], y - center[1]
+    return (center[0] + dx * cos_t - dy * sin_t, center[1] + dx * sin_t + dy * cos_t)
+
+
+def _move_parts(parts, motion, fraction):
+    moved = []
+    for kind, data in parts:
+        try:
+            moved.append((kind, [move_point(p, motion, fraction) for p in data]))
+        except Exception:
+            continue
+    return moved
+
+
+def _parts_bounds(parts):
+    xs = [p[0] for _kind, data in parts for p in data]
+    ys = [p[1] for _kind, data in parts for p in data]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _segment_sweeps(parts_from, parts_to):
+    """
+    Quads swept by the segment parts ('edge'/'side') between two poses.
+    A segment that crosses its own previous position gives a bow-tie, whose
+    two triangles are still inside for the even-odd rule of point_in_poly.
+    """
+    quads = []
+    for (kind, data_from), (_kind, data_to) in zip(parts_from, parts_to):
+        if kind in ('edge', 'line', 'side') and len(data_from) == 2:
+            quads.append(('sweep', [data_from[0], data_from[1], data_to[1], data_to[0]]))
+    return quads
+
+
+def sweep_player_collision_with_map(player, start_pose, collision_grid, map_image, footprints=None,
+                                    distance_field=None):
+    """
+    Continuous collision test of the player hitbox between start_pose (taken
+    with Player.get_pose() before the movement of this tick) and its current
+    pose, so thin walls cannot be tunneled through at high speed.
+
+    The end hitbox is moved back along the body motion of the tick and the
+    path is split in substeps of at most SWEEP_MAX_STEP_PX. Each substep tests
+    the hitbox at its end plus the quads swept by the edge/side segments, so
+    the robot outline covers the whole path; the wheels are thicker than a
+    substep and cannot skip a wall either. The first hit interval is refined
+    by bisection and the player is placed at the contact pose (the earliest
+    colliding one, so it still reads as a collision next tick).
+
+    Cost is bounded: one rectangle query over the swept bounds when that area
+    is free, at most SWEEP_MAX_TESTS hitbox tests otherwise (a substep or
+    bisection interval whose bounds cover no occupied cell needs none). Once they are
+    spent the untested rest of the path counts as a hit: the player stops at
+    the hit_s found so far (conservative, it may be short of the wall). Moves
+    longer than SWEEP_MAX_SUBSTEPS * SWEEP_MAX_STEP_PX per tick use longer
+    substeps. If the hitbox already collided at start_pose (e.g. a dead robot
+    backing out of a wall) only the final pose is tested.
+
+    `footprints` selects the mask-based or vector part test (see
+    check_hitbox_collision_with_map); the mask test checks the swept quads
+    with geometry.
+    With a `distance_field` the whole test is skipped in O(1) when the
+    clearance of the end pose center exceeds the hitbox radius plus the
+    longest path travelled by a hitbox point; otherwise the substeps advance
+    conservatively: while the hitbox clearance exceeds the path left to the
+    next substep, no hitbox point can reach a wall and the hitbox test is
+    skipped (the path advances by the whole clearance).
+
+    Returns (collided, time_of_impact) with time_of_impact in [0, 1].
+    """
+    tests_left = [SWEEP_MAX_TESTS]
+
+    def hits(parts):
+        tests_left[0] -= 1
+        return check_hitbox_collision_with_map(parts, collision_grid, map_image, footprints)
+
+    end_parts = player.get_rotated_hitbox()
+    if start_pose is None or not end_parts:
+        return hits(end_parts), 1.0
+
+    end_pose = player.get_pose()
+    motion = body_motion(start_pose, end_pose)
+    dtheta, center, (tx, ty) = motion
+
+    # longest path travelled by a hitbox point (arc length for rotations)
+    if center is None:
+        sweep_len = math.hypot(tx, ty)
+    else:
+        radius = max(math.hypot(x - center[0], y - center[1]) for _k, data in end_parts for x, y in data)
+        sweep_len = abs(dtheta) * radius
+
+    # O(1) early-out: every swept hitbox point stays within reach + sweep_len
+    # of the end pose center
+    if distance_field is not None:
+        try:
+            cx, cy = end_pose['x'], end_pose['y']
+            if distance_field.clearance(cx, cy) > hitbox_reach(end_parts, cx, cy) + sweep_len:
+                return False, 1.0
+        except Exception:
+            pass
+
+    # under one pixel nothing can be skipped: the final pose is enough
+    if sweep_len < 1.0:
+        return hits(end_parts), 1.0
+
+    # early-out: nothing occupied anywhere under the swept area
+    start_parts = _move_parts(end_parts, motion, -1.0)
+    x0, y0, x1, y1 = _parts_bounds(start_parts + end_parts)
+    if center is not None:
+        # arcs bulge out of the start/end bounds by at most the sagitta
+        bulge = radius * (1.0 - math.cos(dtheta / 2.0)) + 1.0
+        x0, y0, x1, y1 = x0 - bulge, y0 - bulge, x1 + bulge, y1 + bulge
+    try:
+        if not rect_query(collision_grid)(math.floor(x0), math.floor(y0), math.ceil(x1), math.ceil(y1)):
+            return False, 1.0
+    except Exception:
+        pass
+
+    def parts_at(s):
+        return end_parts if s >= 1.0 else _move_parts(end_parts, motion, s - 1.0)
+
+    def collides_between(s_from, s_to):
+        parts_to = parts_at(s_to)
+        swept = _segment_sweeps(parts_at(s_from), parts_to)
+        return hits(parts_to + swept)
+
+    def clearance_at(s):
+        try:
+            return distance_field.parts_clearance(parts_at(s))
+        except Exception:
+            return 0.0
+
+    occupied = rect_query(collision_grid)
+
+    def area_free(s_from, s_to):
+        """No occupied cell under the bounds swept between s_from and s_to (no hitbox test)."""
+        bx0, by0, bx1, by1 = _parts_bounds(parts_at(s_from) + parts_at(s_to))
+        pad = 1.0
+        if center is not None:
+            pad += radius * (1.0 - math.cos(dtheta * (s_to - s_from) / 2.0))
+        try:
+            return not occupied(math.floor(bx0 - pad), math.floor(by0 - pad),
+                                math.ceil(bx1 + pad), math.ceil(by1 + pad))
+        except Exception:
+            return False
+
+    substeps = max(1, min(SWEEP_MAX_SUBSTEPS, int(math.ceil(sweep_len / SWEEP_MAX_STEP_PX))))
+    free_s = 0.0
+    hit_s = None
+    start_clear = False
+    clearance, clear_s = 0.0, 0.0
+    while free_s < 1.0:
+        s = min(1.0, free_s + 1.0 / substeps)
+        if distance_field is not None:
+            # conservative advancement: a hitbox point travels at most
+            # sweep_len per unit of s, so none reaches a wall before the clearance
+            clearance, clear_s = clearance_at(free_s), free_s
+            if free_s == 0.0:
+                start_clear = clearance > 0.0
+            if clearance > (s - free_s) * sweep_len:
+                free_s = min(1.0, free_s + clearance / sweep_len)
+                continue
+        if area_free(free_s, s):
+            free_s = s
+            continue
+        if tests_left[0] <= 0:
+            hit_s = s
+            break
+        if not collides_between(free_s, s):
+            free_s = s
+            continue
+        if free_s == 0.0 and not start_clear and tests_left[0] > 0 and hits(start_parts):
+            # already in contact before moving: keep the discrete behaviour
+            return hits(end_parts), 1.0
+
+        hit_s = s
+        for _ in range(SWEEP_BISECTION_STEPS):
+            mid = (free_s + hit_s) * 0.5
+            if clearance > (mid - clear_s) * sweep_len:
+                # still within the clearance measured at clear_s
+                free_s = mid
+                continue
+            if area_free(free_s, mid):
+                free_s = mid
+                continue
+            if tests_left[0] <= 0:
+                break
+            if collides_between(free_s, mid):
+                hit_s = mid
+            else:
+                free_s = mid
+        break
+    if hit_s is None:
+        return False, 1.0
+
+    # the hit may lie in the sliver swept between free_s and hit_s; nudge
+    # forward (1 px at a time) to a pose whose hitbox touches the wall, or
+    # stay at hit_s when none does within the budget
+    contact_s = hit_s
+    for j in range(3):
+        candidate = hit_s + j / sweep_len
+        if candidate >= 1.0 or tests_left[0] <= 0:
+            break
+        if hits(parts_at(candidate)):
+            contact_s = candidate
+            break
+
+    if contact_s < 1.0:
+        player.set_pose(pose_along_motion(end_pose, motion, contact_s - 1.0))
+    return True, contact_s
+
+
+def pose_along_motion(pose, motion, fraction):
+    """Move a Player.get_pose() dict by `fraction` of a body_motion()."""
+    dtheta_deg = math.degrees(motion[0]) * fraction
+    x, y = move_point((pose['x'], pose['y']), motion, fraction)
+    return {
+        'x': x,
+        'y': y,
+        'heading': (pose['heading'] + dtheta_deg) % 360,
+        'wheels': [(move_point(pos, motion, fraction), (heading + dtheta_deg) % 360)
+                   for pos, heading in pose['wheels']],
+    }
@@ -0,0 +1,320 @@
+"""
+Distance field module - Signed distance field of the obstacle occupancy.
+
+The field stores, for every map pixel, the Euclidean distance from its center
+to the center of the nearest obstacle pixel (positive, free space) or to the
+nearest free pixel (negative, inside obstacles). It is computed once per map
+with an exact separable transform (column scans, then the lower envelope of
+parabolas per row, Felzenszwalb & Huttenlocher) vectorized over rows with
+NumPy, or with scipy.ndimage.distance_transform_edt when SciPy is installed
+(same result, several times faster), and stored in the compiled-map cache
+as int16 fixed point. The cache builds it on first use, not with the rest
+of the map (World/map_cache.py). Large maps are transformed in tiles with a
+margin of SDF_HALO_PX, so only a tile is ever unpacked from the bitmap;
+clearances beyond the margin are stored as the margin (a lower bound).
+
+Queries are O(1) table lookups:
+- clearance(x, y): lower bound of the distance from a point to any obstacle;
+- footprint_clearance(player): lower bound of the distance from the whole
+  hitbox to any obstacle, from a few samples along its parts.
+The distance is 1-Lipschitz, so a robot whose center clearance exceeds its
+circumscribed radius cannot touch anything.
+"""
+
+import math
+
+from World.map_raster import np
+from World.occupancy import OccupancyBitmap
+
+try:
+    # optional: C implementation of the exact transform
+    from scipy import ndimage
+except Exception:
+    ndimage = None
+
+
+# Stored units per pixel (int16 fixed point: +-8191 px at 1/4 px)
+SDF_SCALE = 4
+SDF_LIMIT = 32767
+
+# Side of the blocks the field is built in, and px of context around each:
+# clearances up to SDF_HALO_PX are exact, larger ones are stored as
+# SDF_HALO_PX (the early-outs need about the hitbox radius, ~85 px)
+SDF_TILE_PX = 512
+SDF_HALO_PX = 128
+
+# Spacing of the samples footprint_clearance takes along the hitbox parts
+SAMPLE_SPACING_PX = 8.0
+
+# Offset between a point and its pixel center, plus half an obstacle pixel
+_PIXEL_SLACK = math.sqrt(2.0)
+
+
+# Below this largest column distance the row pass is a short brute force
+BRUTE_FORCE_MAX_PX = 48
+
+
+def _envelope_rows(f):
+    """
+    Per row, min over q of (x - q)^2 + f[q] for every x (lower envelope of
+    parabolas), for all rows at once.
+    """
+    h, w = f.shape
+    rows = np.arange(h)
+    # column-major flat state (index j * h + row): take/put beat 2-D fancy indexing
+    fq_all = np.ascontiguousarray((f + np.arange(w, dtype=np.float64) ** 2).T)
+    fq_flat = fq_all.ravel()
+    v = np.zeros(w * h, dtype=np.intp)        # apex of each envelope parabola
+    z = np.empty((w + 1) * h)                 # boundaries between parabolas
+    z[:h] = -np.inf
+    z[h:2 * h] = np.inf
+    k = np.zeros(h, dtype=np.intp)
+
+    for q in range(1, w):
+        fq = fq_all[q]
+        while True:
+            at = k * h + rows
+            vk = v.take(at)
+            s = (fq - fq_flat.take(vk * h + rows)) / (2.0 * (q - vk))
+            pop = s <= z.take(at)
+            if not pop.any():
+                break
+            k -= pop
+        at = (k + 1) * h + rows
+        k += 1
+        v.put(at, q)
+        z.put(at, s)
+        z.put(at + h, np.inf)
+
+    # parabola j of row r covers x in [z[j, r], z[j + 1, r]): find each
+    # pixel's parabola with one searchsorted over all rows (offset per row)
+    valid = np.arange(w)[None, :] <= k[:, None]
+    starts = (np.clip(z.reshape(w + 1, h)[:w].T, -1.0, w) + 1.0 + (rows * (w + 2))[:, None])[valid]
+    apex = v.reshape(w, h).T[valid]
+    keys = (np.arange(w) + 1.0)[None, :] + (rows * (w + 2))[:, None]
+    vk = apex[np.searchsorted(starts, keys.ravel(), side='right') - 1].reshape(h, w)
+    return (np.arange(w)[None, :] - vk) ** 2 + f[rows[:, None], vk]
+
+
+def _brute_force_rows(f, max_dx):
+    """
+    Same as _envelope_rows by shifted minimums, stopping once dx^2 exceeds
+    every distance found so far. Returns None if that needs more than max_dx
+    shifts.
+    """
+    d = f.copy()
+    w = f.shape[1]
+    for dx in range(1, w):
+        dd = float(dx * dx)
+        if dd >= d.max():
+            return d
+        if dx > max_dx:
+            return None
+        np.minimum(d[:, :-dx], f[:, dx:] + dd, out=d[:, :-dx])
+        np.minimum(d[:, dx:], f[:, :-dx] + dd, out=d[:, dx:])
+    return d
+
+
+def squared_distance_transform(sites):
+    """
+    Squared distance from every pixel center to the nearest True pixel of the
+    (height, width) bool array `sites`. Without any site the result is
+    larger than any distance inside the map.
+    """
+    sites = np.asarray(sites, dtype=bool)
+    if sites.shape[1] > sites.shape[0]:
+        # the envelope pass loops over columns: run it along the short side
+        return squared_distance_transform(sites.T).T
+
+    h, w = sites.shape
+    far = float(h + w)  # stands in for infinity (keeps the arithmetic exact)
+    g = np.empty((h, w))
+    prev = np.full(w, far)
+    for y in range(h):
+        prev = np.where(sites[y], 0.0, np.minimum(prev + 1.0, far))
+        g[y] = prev
+    for y in range(h - 2, -1, -1):
+        np.minimum(g[y], g[y + 1] + 1.0, out=g[y])
+
+    # mostly sites (distances inside thin walls): a few shifted minimums
+    # usually beat the envelope pass
+    f = g * g
+    d = None
+    if f.size and np.count_nonzero(sites) * 2 > sites.size:
+        d = _brute_force_rows(f, BRUTE_FORCE_MAX_PX)
+    return d if d is not None else _envelope_rows(f)
+
+
+def _distance_to_sites(sites):
+    """Euclidean distance from every pixel center to the nearest True pixel (inf without any)."""
+    if not sites.any():
+        return np.full(sites.shape, np.inf)
+    if ndimage is not None:
+        # distance of every non-zero pixel to the nearest zero one
+        return ndimage.distance_transform_edt(~sites)
+    return np.sqrt(squared_distance_transform(sites))
+
+
+def build_sdf(occupancy, scale=SDF_SCALE, tile=SDF_TILE_PX, halo=SDF_HALO_PX):
+    """
+    Signed distance field (int16, `scale` units per pixel) of an occupancy
+    grid (OccupancyBitmap or array, non-zero = obstacle). Values are rounded
+    toward -inf so clearances are never overestimated.
+
+    Maps larger than `tile` px on a side are transformed in tile x tile
+    blocks plus `halo` px of context around each (only those pixels are
+    unpacked), so distances up to `halo` px are exact and larger ones are
+    stored as `halo` (a lower bound).
+    """
+    if isinstance(occupancy, OccupancyBitmap):
+        height, width = occupancy.shape
+        bits = occupancy.bits
+
+        def region(y0, y1, x0, x1):
+            b0 = x0 >> 3
+            block = np.unpackbits(bits[y0:y1, b0:(x1 + 7) >> 3], axis=1)
+            return block[:, x0 - 8 * b0:x1 - 8 * b0].astype(bool)
+    else:
+        grid = np.asarray(occupancy)
+        height, width = grid.shape
+
+        def region(y0, y1, x0, x1):
+            return grid[y0:y1, x0:x1] != 0
+
+    sdf = np.empty((height, width), dtype=np.int16)
+    tile = max(1, int(tile))
+    whole = height <= tile and width <= tile
+    for y0 in range(0, height, tile):
+        y1 = min(y0 + tile, height)
+        for x0 in range(0, width, tile):
+            x1 = min(x0 + tile, width)
+            if whole:
+                r = (0, height, 0, width)
+            else:
+                r = (max(0, y0 - halo), min(height, y1 + halo), max(0, x0 - halo), min(width, x1 + halo))
+            occupied = region(*r)
+            inner = (slice(y0 - r[0], y1 - r[0]), slice(x0 - r[2], x1 - r[2]))
+            outside = _distance_to_sites(occupied)[inner]
+            inside = _distance_to_sites(~occupied)[inner]
+            if r != (0, height, 0, width):
+                # sites farther than the halo may lie outside the block
+                np.minimum(outside, halo, out=outside)
+                np.minimum(inside, halo, out=inside)
+            signed = np.where(occupied[inner], -inside, outside)
+            del outside, inside
+            sdf[y0:y1, x0:x1] = np.clip(np.floor(signed * scale), -SDF_LIMIT, SDF_LIMIT)
+    return sdf
+
+
+class DistanceField:
+    """
+    Clearance queries over a signed distance field from build_sdf() (may be
+    a read-only np.memmap from the compiled-map cache).
+    """
+
+    def __init__(self, sdf, scale=SDF_SCALE):
+        self.sdf = np.ascontiguousarray(sdf, dtype=np.int16)
+        self.scale = float(scale)
+        self.height, self.width = self.sdf.shape
+        # Flat int16 view: lookups without NumPy scalar overhead
+        self._flat = memoryview(self.sdf).cast('B').cast('h') if self.sdf.size else None
+
+    @classmethod
+    def from_occupancy(cls, occupancy, scale=SDF_SCALE):
+        return cls(build_sdf(occupancy, scale), scale)
+
+    @property
+    def nbytes(self):
+        return int(self.sdf.nbytes)
+
+    def distance_at(self, px, py):
+        """Signed distance (px) stored for pixel (px, py), which must be inside the map."""
+        return self._flat[py * self.width + px] / self.scale
+
+    def clearance(self, x, y):
+        """
+        Lower bound of the distance from point (x, y) to the nearest obstacle
+        pixel; negative inside obstacles (about the depth to the nearest free
+        pixel). Points outside the map use the nearest map pixel.
+        """
+        if self._flat is None:
+            return math.inf
+        px = min(max(int(math.floor(x)), 0), self.width - 1)
+        py = min(max(int(math.floor(y)), 0), self.height - 1)
+        value = self._flat[py * self.width + px] / self.scale
+        if value <= 0:
+            return value
+        # the point may sit anywhere in its pixel (or off the map)
+        off_x = max(px - x, x - (px + 1), 0.0)
+        off_y = max(py - y, y - (py + 1), 0.0)
+        return value - _PIXEL_SLACK - math.hypot(off_x, off_y)
+
+    def clearance_many(self, xs, ys):
+        """Vectorized clearance() for arrays of point coordinates."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if self._flat is None:
+            return np.full(xs.shape, math.inf)
+        px = np.clip(np.floor(xs), 0, self.width - 1).astype(np.intp)
+        py = np.clip(np.floor(ys), 0, self.height - 1).astype(np.intp)
+        value = self.sdf[py, px] / self.scale
+        off_x = np.maximum(np.maximum(px - xs, xs - (px + 1)), 0.0)
+        off_y = np.maximum(np.maximum(py - ys, ys - (py + 1)), 0.0)
+        return np.where(value > 0, value - _PIXEL_SLACK - np.hypot(off_x, off_y), value)
+
+    def parts_clearance(self, parts, spacing=SAMPLE_SPACING_PX):
+        """
+        Lower bound of the distance from hitbox parts (Player.get_rotated_hitbox)
+        to the nearest obstacle: samples every `spacing` px along each part,
+        minus the farthest any point of the part is from a sample.
+        """
+        axes = []
+        for kind, data in parts:
+            try:
+                if len(data) == 2:
+                    (x1, y1), (x2, y2) = data
+                    axes.append((x1, y1, x2, y2, 0.0))
+                elif len(data) == 4:
+                    # wheel rectangle: sample its long axis
+                    (ax, ay), (bx, by), (cx, cy), (dx, dy) = data
+                    if math.hypot(bx - ax, by - ay) >= math.hypot(cx - bx, cy - by):
+                        axes.append(((ax + dx) * 0.5, (ay + dy) * 0.5, (bx + cx) * 0.5, (by + cy) * 0.5,
+                                     math.hypot(cx - bx, cy - by) * 0.5))
+                    else:
+                        axes.append(((ax + bx) * 0.5, (ay + by) * 0.5, (cx + dx) * 0.5, (cy + dy) * 0.5,
+                                     math.hypot(bx - ax, by - ay) * 0.5))
+            except (TypeError, ValueError):
+                continue
+        if not axes:
+            return math.inf
+
+        x1, y1, x2, y2, half_thickness = np.array(axes, dtype=np.float64).T
+        length = np.hypot(x2 - x1, y2 - y1)
+        n = np.maximum(1, np.ceil(length / spacing)).astype(np.intp)
+        # every point of a part is within `reach` of one of its n + 1 samples
+        reach = np.hypot(length / (2 * n), half_thickness)
+
+        part = np.repeat(np.arange(len(axes)), n + 1)
+        first = np.cumsum(n + 1) - (n + 1)
+        t = (np.arange(part.size) - first[part]) / n[part]
+        xs = x1[part] + (x2 - x1)[part] * t
+        ys = y1[part] + (y2 - y1)[part] * t
+        return float((self.clearance_many(xs, ys) - reach[part]).min())
+
+    def footprint_clearance(self, player, spacing=SAMPLE_SPACING_PX, limit=None):
+        """
+        Lower bound of the distance from the player hitbox to the nearest
+        obstacle. With `limit`, a coarse bound (center clearance minus the
+        hitbox radius) that already reaches it is returned without sampling.
+        """
+        parts = player.get_rotated_hitbox()
+        if limit is not None:
+            cx, cy = player.x, player.y
+            reach = max((math.hypot(x - cx, y - cy) for _kind, data in parts for x, y in data), default=0.0)
+            coarse = self.clearance(cx, cy) - reach
+            if coarse >= limit:
+                return coarse
+        return self.parts_clearance(parts, spacing)
+
+    def __repr__(self):
+        return f"<DistanceField {self.width}x{self.height} {self.nbytes} bytes>"
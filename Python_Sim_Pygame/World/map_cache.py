@@ -0,0 +1,369 @@
+"""
+Map cache module - On-disk cache of compiled map artifacts.
+
+Compiling a map means analyzing its obstacle PNG (bit-packed collision
+occupancy, see World/occupancy.py) and its EventMap PNG (spawns, completion
+zone and dialog color raster). The result is stored in
+World/CompiledMaps/<map name>/ as a small manifest.json plus one .npy file per
+array, so warm loads only hash the inputs and memory-map the arrays instead
+of touching the PNG pixels.
+
+The signed distance field (World/distance_field.py, about a second for a
+1920x1080 map without SciPy) and the obstacle contours of the vector
+collision backend (World/map_vector.py) are derived from the occupancy on
+first use instead, and added to the same entry: a map that never uses them
+does not pay for them, and the next load memory-maps them.
+
+Entries are keyed by a hash of the obstacle PNG, the EventMap PNG, the
+EventMap JSON and the dialog palette; any change to them rebuilds the entry.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import pygame
+
+from World.map_raster import (
+    DIALOG_COLOR_TOLERANCE, LABEL_BLUE, LABEL_GREEN, LABEL_YELLOW, analyze_map, np,
+)
+from World.distance_field import SDF_SCALE, DistanceField, build_sdf
+from World.map_vector import MapContours, build_contours
+from World.occupancy import OccupancyBitmap
+
+
+# Bump when the layout or the meaning of the cached artifacts changes
+CACHE_VERSION = 4
+
+WORLD_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_EVENT_MAP_DIR = os.path.join(WORLD_DIR, 'EventMap')
+CACHE_DIR_NAME = 'CompiledMaps'
+MANIFEST_NAME = 'manifest.json'
+
+# In-process cache: map name -> CompiledMap (latest key only)
+_memory_cache = {}
+
+# Serializes manifest updates (the game derives the SDF on a worker thread)
+_append_lock = threading.Lock()
+
+
+class CompiledMap:
+    """
+    Compiled artifacts of one map. Arrays are read-only memory maps when the
+    entry was loaded from disk.
+    """
+
+    def __init__(self, map_name, key, width, height, arrays, info, entry_dir=None):
+        self.map_name = map_name
+        self.key = key
+        self.width = width
+        self.height = height
+        self.arrays = arrays
+        self.info = info
+        self.entry_dir = entry_dir
+        self._occupancy = None
+        self._distance_field = None
+        self._contours = None
+
+    @property
+    def occupancy(self):
+        """OccupancyBitmap of the obstacles (collision_grid), or None."""
+        if self._occupancy is None and 'occupancy_bits' in self.arrays:
+            self._occupancy = OccupancyBitmap(self.arrays['occupancy_bits'], self.width)
+        return self._occupancy
+
+    @property
+    def distance_field(self):
+        """
+        DistanceField (clearance queries) of the obstacles, or None. Built
+        from the occupancy on first use (and saved to the cache entry) when
+        the entry does not have it yet.
+        """
+        if self._distance_field is None:
+            sdf = self.arrays.get('sdf')
+            if sdf is None and self.occupancy is not None:
+                sdf = self._add_array('sdf', build_sdf(self.occupancy))
+            if sdf is not None:
+                self._distance_field = DistanceField(sdf, self.info.get('sdf_scale', SDF_SCALE))
+        return self._distance_field
+
+    @property
+    def has_distance_field(self):
+        """True when the field is already built (no cost to get it)."""
+        return self._distance_field is not None or 'sdf' in self.arrays
+
+    @property
+    def contours(self):
+        """
+        MapContours (simplified obstacle outlines and their BVH), or None.
+        Built from the occupancy on first use (and saved to the cache entry)
+        when the entry does not have them yet.
+        """
+        if self._contours is None and 'contour_points' not in self.arrays and self.occupancy is not None:
+            points, starts = build_contours(self.occupancy)
+            self._add_arrays({'contour_points': points, 'contour_starts': starts})
+        if self._contours is None and 'contour_points' in self.arrays:
+            self._contours = MapContours(self.arrays['contour_points'], self.arrays['contour_starts'])
+        return self._contours
+
+    def _add_array(self, name, array):
+        """Keep an array derived after loading and append it to the cache entry."""
+        self._add_arrays({name: array})
+        return array
+
+    def _add_arrays(self, arrays):
+        self.arrays.update(arrays)
+        if self.entry_dir is not None:
+            try:
+                _append_entry_arrays(self.entry_dir, self.key, arrays)
+            except Exception as e:
+                print(f"[MapCache] Erro ao salvar {sorted(arrays)} de '{self.map_name}': {e}")
+
+    @property
+    def occupied_pixels(self):
+        return int(self.info.get('occupied_pixels', 0))
+
+    @property
+    def has_event_map(self):
+        return bool(self.info.get('has_event_map', False))
+
+    @property
+    def player_spawn(self):
+        spawn = self.info.get('player_spawn')
+        return tuple(spawn) if spawn else None
+
+    @property
+    def trafo_spawn(self):
+        spawn = self.info.get('trafo_spawn')
+        return tuple(spawn) if spawn else None
+
+    @property
+    def completion_zone(self):
+        return self.info.get('completion_zone')
+
+    @property
+    def dialog_ids(self):
+        """(height, width) uint8 dialog id raster, or None without a palette."""
+        return self.arrays.get('dialog_ids')
+
+    def __repr__(self):
+        return (f"<CompiledMap map='{self.map_name}' size={self.width}x{self.height} "
+                f"key={self.key[:12]}>")
+
+
+def default_cache_dir(event_map_dir):
+    """Cache directory that sits next to the EventMap directory."""
+    return os.path.join(os.path.dirname(os.path.abspath(event_map_dir)), CACHE_DIR_NAME)
+
+
+def default_dialog_colors(map_name):
+    """Dialog palette DialogueManager uses for a map (phase = map name)."""
+    from World.Dialogue import DialogueManager
+    return DialogueManager.DIALOG_COLORS_BY_PHASE.get(map_name)
+
+
+def _hash_file(digest, path):
+    """Feed a file's bytes (or a 'missing' marker) into `digest`."""
+    if path and os.path.isfile(path):
+        digest.update(b'file:')
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    else:
+        digest.update(b'missing')
+    digest.update(b'\0')
+
+
+def compiled_map_key(obstacle_path, event_image_path, json_path,
+                     dialog_colors=None, dialog_tolerance=DIALOG_COLOR_TOLERANCE):
+    """Hash of every input that affects the compiled artifacts of a map."""
+    digest = hashlib.sha256()
+    digest.update(f'v{CACHE_VERSION}\0'.encode())
+    for path in (obstacle_path, event_image_path, json_path):
+        _hash_file(digest, path)
+    palette = sorted((int(k), tuple(int(c) for c in v)) for k, v in (dialog_colors or {}).items())
+    digest.update(repr((palette, int(dialog_tolerance))).encode())
+    return digest.hexdigest()
+
+
+def _event_map_paths(obstacle_path, event_map_dir):
+    map_name = os.path.splitext(os.path.basename(obstacle_path))[0]
+    return (
+        map_name,
+        os.path.join(event_map_dir, f'{map_name}.png'),
+        os.path.join(event_map_dir, f'{map_name}.json'),
+    )
+
+
+def compile_map(obstacle_path, event_image_path, dialog_colors=None,
+                dialog_tolerance=DIALOG_COLOR_TOLERANCE):
+    """
+    Analyze the obstacle and EventMap images of a map.
+    Returns (width, height, arrays, info) ready to be cached.
+    """
+    obstacle = pygame.image.load(obstacle_path)
+    occupancy = OccupancyBitmap.from_surface(obstacle)
+    width, height = obstacle.get_size()
+
+    arrays = {'occupancy_bits': occupancy.bits}
+    info = {
+        'occupied_pixels': occupancy.count_occupied(),
+        'sdf_scale': SDF_SCALE,
+        'has_event_map': False,
+        'player_spawn': None,
+        'trafo_spawn': None,
+        'completion_zone': None,
+    }
+
+    if event_image_path and os.path.isfile(event_image_path):
+        event_img = pygame.image.load(event_image_path)
+        same_size = event_img.get_size() == (width, height)
+        # Spawns and completion zone use the EventMap as drawn; dialog colors
+        # use it stretched to the obstacle map like DialogueManager does.
+        analysis = analyze_map(
+            event_img,
+            labels=LABEL_GREEN | LABEL_BLUE | LABEL_YELLOW,
+            dialog_colors=dialog_colors if same_size else None,
+            dialog_tolerance=dialog_tolerance,
+        )
+        dialog_ids = analysis.dialog_ids
+        if dialog_colors and not same_size:
+            scaled = pygame.transform.scale(event_img, (width, height))
+            dialog_ids = analyze_map(
+                scaled, labels=0, dialog_colors=dialog_colors,
+                dialog_tolerance=dialog_tolerance,
+            ).dialog_ids
+
+        info['has_event_map'] = True
+        info['player_spawn'] = list(analysis.green_center) if analysis.green_center else None
+        info['trafo_spawn'] = list(analysis.blue_center) if analysis.blue_center else None
+        info['completion_zone'] = analysis.yellow_zone
+        if dialog_ids is not None:
+            arrays['dialog_ids'] = dialog_ids
+
+    return width, height, arrays, info
+
+
+def _read_entry(entry_dir, key):
+    """Load a cache entry if its manifest matches `key`, else return None."""
+    manifest_path = os.path.join(entry_dir, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != CACHE_VERSION or manifest.get('key') != key:
+        return None
+    arrays = {}
+    for name, filename in manifest.get('arrays', {}).items():
+        arrays[name] = np.load(os.path.join(entry_dir, filename), mmap_mode='r')
+    return manifest, arrays
+
+
+def _write_entry(entry_dir, map_name, key, width, height, arrays, info):
+    """Write arrays and manifest; the manifest is replaced last (atomically)."""
+    os.makedirs(entry_dir, exist_ok=True)
+    prefix = key[:16]
+    files = {}
+    for name, array in arrays.items():
+        filename = f'{prefix}_{name}.npy'
+        np.save(os.path.join(entry_dir, filename), np.ascontiguousarray(array))
+        files[name] = filename
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'key': key,
+        'map_name': map_name,
+        'width': width,
+        'height': height,
+        'arrays': files,
+        'info': info,
+    }
+    tmp_path = os.path.join(entry_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(entry_dir, MANIFEST_NAME))
+
+    # Drop arrays of stale entries (may fail while still memory-mapped on Windows)
+    for filename in os.listdir(entry_dir):
+        if filename.endswith('.npy') and not filename.startswith(prefix):
+            try:
+                os.remove(os.path.join(entry_dir, filename))
+            except OSError:
+                pass
+
+
+def _append_entry_arrays(entry_dir, key, arrays):
+    """
+    Add arrays to the entry written for `key` (no-op if the entry changed
+    meanwhile); the manifest is replaced last (atomically).
+    """
+    manifest_path = os.path.join(entry_dir, MANIFEST_NAME)
+    with _append_lock:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != CACHE_VERSION or manifest.get('key') != key:
+            return
+        prefix = key[:16]
+        for name, array in arrays.items():
+            filename = f'{prefix}_{name}.npy'
+            np.save(os.path.join(entry_dir, filename), np.ascontiguousarray(array))
+            manifest['arrays'][name] = filename
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+
+
+def load_compiled_map(obstacle_path, event_map_dir=None, dialog_colors=None,
+                      dialog_tolerance=DIALOG_COLOR_TOLERANCE, cache_dir=None):
+    """
+    Return the CompiledMap of `obstacle_path`, loading a valid cache entry
+    when one exists and (re)building it when any input changed.
+    `dialog_colors` defaults to the DialogueManager palette of the map.
+    """
+    if event_map_dir is None:
+        event_map_dir = DEFAULT_EVENT_MAP_DIR
+    if cache_dir is None:
+        cache_dir = default_cache_dir(event_map_dir)
+
+    map_name, event_image_path, json_path = _event_map_paths(obstacle_path, event_map_dir)
+    if dialog_colors is None:
+        dialog_colors = default_dialog_colors(map_name)
+
+    key = compiled_map_key(obstacle_path, event_image_path, json_path,
+                           dialog_colors, dialog_tolerance)
+
+    cached = _memory_cache.get(map_name)
+    if cached is not None and cached.key == key:
+        return cached
+
+    entry_dir = os.path.join(cache_dir, map_name)
+    entry = None
+    try:
+        entry = _read_entry(entry_dir, key)
+    except Exception as e:
+        print(f"[MapCache] Entrada inválida para '{map_name}', recompilando: {e}")
+
+    if entry is not None:
+        manifest, arrays = entry
+        compiled = CompiledMap(map_name, key, manifest['width'], manifest['height'],
+                               arrays, manifest.get('info', {}), entry_dir)
+    else:
+        width, height, arrays, info = compile_map(
+            obstacle_path, event_image_path, dialog_colors, dialog_tolerance)
+        compiled = CompiledMap(map_name, key, width, height, arrays, info)
+        try:
+            _write_entry(entry_dir, map_name, key, width, height, arrays, info)
+            compiled.entry_dir = entry_dir
+            print(f"[MapCache] Mapa compilado e salvo: '{map_name}'")
+        except Exception as e:
+            print(f"[MapCache] Erro ao salvar cache de '{map_name}': {e}")
+
+    _memory_cache[map_name] = compiled
+    return compiled
+
+
+def clear_memory_cache():
+    """Forget in-process entries (the on-disk cache is kept)."""
+    _memory_cache.clear()
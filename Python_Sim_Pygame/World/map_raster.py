@@ -0,0 +1,255 @@
+"""
+Map raster module - Vectorized access to map images.
+Reads map surfaces through pygame.surfarray in a single NumPy pass instead of
+calling Surface.get_at() once per pixel inside Python loops.
+
+analyze_map() classifies every pixel of a map into a label raster once; the
+spawn centroids, the completion zone, the obstacle occupancy and the dialog
+color regions are all derived from that raster.
+"""
+
+import pygame
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+
+# Only pixels darker than this on every channel are obstacles (see build_collision_grid)
+BLACK_THRESHOLD = 50
+# Player spawn marker: g >= GREEN_THRESHOLD, r < 100, b < 100
+GREEN_THRESHOLD = 200
+# Dialog colors match when every channel is within this distance
+DIALOG_COLOR_TOLERANCE = 24
+
+# Bit flags of the label raster (a pixel may carry more than one label)
+LABEL_BLACK = 1    # obstacle
+LABEL_GREEN = 2    # player spawn
+LABEL_BLUE = 4     # trafo spawn
+LABEL_YELLOW = 8   # completion zone
+LABEL_ALL = LABEL_BLACK | LABEL_GREEN | LABEL_BLUE | LABEL_YELLOW
+
+
+def numpy_available():
+    """Return True when NumPy (required by pygame.surfarray) can be used."""
+    return np is not None
+
+
+def surface_rgb(img):
+    """
+    Return the RGB pixels of `img` as a (height, width, 3) uint8 array.
+    Uses a zero-copy pixels3d view when the surface format allows it and falls
+    back to an array3d copy otherwise. The view keeps the surface locked, so
+    callers should drop it (del) as soon as they are done.
+    """
+    try:
+        arr = pygame.surfarray.pixels3d(img)
+    except Exception:
+        arr = pygame.surfarray.array3d(img)
+    # surfarray is indexed [x][y]; swap to row-major [y][x] like the grid
+    return arr.swapaxes(0, 1)
+
+
+def build_occupancy_array(img):
+    """
+    Threshold the black pixels of `img` in one vectorized pass.
+    Returns (grid, occupied) where grid is a C-contiguous (height, width)
+    uint8 array with 1 for occupied pixels. grid[y][x] indexing matches the
+    legacy list-of-bytearray grid, so existing collision checks keep working.
+    """
+    analysis = analyze_map(img, labels=LABEL_BLACK)
+    return analysis.occupancy, analysis.occupied_pixels
+
+
+def classify_pixels(rgb, labels=LABEL_ALL, dialog_colors=None,
+                    dialog_tolerance=DIALOG_COLOR_TOLERANCE, green_thresh=GREEN_THRESHOLD):
+    """
+    Classify a (height, width, 3) RGB array in one vectorized pass.
+    Returns (label_raster, dialog_ids):
+    - label_raster: uint8 raster of LABEL_* flags (only the requested `labels`)
+    - dialog_ids: uint8 raster with the dialog id of each pixel (0 = none), or
+      None when no `dialog_colors` ({dialog_id: (r, g, b)}) were given.
+      Colors are tested in dict order and the first match wins.
+    """
+    r = rgb[..., 0].astype(np.int16)
+    g = rgb[..., 1].astype(np.int16)
+    b = rgb[..., 2].astype(np.int16)
+
+    raster = np.zeros(r.shape, dtype=np.uint8)
+    if labels & LABEL_BLACK:
+        black = (r < BLACK_THRESHOLD) & (g < BLACK_THRESHOLD) & (b < BLACK_THRESHOLD)
+        raster[black] |= LABEL_BLACK
+    if labels & LABEL_GREEN:
+        raster[(g >= green_thresh) & (r < 100) & (b < 100)] |= LABEL_GREEN
+    if labels & LABEL_BLUE:
+        # blue if b is notably higher than r and g and has decent intensity
+        raster[(b > np.maximum(r, g) + 30) & (b > 80)] |= LABEL_BLUE
+    if labels & LABEL_YELLOW:
+        yellow = (r >= 220) & (g >= 200) & (b <= 120) & (np.abs(r - g) <= 80)
+        raster[yellow] |= LABEL_YELLOW
+
+    dialog_ids = None
+    if dialog_colors:
+        dialog_ids = np.zeros(r.shape, dtype=np.uint8)
+        for dialog_id, (target_r, target_g, target_b) in dialog_colors.items():
+            match = (
+                (np.abs(r - target_r) <= dialog_tolerance)
+                & (np.abs(g - target_g) <= dialog_tolerance)
+                & (np.abs(b - target_b) <= dialog_tolerance)
+                & (dialog_ids == 0)
+            )
+            dialog_ids[match] = dialog_id
+
+    return raster, dialog_ids
+
+
+def _centroid(mask):
+    """Centroid (x, y) of a boolean mask, or None if it is empty."""
+    cols = np.count_nonzero(mask, axis=0).astype(np.int64)
+    count = int(cols.sum())
+    if count == 0:
+        return None
+    rows = np.count_nonzero(mask, axis=1).astype(np.int64)
+    totx = int(np.dot(cols, np.arange(cols.size, dtype=np.int64)))
+    toty = int(np.dot(rows, np.arange(rows.size, dtype=np.int64)))
+    return (totx / count, toty / count)
+
+
+def _bounding_box(mask):
+    """Bounding box {'x', 'y', 'width', 'height'} of a boolean mask, or None."""
+    cols = np.flatnonzero(mask.any(axis=0))
+    if cols.size == 0:
+        return None
+    rows = np.flatnonzero(mask.any(axis=1))
+    min_x, max_x = int(cols[0]), int(cols[-1])
+    min_y, max_y = int(rows[0]), int(rows[-1])
+    return {
+        'x': min_x,
+        'y': min_y,
+        'width': max_x - min_x + 1,
+        'height': max_y - min_y + 1,
+    }
+
+
+class MapAnalysis:
+    """
+    Result of analyze_map(): the label raster of one map image plus the
+    features every caller used to compute with its own get_at() loop.
+    """
+
+    def __init__(self, labels, dialog_ids=None):
+        self.labels = labels
+        self.dialog_ids = dialog_ids
+        self.height, self.width = labels.shape
+
+        self.occupancy = np.ascontiguousarray(labels & LABEL_BLACK, dtype=np.uint8)
+        self.occupied_pixels = int(np.count_nonzero(self.occupancy))
+        self.green_center = _centroid(labels & LABEL_GREEN)
+        self.blue_center = _centroid(labels & LABEL_BLUE)
+        self.yellow_zone = _bounding_box(labels & LABEL_YELLOW)
+
+    def dialog_regions(self):
+        """Return {dialog_id: bounding box} for every dialog color present."""
+        if self.dialog_ids is None:
+            return {}
+        regions = {}
+        for dialog_id in np.unique(self.dialog_ids):
+            if dialog_id == 0:
+                continue
+            regions[int(dialog_id)] = _bounding_box(self.dialog_ids == dialog_id)
+        return regions
+
+    def sample_dialog_grid(self, cell_size):
+        """Build the DialogueManager spatial grid (see sample_dialog_grid)."""
+        return sample_dialog_grid(self.dialog_ids, cell_size)
+
+
+class MarkerAnalysis:
+    """
+    The spawn markers and completion zone of a map found with get_at(), for
+    analyze_map() without NumPy (no label raster, occupancy or dialog ids:
+    those have their own per-pixel paths, build_collision_grid_per_pixel and
+    DialogueManager._classify_dialog_color).
+    """
+
+    dialog_ids = None
+
+    def __init__(self, img, labels=LABEL_ALL, green_thresh=GREEN_THRESHOLD):
+        self.width, self.height = img.get_width(), img.get_height()
+        green = [0, 0, 0]
+        blue = [0, 0, 0]
+        min_x, min_y, max_x, max_y = self.width, self.height, -1, -1
+        for y in range(self.height):
+            for x in range(self.width):
+                r, g, b, *rest = img.get_at((x, y))
+                if labels & LABEL_GREEN and g >= green_thresh and r < 100 and b < 100:
+                    green[0] += x; green[1] += y; green[2] += 1
+                if labels & LABEL_BLUE and b > max(r, g) + 30 and b > 80:
+                    blue[0] += x; blue[1] += y; blue[2] += 1
+                if labels & LABEL_YELLOW and r >= 220 and g >= 200 and b <= 120 and abs(r - g) <= 80:
+                    min_x, min_y = min(min_x, x), min(min_y, y)
+                    max_x, max_y = max(max_x, x), max(max_y, y)
+        self.green_center = (green[0] / green[2], green[1] / green[2]) if green[2] else None
+        self.blue_center = (blue[0] / blue[2], blue[1] / blue[2]) if blue[2] else None
+        self.yellow_zone = None
+        if max_x >= min_x:
+            self.yellow_zone = {'x': min_x, 'y': min_y, 'width': max_x - min_x + 1, 'height': max_y - min_y + 1}
+
+
+def sample_dialog_grid(dialog_ids, cell_size):
+    """
+    Build the DialogueManager spatial grid from a dialog id raster.
+    Each cell samples 4 points (at 1/4 and 3/4 of the cell) and keeps the
+    first non-zero dialog id. Returns {(grid_x, grid_y): dialog_id}.
+    """
+    if dialog_ids is None:
+        return {}
+
+    height, width = dialog_ids.shape
+    quarter = cell_size // 4
+    three_quarters = 3 * cell_size // 4
+    cells_x = np.arange(0, width, cell_size)
+    cells_y = np.arange(0, height, cell_size)
+
+    grid = np.zeros((cells_y.size, cells_x.size), dtype=np.uint8)
+    for off_x, off_y in ((quarter, quarter), (three_quarters, quarter),
+                         (quarter, three_quarters), (three_quarters, three_quarters)):
+        xs = cells_x + off_x
+        ys = cells_y + off_y
+        valid_x = xs < width
+        valid_y = ys < height
+        sample = np.zeros_like(grid)
+        sample[np.ix_(valid_y, valid_x)] = dialog_ids[np.ix_(ys[valid_y], xs[valid_x])]
+        empty = grid == 0
+        grid[empty] = sample[empty]
+
+    grid_ys, grid_xs = np.nonzero(grid)
+    return {
+        (int(gx), int(gy)): int(grid[gy, gx])
+        for gy, gx in zip(grid_ys, grid_xs)
+    }
+
+
+def analyze_map(img, labels=LABEL_ALL, dialog_colors=None,
+                dialog_tolerance=DIALOG_COLOR_TOLERANCE, green_thresh=GREEN_THRESHOLD):
+    """
+    Read `img` once through surfarray and classify every pixel.
+    Pass `labels` to restrict the classes computed (e.g. LABEL_BLACK for an
+    obstacle map) and `dialog_colors` to also build the dialog id raster.
+    Without NumPy only the markers (green/blue/yellow) are found, per pixel
+    (MarkerAnalysis); the occupancy and dialog rasters require NumPy.
+    """
+    if np is None:
+        if labels & LABEL_BLACK or dialog_colors:
+            raise RuntimeError("NumPy is required for the occupancy and dialog rasters")
+        return MarkerAnalysis(img, labels=labels, green_thresh=green_thresh)
+    rgb = surface_rgb(img)
+    try:
+        raster, dialog_ids = classify_pixels(
+            rgb, labels=labels, dialog_colors=dialog_colors,
+            dialog_tolerance=dialog_tolerance, green_thresh=green_thresh,
+        )
+    finally:
+        del rgb
+    return MapAnalysis(raster, dialog_ids)
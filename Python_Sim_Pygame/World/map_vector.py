@@ -0,0 +1,291 @@
+"""
+Map vector module - Obstacle outlines as simplified polygons plus a BVH.
+
+The occupied pixels of the obstacle map are traced into closed outlines that
+run along pixel borders (every border between an obstacle pixel and a free
+pixel or the outside of the map belongs to exactly one outline). Straight
+runs are merged, then each outline is simplified with Douglas-Peucker to
+CONTOUR_TOLERANCE_PX, which turns pixel staircases into single diagonal
+edges. The outlines are compiled once per map (World/map_cache.py) and stored
+as two small arrays.
+
+EdgeBVH is a bounding volume hierarchy over the outline edges, so a
+collision test only looks at the handful of edges near the robot; its cost
+depends on the local outline complexity, not on the map resolution.
+"""
+
+from World.map_raster import np
+from World.occupancy import OccupancyBitmap
+
+
+# Largest distance between a simplified outline and the pixel borders
+CONTOUR_TOLERANCE_PX = 1.0
+
+# Edges per BVH leaf
+BVH_LEAF_SIZE = 6
+
+
+def _border_runs(occupied):
+    """
+    Straight runs of pixel borders between occupied and free pixels, as
+    (x1, y1, x2, y2) int arrays, directed so the obstacle is on the right
+    (image coordinates, y down). Outside the map counts as free.
+    """
+    h, w = occupied.shape
+    padded = np.zeros((h + 2, w + 2), dtype=np.int8)
+    padded[1:-1, 1:-1] = occupied
+
+    runs = []
+    # horizontal borders: line y between rows y - 1 and y; +1 = obstacle below
+    horiz = padded[1:, 1:-1] - padded[:-1, 1:-1]          # (h + 1, w)
+    # vertical borders: line x between columns x - 1 and x; +1 = obstacle on the left
+    vert = (padded[1:-1, :-1] - padded[1:-1, 1:]).T        # (w + 1, h)
+    for lines, horizontal in ((horiz, True), (vert, False)):
+        for sign in (1, -1):
+            on = np.zeros((lines.shape[0], lines.shape[1] + 2), dtype=np.int8)
+            on[:, 1:-1] = lines == sign
+            change = np.diff(on, axis=1)
+            line, start = np.nonzero(change == 1)
+            _line, end = np.nonzero(change == -1)
+            if sign < 0:
+                start, end = end, start
+            if horizontal:
+                runs.append(np.stack([start, line, end, line], axis=1))
+            else:
+                runs.append(np.stack([line, start, line, end], axis=1))
+    return np.concatenate(runs) if runs else np.zeros((0, 4), dtype=np.intp)
+
+
+def trace_outlines(occupancy):
+    """
+    Closed outlines (lists of (x, y) corner vertices) of the occupied pixels
+    of an occupancy grid (OccupancyBitmap or array, non-zero = obstacle).
+    Where two obstacle pixels touch only at a corner the outlines keep them
+    apart (turning right at that vertex).
+    """
+    if isinstance(occupancy, OccupancyBitmap):
+        occupied = occupancy.to_array().astype(bool)
+    else:
+        occupied = np.asarray(occupancy) != 0
+    runs = _border_runs(occupied).tolist()
+
+    outgoing = {}
+    for index, (x1, y1, x2, y2) in enumerate(runs):
+        outgoing.setdefault((x1, y1), []).append(index)
+
+    used = bytearray(len(runs))
+    outlines = []
+    for first in range(len(runs)):
+        if used[first]:
+            continue
+        outline = []
+        index = first
+        while not used[index]:
+            used[index] = 1
+            x1, y1, x2, y2 = runs[index]
+            outline.append((x1, y1))
+            choices = [i for i in outgoing[(x2, y2)] if not used[i]]
+            if not choices:
+                break
+            if len(choices) > 1:
+                # saddle vertex: take the right turn (cross product of the
+                # directions is positive for a right turn with y down)
+                dx, dy = x2 - x1, y2 - y1
+                choices.sort(key=lambda i: -(dx * (runs[i][3] - runs[i][1]) - dy * (runs[i][2] - runs[i][0])))
+            index = choices[0]
+        if len(outline) >= 2:
+            outlines.append(outline)
+    return outlines
+
+
+def _simplify_open(points, first, last, tolerance, keep):
+    """Douglas-Peucker between points[first] and points[last] (both kept)."""
+    stack = [(first, last)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        ax, ay = points[i]
+        bx, by = points[j]
+        inner = points[i + 1:j]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        px = inner[:, 0] - ax
+        py = inner[:, 1] - ay
+        if length_sq > 0.0:
+            t = np.clip((px * dx + py * dy) / length_sq, 0.0, 1.0)
+            dist = np.hypot(px - t * dx, py - t * dy)
+        else:
+            dist = np.hypot(px, py)
+        k = int(dist.argmax())
+        if dist[k] > tolerance:
+            keep[i + 1 + k] = True
+            stack.append((i, i + 1 + k))
+            stack.append((i + 1 + k, j))
+
+
+def simplify_outline(outline, tolerance=CONTOUR_TOLERANCE_PX):
+    """
+    Douglas-Peucker simplification of a closed outline: split at its first
+    vertex and the vertex farthest from it, and simplify both halves.
+    """
+    n = len(outline)
+    if n <= 4:
+        return list(outline)
+    points = np.array(outline + [outline[0]], dtype=np.float64)
+    far = int(np.hypot(points[:n, 0] - points[0, 0], points[:n, 1] - points[0, 1]).argmax())
+    keep = np.zeros(n + 1, dtype=bool)
+    keep[[0, far, n]] = True
+    _simplify_open(points, 0, far, tolerance, keep)
+    _simplify_open(points, far, n, tolerance, keep)
+    keep[n] = False
+    return [tuple(p) for p in points[keep].tolist()]
+
+
+def build_contours(occupancy, tolerance=CONTOUR_TOLERANCE_PX):
+    """
+    Simplified obstacle outlines packed for the compiled-map cache:
+    (points, starts) with points a (N, 2) float32 array of vertices and
+    outline i made of points[starts[i]:starts[i + 1]].
+    """
+    outlines = [simplify_outline(o, tolerance) for o in trace_outlines(occupancy)]
+    starts = np.zeros(len(outlines) + 1, dtype=np.int32)
+    starts[1:] = np.cumsum([len(o) for o in outlines])
+    points = np.array([p for o in outlines for p in o], dtype=np.float32).reshape(-1, 2)
+    return points, starts
+
+
+class EdgeBVH:
+    """
+    Bounding volume hierarchy (axis-aligned boxes, median splits) over line
+    segments. query() returns the segments whose boxes overlap a box.
+    """
+
+    def __init__(self, segments, leaf_size=BVH_LEAF_SIZE):
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        self.leaf_size = max(1, int(leaf_size))
+        lo = np.minimum(segments[:, :2], segments[:, 2:])
+        hi = np.maximum(segments[:, :2], segments[:, 2:])
+        center = (lo + hi) * 0.5
+
+        # flat nodes: box, then (first, count, True) for leaves or
+        # (left, right, False) for inner nodes
+        self._boxes = []
+        self._nodes = []
+        order = []
+
+        def build(items):
+            node = len(self._nodes)
+            box_lo = lo[items].min(axis=0)
+            box_hi = hi[items].max(axis=0)
+            self._boxes.append((float(box_lo[0]), float(box_lo[1]), float(box_hi[0]), float(box_hi[1])))
+            self._nodes.append(None)
+            if len(items) <= self.leaf_size:
+                self._nodes[node] = (len(order), len(items), True)
+                order.extend(items.tolist())
+                return node
+            axis = int((box_hi - box_lo).argmax())
+            items = items[np.argsort(center[items, axis], kind='stable')]
+            half = len(items) // 2
+            left = build(items[:half])
+            self._nodes[node] = (left, build(items[half:]), False)
+            return node
+
+        if len(segments):
+            build(np.arange(len(segments)))
+        self.segments = [tuple(s) for s in segments[order].tolist()]
+        self.boxes = [(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+                      for x1, y1, x2, y2 in self.segments]
+
+    def __len__(self):
+        return len(self.segments)
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def nbytes(self):
+        """Approximate memory of the hierarchy and its segments."""
+        return 8 * (4 * len(self._boxes) + 3 * len(self._nodes) + 8 * len(self.segments))
+
+    def query(self, x0, y0, x1, y1):
+        """Segments (x1, y1, x2, y2) whose bounding boxes overlap [x0, x1] x [y0, y1]."""
+        found = []
+        if not self._nodes:
+            return found
+        boxes, nodes, seg_boxes, segments = self._boxes, self._nodes, self.boxes, self.segments
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            bx0, by0, bx1, by1 = boxes[node]
+            if bx0 > x1 or bx1 < x0 or by0 > y1 or by1 < y0:
+                continue
+            a, b, leaf = nodes[node]
+            if not leaf:
+                stack.append(b)
+                stack.append(a)
+                continue
+            for i in range(a, a + b):
+                sx0, sy0, sx1, sy1 = seg_boxes[i]
+                if sx0 <= x1 and sx1 >= x0 and sy0 <= y1 and sy1 >= y0:
+                    found.append(segments[i])
+        return found
+
+
+class MapContours:
+    """
+    Simplified obstacle outlines from build_contours() (arrays may be
+    read-only memory maps from the compiled-map cache) and their EdgeBVH.
+    """
+
+    def __init__(self, points, starts):
+        self.points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self._bvh = None
+
+    @classmethod
+    def from_occupancy(cls, occupancy, tolerance=CONTOUR_TOLERANCE_PX):
+        return cls(*build_contours(occupancy, tolerance))
+
+    def __len__(self):
+        return max(0, len(self.starts) - 1)
+
+    def outlines(self):
+        """Iterate the outlines as lists of (x, y) vertices."""
+        points = self.points.tolist()
+        starts = self.starts.tolist()
+        for i in range(len(starts) - 1):
+            yield points[starts[i]:starts[i + 1]]
+
+    def segments(self):
+        """(E, 4) float array with every outline edge, closing edges included."""
+        if not len(self.points):
+            return np.zeros((0, 4))
+        points = self.points.astype(np.float64)
+        starts = self.starts.astype(np.intp)
+        index = np.arange(len(points))
+        owner = np.searchsorted(starts, index, side='right') - 1
+        following = index + 1
+        closing = following == starts[owner + 1]
+        following[closing] = starts[owner[closing]]
+        return np.concatenate([points, points[following]], axis=1)
+
+    @property
+    def edge_count(self):
+        return len(self.points)
+
+    @property
+    def bvh(self):
+        """EdgeBVH of the outline edges (built on first use)."""
+        if self._bvh is None:
+            self._bvh = EdgeBVH(self.segments())
+        return self._bvh
+
+    @property
+    def nbytes(self):
+        return int(self.points.nbytes + self.starts.nbytes)
+
+    def __repr__(self):
+        return f"<MapContours {len(self)} outlines {self.edge_count} edges>"
+
@@ -0,0 +1,356 @@
+"""
+Occupancy module - Bit-packed obstacle bitmap.
+
+OccupancyBitmap stores one bit per map pixel (8x smaller than the uint8 grid
+and 8x smaller than the legacy list of bytearray rows). Rows are packed with
+np.packbits (bit 7 of byte 0 is x = 0), so a bitmap can be saved as a plain
+.npy file and memory-mapped back from the compiled-map cache: only the pages
+the collision queries touch are ever read from disk.
+
+Queries are point (is_occupied), horizontal span (span_occupied) and
+rectangle (rect_occupied). Everything outside the map is free, matching the
+bounds checks of the collision functions.
+
+OccupancyPyramid summarizes the bitmap in 8, 32 and 128 px blocks (empty,
+mixed or full), so collision queries over free space are answered at a
+coarse level and only occupied blocks are descended into.
+"""
+
+from World.map_raster import BLACK_THRESHOLD, np, surface_rgb
+
+
+# Rows thresholded per band when packing a surface (bounds temporary memory)
+PACK_BAND_ROWS = 256
+
+# Block sizes of the pyramid levels, finest first (each a multiple of the previous)
+PYRAMID_BLOCK_SIZES = (8, 32, 128)
+
+# Block states of a pyramid level
+BLOCK_EMPTY = 0
+BLOCK_MIXED = 1
+BLOCK_FULL = 2
+
+# Inner bytes of a span scanned with any() (longer ones via bytes.strip)
+_SHORT_SPAN_BYTES = 16
+
+# Masks of the bits at/after (LEAD) and at/before (TRAIL) a bit position
+_LEAD_MASKS = tuple((0xFF >> bit) for bit in range(8))
+_TRAIL_MASKS = tuple((0xFF << (7 - bit)) & 0xFF for bit in range(8))
+
+
+class OccupancyBitmap:
+    """
+    1 bit per pixel obstacle map. `bits` is a (height, ceil(width / 8))
+    uint8 array (may be a read-only np.memmap); `width` is the map width in
+    pixels (the last byte of each row may carry padding bits).
+    """
+
+    def __init__(self, bits, width):
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.ndim != 2 or bits.shape[1] != (width + 7) // 8:
+            raise ValueError(f"bit rows of shape {bits.shape} do not match width {width}")
+        self.bits = np.ascontiguousarray(bits)
+        self.width = int(width)
+        self.height = int(bits.shape[0])
+        self.row_bytes = int(bits.shape[1])
+        # Flat byte view: point queries index it without NumPy scalar overhead
+        self._flat = memoryview(self.bits).cast('B') if self.bits.size else b''
+        self.pyramid = None
+
+    # ------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_array(cls, occupancy):
+        """Pack a (height, width) array where non-zero means occupied."""
+        occupancy = np.asarray(occupancy)
+        return cls(np.packbits(occupancy != 0, axis=1), occupancy.shape[1])
+
+    @classmethod
+    def from_surface(cls, img, band_rows=PACK_BAND_ROWS):
+        """
+        Threshold the black pixels of `img` (same rule as build_collision_grid)
+        band by band, so only `band_rows` rows are ever unpacked at once.
+        """
+        width, height = img.get_size()
+        bits = np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+        rgb = surface_rgb(img)
+        try:
+            for y0 in range(0, height, band_rows):
+                band = rgb[y0:y0 + band_rows]
+                black = ((band[..., 0] < BLACK_THRESHOLD)
+                         & (band[..., 1] < BLACK_THRESHOLD)
+                         & (band[..., 2] < BLACK_THRESHOLD))
+                bits[y0:y0 + band_rows] = np.packbits(black, axis=1)
+        finally:
+            del rgb
+        return cls(bits, width)
+
+    @classmethod
+    def load(cls, path, width, mmap=True):
+        """Load bits saved with save(); memory-mapped read-only by default."""
+        return cls(np.load(path, mmap_mode='r' if mmap else None), width)
+
+    def save(self, path):
+        np.save(path, self.bits)
+
+    def build_pyramid(self, block_sizes=PYRAMID_BLOCK_SIZES):
+        """Build (once) the coarse summary levels used by rect queries and raycasts."""
+        if self.pyramid is None:
+            self.pyramid = OccupancyPyramid(self, block_sizes)
+        return self.pyramid
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @property
+    def shape(self):
+        return (self.height, self.width)
+
+    @property
+    def nbytes(self):
+        return int(self.bits.nbytes)
+
+    def is_occupied(self, x, y):
+        """True if pixel (x, y) is an obstacle (outside the map is free)."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (self._flat[y * self.row_bytes + (x >> 3)] >> (7 - (x & 7))) & 1 == 1
+        return False
+
+    def span_occupied(self, y, x0, x1):
+        """True if any pixel of row `y` with x0 <= x <= x1 is an obstacle."""
+        if not 0 <= y < self.height:
+            return False
+        if x0 < 0:
+            x0 = 0
+        if x1 >= self.width:
+            x1 = self.width - 1
+        if x0 > x1:
+            return False
+
+        return self._span_in_map(y, x0, x1)
+
+    def _span_in_map(self, y, x0, x1):
+        """span_occupied() for 0 <= x0 <= x1 < width, 0 <= y < height (no clamping)."""
+        flat = self._flat
+        row = y * self.row_bytes
+        b0 = row + (x0 >> 3)
+        b1 = row + (x1 >> 3)
+        if b0 == b1:
+            return flat[b0] & _LEAD_MASKS[x0 & 7] & _TRAIL_MASKS[x1 & 7] != 0
+        if flat[b0] & _LEAD_MASKS[x0 & 7] or flat[b1] & _TRAIL_MASKS[x1 & 7]:
+            return True
+        # full bytes in between: any non-zero byte means an obstacle
+        if b1 - b0 <= _SHORT_SPAN_BYTES:
+            return any(flat[b0 + 1:b1])
+        return bytes(flat[b0 + 1:b1]).strip(b'\x00') != b''
+
+    def rect_occupied(self, x0, y0, x1, y1):
+        """True if any pixel of the inclusive rectangle [x0, x1] x [y0, y1] is an obstacle."""
+        x0 = max(int(x0), 0)
+        y0 = max(int(y0), 0)
+        x1 = min(int(x1), self.width - 1)
+        y1 = min(int(y1), self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return False
+        if self.pyramid is not None:
+            state = self.pyramid.rect_state(x0, y0, x1, y1)
+            if state is not None:
+                return state
+
+        b0 = x0 >> 3
+        b1 = x1 >> 3
+        block = self.bits[y0:y1 + 1, b0:b1 + 1]
+        if b0 == b1:
+            return bool(np.any(block[:, 0] & (_LEAD_MASKS[x0 & 7] & _TRAIL_MASKS[x1 & 7])))
+        if np.any(block[:, 0] & _LEAD_MASKS[x0 & 7]) or np.any(block[:, -1] & _TRAIL_MASKS[x1 & 7]):
+            return True
+        return bool(block[:, 1:-1].any())
+
+    def count_occupied(self, band_rows=4096):
+        """Number of occupied pixels (padding bits are always 0)."""
+        total = 0
+        for y0 in range(0, self.height, band_rows):
+            total += int(np.unpackbits(self.bits[y0:y0 + band_rows]).sum(dtype=np.int64))
+        return total
+
+    def to_array(self):
+        """Unpack into a (height, width) uint8 grid (debug / benchmarks only)."""
+        return np.unpackbits(self.bits, axis=1, count=self.width)
+
+    # ------------------------------------------------------------------
+    # Legacy grid[y][x] indexing
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.height:
+            raise IndexError(y)
+        return _BitmapRow(self, y)
+
+    def __repr__(self):
+        return f"<OccupancyBitmap {self.width}x{self.height} {self.nbytes} bytes>"
+
+
+class OccupancyPyramid:
+    """
+    Min/max summary of an OccupancyBitmap: for each level, a block is
+    BLOCK_EMPTY (no obstacle pixel), BLOCK_FULL (only obstacle pixels) or
+    BLOCK_MIXED. Levels are (rows, cols) uint8 arrays, indexed
+    [y // size, x // size]; blocks past the map border count as free.
+    """
+
+    def __init__(self, bitmap, block_sizes=PYRAMID_BLOCK_SIZES):
+        if block_sizes[0] % 8 or any(b % a for a, b in zip(block_sizes, block_sizes[1:])):
+            raise ValueError(f"block sizes {block_sizes} must be multiples of 8 and of each other")
+        self.width = bitmap.width
+        self.height = bitmap.height
+        self.block_sizes = tuple(block_sizes)
+        self.levels = []
+        self._flat = []
+        self._cols = []
+
+        # finest level straight from the packed bytes (8 px of a row = 1
+        # byte), band by band so the bitmap (maybe a memmap) is never
+        # compared as a whole
+        size0 = block_sizes[0]
+        band_rows = max(size0, PACK_BAND_ROWS // size0 * size0)
+        any_bands, all_bands = [], []
+        for y0 in range(0, max(bitmap.height, 1), band_rows):
+            band = bitmap.bits[y0:y0 + band_rows]
+            any_band, all_band = self._reduce(band != 0, band == 0xFF, size0, size0 // 8)
+            any_bands.append(any_band)
+            all_bands.append(all_band)
+        any_bits = np.concatenate(any_bands)
+        all_bits = np.concatenate(all_bands)
+        # the padding bits of the last byte are 0: a partial block is never full
+        prev = block_sizes[0]
+        for size in block_sizes:
+            if size != prev:
+                any_bits, all_bits = self._reduce(any_bits, all_bits, size // prev, size // prev)
+                prev = size
+            level = np.where(all_bits, BLOCK_FULL, np.where(any_bits, BLOCK_MIXED, BLOCK_EMPTY))
+            level = np.ascontiguousarray(level, dtype=np.uint8)
+            self.levels.append(level)
+            self._flat.append(level.tobytes())
+            self._cols.append(level.shape[1])
+
+    @staticmethod
+    def _reduce(any_bits, all_bits, fy, fx):
+        """Combine fy x fx cells into one (any = OR, all = AND; padding is free)."""
+        h, w = any_bits.shape
+        ph, pw = -h % fy, -w % fx
+        if ph or pw:
+            any_bits = np.pad(any_bits, ((0, ph), (0, pw)))
+            all_bits = np.pad(all_bits, ((0, ph), (0, pw)))
+        h, w = any_bits.shape
+        any_bits = any_bits.reshape(h // fy, fy, w // fx, fx).any(axis=(1, 3))
+        all_bits = all_bits.reshape(h // fy, fy, w // fx, fx).all(axis=(1, 3))
+        return any_bits, all_bits
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def block_state(self, level, bx, by):
+        """State of block (bx, by) of `level` (index into block_sizes); outside is empty."""
+        cols = self._cols[level]
+        if 0 <= bx < cols and 0 <= by < len(self._flat[level]) // cols:
+            return self._flat[level][by * cols + bx]
+        return BLOCK_EMPTY
+
+    def rect_state(self, x0, y0, x1, y1, max_blocks=36):
+        """
+        Answer "is any pixel of [x0, x1] x [y0, y1] (inclusive, inside the
+        map) an obstacle?" from the summary levels, coarse to fine: False
+        when every covering block is empty, True when one of them is full,
+        None when only the bitmap can tell. Levels that need more than
+        `max_blocks` blocks to cover the rectangle are not used.
+        """
+        for level in range(len(self.block_sizes) - 1, -1, -1):
+            size = self.block_sizes[level]
+            bx0, bx1 = x0 // size, x1 // size
+            by0, by1 = y0 // size, y1 // size
+            if (bx1 - bx0 + 1) * (by1 - by0 + 1) > max_blocks:
+                break
+            flat = self._flat[level]
+            cols = self._cols[level]
+            mixed = False
+            for by in range(by0, by1 + 1):
+                row = flat[by * cols + bx0:by * cols + bx1 + 1]
+                if BLOCK_FULL in row:
+                    return True
+                if row.strip(b'\x00'):
+                    mixed = True
+            if not mixed:
+                return False
+        return None
+
+
+class _BitmapRow:
+    """Row proxy so code written for grid[y][x] keeps working on a bitmap."""
+
+    __slots__ = ('_bitmap', '_y')
+
+    def __init__(self, bitmap, y):
+        self._bitmap = bitmap
+        self._y = y
+
+    def __len__(self):
+        return self._bitmap.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self._bitmap.width:
+            raise IndexError(x)
+        return 1 if self._bitmap.is_occupied(x, self._y) else 0
+
+
+def point_query(grid):
+    """
+    Return an is_occupied(x, y) function for any collision grid flavour
+    (OccupancyBitmap, (height, width) array, or list of bytearray rows).
+    Coordinates must already be inside the map.
+    """
+    if isinstance(grid, OccupancyBitmap):
+        # no bounds checks: close to the cost of a bytearray row lookup
+        flat, row_bytes = grid._flat, grid.row_bytes
+        return lambda x, y: (flat[y * row_bytes + (x >> 3)] >> (7 - (x & 7))) & 1 == 1
+    return lambda x, y: bool(grid[y][x])
+
+
+def span_query(grid):
+    """
+    Return a span_occupied(y, x0, x1) function (inclusive x range) for any
+    collision grid flavour. Coordinates must already be inside the map.
+    """
+    if isinstance(grid, OccupancyBitmap):
+        return grid._span_in_map
+    if np is not None and isinstance(grid, np.ndarray) and grid.flags.c_contiguous \
+            and grid.dtype == np.uint8 and grid.ndim == 2:
+        # slice the raw bytes: cheaper than a NumPy call for short spans
+        flat = memoryview(grid).cast('B')
+        width = grid.shape[1]
+        return lambda y, x0, x1: bytes(flat[y * width + x0:y * width + x1 + 1]).strip(b'\x00') != b''
+    return lambda y, x0, x1: any(grid[y][x0:x1 + 1])
+
+
+def rect_query(grid):
+    """
+    Return a rect_occupied(x0, y0, x1, y1) function (inclusive, clipped to
+    the map) for any collision grid flavour.
+    """
+    if isinstance(grid, OccupancyBitmap):
+        return grid.rect_occupied
+
+    def rect_occupied(x0, y0, x1, y1):
+        height = len(grid)
+        width = len(grid[0]) if height else 0
+        x0, y0 = max(int(x0), 0), max(int(y0), 0)
+        x1, y1 = min(int(x1), width - 1), min(int(y1), height - 1)
+        if x0 > x1 or y0 > y1:
+            return False
+        if np is not None and isinstance(grid, np.ndarray):
+            return bool(grid[y0:y1 + 1, x0:x1 + 1].any())
+        return any(any(grid[y][x0:x1 + 1]) for y in range(y0, y1 + 1))
+    return rect_occupied
@@ -0,0 +1,226 @@
+"""
+Benchmark: decoding recorded CAN frames with the codec table
+(Player/can_codec.py) against the if/elif chain with one struct.unpack per
+field it replaced.
+
+--frames frames are recorded once (python-can Messages, the mix the TTC
+sends: mostly joystick axes, then traction, selectors, lights and image
+ids, a few unknown ids) and decoded in a loop:
+- 'values': the payload only (the old chain's unpacks vs
+  RX_CODECS[id].decode);
+- 'state': decode_if_chain vs Joystick._decode, the whole update
+  of the JoystickState snapshot as the reader does per frame.
+'frames/s' is the best of --repeat runs; 'same' checks that both give the
+same values / the same state after every frame.
+
+It also checks that the codec copy of the Turtle simulator
+(Python_Sim_Turtle/Application/can_codec.py) is byte-identical to
+Player/can_codec.py; the script exits with status 1 if it differs or if
+the decoders disagree.
+
+Uso:
+    python benchmarks/bench_can_codec.py [--frames N] [--repeat R]
+"""
+
+import argparse
+import functools
+import os
+import random
+import struct
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import can
+
+from Player.Joystick import Joystick
+from Player.can_codec import RX_CODECS
+
+CODEC_PATH = os.path.join(PROJECT_ROOT, 'Player', 'can_codec.py')
+TWIN_CODEC_PATH = os.path.join(os.path.dirname(PROJECT_ROOT), 'Python_Sim_Turtle', 'Application', 'can_codec.py')
+
+# (arbitration id, payload length, weight)
+FRAME_MIX = (
+    (0x200, 8, 70),
+    (0x204, 2, 15),
+    (0x201, 2, 4),
+    (0x203, 1, 4),
+    (0x202, 1, 4),
+    (0x210, 1, 2),
+    (0x205, 8, 1),
+)
+
+
+def codec_copies_match(path=CODEC_PATH, twin_path=TWIN_CODEC_PATH):
+    """True if both simulators ship the same can_codec.py (None without the twin)."""
+    if not os.path.isfile(twin_path):
+        return None
+    with open(path, 'rb') as f, open(twin_path, 'rb') as twin:
+        return f.read() == twin.read()
+
+
+def record(count, seed=0):
+    rng = random.Random(seed)
+    kinds = [(aid, length) for aid, length, weight in FRAME_MIX for _ in range(weight)]
+    frames = []
+    for _ in range(count):
+        aid, length = rng.choice(kinds)
+        data = bytes(rng.randrange(256) for _ in range(length))
+        frames.append(can.Message(arbitration_id=aid, data=data, is_extended_id=False))
+    return frames
+
+
+def decode_if_chain(joystick, state, msg, now):
+    """
+    Joystick._decode as it was before the codec table: an if/elif chain on
+    the arbitration id and one struct.unpack per field.
+    """
+    # only handle standard 11-bit frames as before
+    if msg.is_extended_id:
+        return state
+    data = msg.data
+    if msg.arbitration_id == joystick.CAN_CHANNEL_JOYSTICK:
+        # expect 8 bytes: 4 signed 16-bit (little-endian)
+        if len(data) >= 8:
+            Joystick_X_1 = struct.unpack('<h', data[0:2])[0]
+            Joystick_Y_1 = struct.unpack('<h', data[2:4])[0]
+            Joystick_X_2 = struct.unpack('<h', data[4:6])[0]
+            Joystick_Y_2 = struct.unpack('<h', data[6:8])[0]
+            # original converted to float with 1 decimal place
+            return state._replace(lx=Joystick_X_1 / 10.0, ly=Joystick_Y_1 / 10.0,
+                                  rx=Joystick_X_2 / 10.0, ry=Joystick_Y_2 / 10.0,
+                                  frames=state.frames + 1, axes_time=now)
+    elif msg.arbitration_id == joystick.CAN_CHANNEL_SELETORA:
+        if len(data) >= 2:
+            selectedMode = struct.unpack('<h', data[0:2])[0]
+            if selectedMode != state.mode:
+                state = state._replace(mode=selectedMode, mode_seq=state.mode_seq + 1)
+            return state._replace(frames=state.frames + 1, mode_time=now)
+    elif msg.arbitration_id == joystick.CAN_CHANNEL_LIGHTS:
+        if len(data) >= 1:
+            lightsState = struct.unpack('<B', data[0:1])[0]
+            # keep 5 lights as original
+            return state._replace(lights=tuple((lightsState & (1 << i)) != 0 for i in range(5)),
+                                  frames=state.frames + 1, lights_time=now)
+    elif msg.arbitration_id == joystick.CAN_CHANNEL_SPEED:
+        if len(data) >= 1:
+            selectedSpeed = struct.unpack('<B', data[0:1])[0]
+            if selectedSpeed != state.speed:
+                state = state._replace(speed=selectedSpeed, speed_seq=state.speed_seq + 1)
+            return state._replace(frames=state.frames + 1, speed_time=now)
+    elif msg.arbitration_id == joystick.CAN_CHANNEL_IMAGE_ID:
+        # Converte os bytes do CAN diretamente para string hex (maiúscula)
+        id_str = bytes(data).hex().upper()
+        if id_str != state.image_id:
+            state = state._replace(image_id=id_str, image_seq=state.image_seq + 1)
+        return state._replace(frames=state.frames + 1, image_time=now)
+    elif msg.arbitration_id == joystick.CAN_CHANNEL_TRACTION:
+        traction_value = state.traction
+        if len(data) >= 2:
+            traction_value = struct.unpack('<h', data[:2])[0]
+        elif len(data) == 1:
+            traction_value = struct.unpack('<b', data)[0]
+        return state._replace(traction=traction_value, frames=state.frames + 1, traction_time=now)
+    return state
+
+
+def values_if_chain(msg):
+    """The payload decoding of the old chain, without the state update."""
+    data = msg.data
+    aid = msg.arbitration_id
+    if aid == 0x200:
+        if len(data) >= 8:
+            return (struct.unpack('<h', data[0:2])[0] / 10.0, struct.unpack('<h', data[2:4])[0] / 10.0,
+                    struct.unpack('<h', data[4:6])[0] / 10.0, struct.unpack('<h', data[6:8])[0] / 10.0)
+    elif aid == 0x201:
+        if len(data) >= 2:
+            return struct.unpack('<h', data[0:2])[0]
+    elif aid == 0x202:
+        if len(data) >= 1:
+            lights_state = struct.unpack('<B', data[0:1])[0]
+            return tuple((lights_state & (1 << i)) != 0 for i in range(5))
+    elif aid == 0x203:
+        if len(data) >= 1:
+            return struct.unpack('<B', data[0:1])[0]
+    elif aid == 0x210:
+        return bytes(data).hex().upper()
+    elif aid == 0x204:
+        if len(data) >= 2:
+            return struct.unpack('<h', data[:2])[0]
+        elif len(data) == 1:
+            return struct.unpack('<b', data)[0]
+    return None
+
+
+def values_table(msg):
+    codec = RX_CODECS.get(msg.arbitration_id)
+    if codec is None:
+        return None
+    return codec.decode(msg.data)
+
+
+def best_rate(fn, frames, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(frames)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(frames) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = record(args.frames)
+    bus = can.Bus('bench-can-codec', interface='virtual')
+    joystick = Joystick(bus=bus)
+
+    def run_values(decode):
+        def run(frames):
+            for msg in frames:
+                decode(msg)
+        return run
+
+    def run_state(decode):
+        def run(frames):
+            state = joystick._state
+            for msg in frames:
+                state = decode(state, msg, 0.0)
+        return run
+
+    same_values = all(values_if_chain(msg) == values_table(msg) for msg in frames)
+    a = b = joystick._state
+    same_state = True
+    for msg in frames:
+        a = decode_if_chain(joystick, a, msg, 0.0)
+        b = joystick._decode(b, msg, 0.0)
+        same_state = same_state and a == b
+
+    copies = codec_copies_match()
+    print(f"{os.path.relpath(TWIN_CODEC_PATH, os.path.dirname(PROJECT_ROOT))}: "
+          f"{'not found' if copies is None else 'identical' if copies else 'DIFFERS'}")
+    print(f"{len(frames)} frames, best of {args.repeat}")
+    print(f"{'':>7} {'if/elif frames/s':>17} {'table frames/s':>15} {'speedup':>8} {'same':>5}")
+    for label, old, new, same in (
+        ('values', run_values(values_if_chain), run_values(values_table), same_values),
+        ('state', run_state(functools.partial(decode_if_chain, joystick)), run_state(joystick._decode), same_state),
+    ):
+        old_rate = best_rate(old, frames, args.repeat)
+        new_rate = best_rate(new, frames, args.repeat)
+        print(f"{label:>7} {old_rate:>17,.0f} {new_rate:>15,.0f} {new_rate / old_rate:>7.2f}x {str(same):>5}")
+    joystick.close()
+    if copies is False or not (same_values and same_state):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark: joystick input latency and main-thread cost, with the CAN bus
+drained by poll() on the render loop ('poll') or decoded by the reader thread
+('notifier'), over python-can's 'virtual' interface.
+
+A sender thread sends joystick frames (0x200) at --rate Hz, each carrying a
+sequence number, plus a lights frame now and then. The main loop mimics
+v1.0_pygame.py: poll() once per frame, then the 60 Hz logic ticks the frame
+owes (each reads getJoystickValues()), then a render that takes --frame-ms
+(every 10th frame 3x longer).
+- 'latency': from a frame being sent to the first tick that reads it or a
+  newer one (p50/p95/max). The ticks run right after poll(), so in both
+  modes this is bound by the render time; the reader thread keeps the
+  snapshot current for a tick at any moment.
+- 'age': how old the value is when a tick reads it.
+- 'poll ms': main-thread time spent in poll() per frame (the decoding, with
+  'poll').
+- 'lost': frames sent but not decoded; 'last ok': the final snapshot holds
+  the last frame sent.
+
+Uso:
+    python benchmarks/bench_can_reader.py [--seconds S] [--rate HZ] [--frame-ms MS]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import threading
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import can
+
+from Player.Joystick import Joystick
+
+LOGIC_TICK_S = 1.0 / 60.0
+SEQ_WRAP = 30000
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def fmt(values):
+    return '/'.join(f'{v * 1e3:.2f}' for v in (percentile(values, 50), percentile(values, 95), max(values)))
+
+
+class Sender(threading.Thread):
+    """Joystick frames with a sequence number in the left X axis, at `rate` Hz."""
+
+    def __init__(self, channel, rate):
+        super().__init__(daemon=True)
+        self.bus = can.Bus(channel, interface='virtual')
+        self.period = 1.0 / rate
+        self.sent = {}
+        self.last_seq = 0
+        self.count = 0
+        self.stop_event = threading.Event()
+
+    def run(self):
+        seq = 0
+        next_time = time.perf_counter()
+        while not self.stop_event.is_set():
+            seq = (seq + 1) % SEQ_WRAP
+            data = struct.pack('<hhhh', seq, 0, 0, 0)
+            self.sent[seq] = time.time()
+            self.bus.send(can.Message(arbitration_id=0x200, data=data, is_extended_id=False))
+            self.last_seq = seq
+            self.count += 1
+            if seq % 50 == 0:
+                self.bus.send(can.Message(arbitration_id=0x202, data=bytes([seq // 50 % 32]), is_extended_id=False))
+                self.count += 1
+            next_time += self.period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+        self.bus.shutdown()
+
+
+def run(reader, args):
+    channel = f'bench-can-{reader}'
+    joystick = Joystick(reader=reader, bus=can.Bus(channel, interface='virtual'))
+    sender = Sender(channel, args.rate)
+    sender.start()
+
+    latencies, ages, polls = [], [], []
+    seen = 0
+    accumulated = 0.0
+    last = time.perf_counter()
+    end = last + args.seconds
+    frame = 0
+    while time.perf_counter() < end:
+        now = time.perf_counter()
+        accumulated += now - last
+        last = now
+
+        start = time.perf_counter()
+        joystick.poll()
+        polls.append(time.perf_counter() - start)
+
+        while accumulated >= LOGIC_TICK_S:
+            accumulated -= LOGIC_TICK_S
+            lx, _ly, _rx, _ry = joystick.getJoystickValues()
+            tick_time = time.time()
+            seq = int(round(lx * 10))
+            if seq in sender.sent:
+                ages.append(tick_time - sender.sent[seq])
+                # every frame up to this one reaches the logic now
+                for s in range(seen + 1, seq + 1):
+                    if s in sender.sent:
+                        latencies.append(tick_time - sender.sent[s])
+                seen = max(seen, seq)
+
+        frame += 1
+        time.sleep(args.frame_ms * (3 if frame % 10 == 0 else 1) / 1000.0)
+
+    sender.stop()
+    time.sleep(0.2)
+    joystick.poll()
+    state = joystick.snapshot()
+    joystick.close()
+    last_ok = int(round(state.lx * 10)) == sender.last_seq
+    return latencies, ages, polls, sender.count - state.frames, last_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--rate', type=float, default=500.0, help='joystick frames per second')
+    parser.add_argument('--frame-ms', type=float, default=30.0, help='render time per frame')
+    args = parser.parse_args()
+
+    print(f"{'reader':>9} {'latency p50/p95/max ms':>24} {'age p50/p95/max ms':>22} {'poll ms':>8} "
+          f"{'lost':>5} {'last ok':>7}")
+    for reader in ('poll', 'notifier'):
+        latencies, ages, polls, lost, last_ok = run(reader, args)
+        print(f"{reader:>9} {fmt(latencies):>24} {fmt(ages):>22} {sum(polls) / len(polls) * 1e3:>8.3f} "
+              f"{lost:>5} {str(last_ok):>7}")
+
+
+if __name__ == '__main__':
+    main()
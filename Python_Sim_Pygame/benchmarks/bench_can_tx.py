@@ -0,0 +1,154 @@
+"""
+Benchmark: logic-tick cost of send_sim_traction + send_inclinometer, sent
+synchronously ('sync') or through the TX thread ('scheduler',
+Player/can_tx.py), over python-can's 'virtual' interface.
+
+The ticks run at 60 Hz for --seconds, like v1.0_pygame.py: the wheel speeds
+change every tick, the inclinometer only every --hold ticks. Buses:
+- 'virtual': send() returns at once;
+- 'busy': send() waits --busy-ms before returning, as the PCAN adapter does
+  when its transmit queue is full (up to the 10 ms timeout).
+'tick ms' is the time the two calls take in the tick (p50/p95/max), 'rx'
+the frames a receiver got for 0x222/0x220, 'last ok' whether the last
+frame received for each id holds the last value submitted. The scheduler
+columns are its counters: sent, heartbeats, coalesced (replaced before
+sent), errors and the largest queue depth.
+
+Uso:
+    python benchmarks/bench_can_tx.py [--seconds S] [--hold N] [--busy-ms MS] [--rate HZ]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import can
+
+from Player.Joystick import Joystick
+
+LOGIC_TICK_S = 1.0 / 60.0
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def fmt(values):
+    return '/'.join(f'{v * 1e3:.3f}' for v in (percentile(values, 50), percentile(values, 95), max(values)))
+
+
+class BusyBus:
+    """A virtual bus whose send() takes `delay` seconds (bounded by the timeout)."""
+
+    def __init__(self, bus, delay):
+        self.bus = bus
+        self.delay = delay
+
+    def send(self, msg, timeout=None):
+        time.sleep(self.delay if timeout is None else min(self.delay, timeout))
+        self.bus.send(msg, timeout)
+
+    def recv(self, timeout=None):
+        return self.bus.recv(timeout)
+
+    def shutdown(self):
+        self.bus.shutdown()
+
+
+class CaptureBus:
+    """Keeps the last payload sent per arbitration id; receives nothing."""
+
+    def __init__(self):
+        self.payloads = {}
+
+    def send(self, msg, timeout=None):
+        self.payloads[msg.arbitration_id] = bytes(msg.data)
+
+    def recv(self, timeout=None):
+        return None
+
+    def shutdown(self):
+        pass
+
+
+def run(tx, busy, args):
+    channel = f'bench-can-tx-{tx}-{busy}'
+    bus = can.Bus(channel, interface='virtual')
+    if busy == 'busy':
+        bus = BusyBus(bus, args.busy_ms / 1000.0)
+    receiver = can.Bus(channel, interface='virtual')
+    joystick = Joystick(bus=bus, tx=tx, tx_rate_hz=args.rate)
+
+    ticks = []
+    last = {}
+    end = time.perf_counter() + args.seconds
+    next_tick = time.perf_counter()
+    i = 0
+    while time.perf_counter() < end:
+        ws = [100 + (i * 7) % 50, 101, 102 + i % 3, 103]
+        inclination = (i // args.hold) % 20
+        start = time.perf_counter()
+        joystick.send_sim_traction(ws)
+        joystick.send_inclinometer(inclination)
+        ticks.append(time.perf_counter() - start)
+        last = {0x222: ws, 0x220: inclination}
+        i += 1
+        next_tick += LOGIC_TICK_S
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    time.sleep(0.2)
+    stats = joystick.tx_stats()
+    joystick.close()
+
+    # the payloads of the last values, encoded by a synchronous Joystick
+    capture = CaptureBus()
+    encoder = Joystick(bus=capture)
+    encoder.send_sim_traction(last[0x222])
+    encoder.send_inclinometer(last[0x220])
+
+    frames = {}
+    received = {}
+    while True:
+        msg = receiver.recv(timeout=0.0)
+        if msg is None:
+            break
+        frames[msg.arbitration_id] = frames.get(msg.arbitration_id, 0) + 1
+        received[msg.arbitration_id] = bytes(msg.data)
+    receiver.shutdown()
+    last_ok = all(received.get(k) == v for k, v in capture.payloads.items())
+    return ticks, i, frames, last_ok, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--hold', type=int, default=30, help='ticks the inclinometer value holds')
+    parser.add_argument('--busy-ms', type=float, default=5.0, help="send() time on the 'busy' bus")
+    parser.add_argument('--rate', type=float, default=60.0, help='scheduler rate (Hz)')
+    args = parser.parse_args()
+
+    print(f"{'bus':>8} {'tx':>10} {'ticks':>6} {'tick ms p50/p95/max':>22} {'rx 222/220':>11} {'last ok':>7}  "
+          f"{'sent':>5} {'heartb':>6} {'coalesced':>9} {'errors':>6} {'depth':>5}")
+    for busy in ('virtual', 'busy'):
+        for tx in ('sync', 'scheduler'):
+            ticks, count, frames, last_ok, stats = run(tx, busy, args)
+            rx = f"{frames.get(0x222, 0)}/{frames.get(0x220, 0)}"
+            counters = ''
+            if stats is not None:
+                counters = (f"{stats['sent']:>5} {stats['heartbeats']:>6} {stats['coalesced']:>9} "
+                            f"{stats['errors']:>6} {stats['max_queue_depth']:>5}")
+            print(f"{busy:>8} {tx:>10} {count:>6} {fmt(ticks):>22} {rx:>11} {str(last_ok):>7}  {counters}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: per-pixel (get_at) vs vectorized (surfarray) collision grid builder.
+Runs both builders on every map in World/Obstacles, checks that they produce
+the same occupancy and prints the timings.
+
+Uso:
+    python benchmarks/bench_collision_grid.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.collision import build_collision_grid, build_collision_grid_per_pixel
+
+
+def iter_obstacle_maps(root=PROJECT_ROOT):
+    """Yield every PNG under World/Obstacles (including subfolders)."""
+    obstacles_dir = os.path.join(root, 'World', 'Obstacles')
+    for dirpath, _dirnames, filenames in os.walk(obstacles_dir):
+        for filename in sorted(filenames):
+            if filename.lower().endswith('.png'):
+                yield os.path.join(dirpath, filename)
+
+
+def time_call(fn, *args, repeat=1):
+    """Return (best_seconds, last_result) over `repeat` runs."""
+    best = None
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def grids_match(legacy_grid, new_grid):
+    """Compare a list-of-bytearray grid with the array grid row by row."""
+    if len(legacy_grid) != len(new_grid):
+        return False
+    for legacy_row, new_row in zip(legacy_grid, new_grid):
+        if bytes(legacy_row) != new_row.tobytes():
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs of the vectorized builder (best time is kept)')
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    print(f"{'map':<48} {'size':>10} {'per-pixel':>11} {'vectorized':>11} {'speedup':>9}  match")
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        w, h = img.get_size()
+        # the per-pixel builder takes seconds per map; one run is enough
+        old_s, (old_grid, old_count) = time_call(build_collision_grid_per_pixel, img)
+        new_s, (new_grid, new_count) = time_call(build_collision_grid, img, repeat=args.repeat)
+        match = old_count == new_count and grids_match(old_grid, new_grid)
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        print(f"{name:<48} {w:>4}x{h:<5} {old_s * 1000:>9.1f}ms {new_s * 1000:>9.2f}ms "
+              f"{old_s / max(new_s, 1e-9):>8.0f}x  {'ok' if match else 'MISMATCH'}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: signed distance field clearance queries.
+For every map in World/Obstacles reports:
+- the time to build the field and its memory (int16, cached per map);
+- that clearance(x, y) never overestimates the distance from a random point
+  to the nearest obstacle pixel (brute force over the obstacle pixels);
+- for random robot poses: how often the O(1) early-out skips the collision
+  test, the average time of check_player_collision_with_map with and
+  without it (same results), and the time of footprint_clearance as the
+  HUD calls it (limit=PROXIMITY_WARNING_PX), which must be <= 0 whenever
+  the hitbox collides.
+
+Uso:
+    python benchmarks/bench_distance_field.py [--points N] [--poses N] [--seed S]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+from game.collision import check_player_collision_with_map
+from game.config import PROXIMITY_WARNING_PX
+from World.distance_field import DistanceField
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+from bench_footprint_masks import random_pose
+from bench_swept_collision import make_player
+
+
+def true_clearance(occupied_xy, x, y):
+    """Distance from (x, y) to the nearest obstacle pixel square."""
+    dx = np.maximum(np.maximum(occupied_xy[:, 0] - x, x - (occupied_xy[:, 0] + 1)), 0.0)
+    dy = np.maximum(np.maximum(occupied_xy[:, 1] - y, y - (occupied_xy[:, 1] + 1)), 0.0)
+    return float(np.sqrt(dx * dx + dy * dy).min())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--points', type=int, default=300, help='random clearance checks per map')
+    parser.add_argument('--poses', type=int, default=3000, help='random robot poses per map')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1, 1))
+    rng = random.Random(args.seed)
+
+    print(f"{'map':<48} {'build':>7} {'KiB':>6} {'bound':>6} {'skip':>6} "
+          f"{'grid':>9} {'sdf+grid':>9} {'footprint':>10} {'match':>6}")
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        w, h = img.get_size()
+        grid = OccupancyBitmap.from_surface(img)
+
+        start = time.perf_counter()
+        field = DistanceField.from_occupancy(grid)
+        build_s = time.perf_counter() - start
+
+        ys, xs = np.nonzero(grid.to_array())
+        occupied_xy = np.stack([xs, ys], axis=1).astype(np.float64)
+        bound_ok = True
+        for _ in range(args.points):
+            x, y = rng.uniform(0, w), rng.uniform(0, h)
+            if len(occupied_xy) and field.clearance(x, y) > true_clearance(occupied_xy, x, y) + 1e-9:
+                bound_ok = False
+
+        player = make_player(screen, (w, h), (w / 2, h / 2))
+        grid_s = sdf_s = foot_s = 0.0
+        skipped = 0
+        match = True
+        for _ in range(args.poses):
+            random_pose(player, rng, w, h)
+            parts = player.get_rotated_hitbox()
+            reach = max(math.hypot(x - player.x, y - player.y) for _k, data in parts for x, y in data)
+            skipped += field.clearance(player.x, player.y) > reach
+
+            start = time.perf_counter()
+            plain = check_player_collision_with_map(player, grid, img)
+            grid_s += time.perf_counter() - start
+
+            start = time.perf_counter()
+            early = check_player_collision_with_map(player, grid, img, distance_field=field)
+            sdf_s += time.perf_counter() - start
+
+            start = time.perf_counter()
+            clearance = field.footprint_clearance(player, limit=PROXIMITY_WARNING_PX)
+            foot_s += time.perf_counter() - start
+
+            if plain != early or (plain and clearance > 0):
+                match = False
+
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        print(f"{name:<48} {build_s:>6.2f}s {field.nbytes / 1024:>6.0f} "
+              f"{'ok' if bound_ok else 'FAIL':>6} {skipped / args.poses:>6.1%} "
+              f"{grid_s / args.poses * 1e6:>7.1f}us {sdf_s / args.poses * 1e6:>7.1f}us "
+              f"{foot_s / args.poses * 1e6:>8.1f}us {'ok' if match else 'FAIL':>6}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: per-part geometric hitbox test vs cached pygame.mask footprints.
+Places the robot at random poses (random body heading, wheels steered at
+random) over every map in World/Obstacles and reports:
+- memory of the footprint cache (all heading buckets) and of the map mask;
+- the average time of check_player_collision_with_map with and without
+  footprints;
+- hit/miss parity: poses where both agree, and hits only one of them found.
+  The footprints are conservative: 'mask-only' hits (within about two
+  pixels of a wall) are expected, a 'geo-only' hit is a wall contact the
+  masks missed and fails the benchmark (exit status 1).
+
+Uso:
+    python benchmarks/bench_footprint_masks.py [--poses N] [--seed S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.collision import build_collision_grid, check_player_collision_with_map
+from game.footprint import FootprintCache, FootprintCollider
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+from bench_swept_collision import make_player
+
+
+def random_pose(player, rng, w, h):
+    player.setHeading(rng.uniform(0, 360))
+    player.setPosition((rng.uniform(0, w), rng.uniform(0, h)))
+    steer = rng.choice((0.0, 45.0, 90.0, rng.uniform(-90, 90)))
+    for wheel in player.wheels:
+        wheel.setPosition(player.getPosition())
+        wheel.setHeading((player.getHeading() + steer) % 360)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--poses', type=int, default=5000, help='random poses per map')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1, 1))
+    rng = random.Random(args.seed)
+
+    cache = FootprintCache()
+    player = make_player(screen, (800, 600), (400, 300))
+    start = time.perf_counter()
+    cache.warm(player.get_rotated_hitbox())
+    warm_s = time.perf_counter() - start
+    print(f"footprint cache: {len(cache)} masks, {cache.nbytes / 1024:.1f} KiB, "
+          f"built in {warm_s * 1e3:.0f} ms")
+    print()
+
+    failed = 0
+    print(f"{'map':<48} {'mask KiB':>9} {'bits KiB':>9} {'geometry':>10} {'masks':>10} "
+          f"{'agree':>7} {'geo-only':>9} {'mask-only':>10}")
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        w, h = img.get_size()
+        grid = OccupancyBitmap.from_array(build_collision_grid(img)[0])
+        collider = FootprintCollider(grid, img, cache=cache)
+        player = make_player(screen, (w, h), (w / 2, h / 2))
+
+        geo_s = mask_s = 0.0
+        agree = geo_only = mask_only = 0
+        for _ in range(args.poses):
+            random_pose(player, rng, w, h)
+
+            start = time.perf_counter()
+            geo = check_player_collision_with_map(player, grid, img)
+            geo_s += time.perf_counter() - start
+
+            start = time.perf_counter()
+            masked = check_player_collision_with_map(player, grid, img, collider)
+            mask_s += time.perf_counter() - start
+
+            if geo == masked:
+                agree += 1
+            elif geo:
+                geo_only += 1
+            else:
+                mask_only += 1
+
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        print(f"{name:<48} {collider.nbytes / 1024:>9.1f} {grid.nbytes / 1024:>9.1f} "
+              f"{geo_s / args.poses * 1e6:>8.1f}us {mask_s / args.poses * 1e6:>8.1f}us "
+              f"{agree / args.poses:>7.2%} {geo_only:>9} {mask_only:>10}"
+              f"{'  FAIL' if geo_only else ''}")
+        failed += geo_only
+
+    stats = cache.stats()
+    print()
+    print(f"cache lookups: {stats['hits']} hits, {stats['misses']} misses")
+    pygame.quit()
+    if failed:
+        print(f"{failed} wall contact(s) missed by the footprints")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: end-to-end input latency, from a joystick CAN frame on the bus to
+the frame on screen (game/latency.py), with the virtual CAN stand-in
+(Player/can_injector.py) sending joystick frames at --rate Hz.
+
+The loop mimics v1.0_pygame.py: Joystick.poll() once per frame, the 60 Hz
+logic ticks the frame owes (Joystick.refresh(), then
+Player.move_with_joystick with getJoystickValues()), a render that takes --frame-ms (every 10th frame 3x
+longer), FramePresenter.present and InputLatencyTracer.displayed. Both CAN
+reader modes are measured. Columns are p50/p95/p99 in ms of each stage:
+bus->decode (poll() or the reader thread), decode->tick, tick->display and
+the total; 'samples' the frames that reached the screen, 'stale' those no
+tick used in time. --csv writes each mode's samples to <csv>_<reader>.csv.
+
+Uso:
+    python benchmarks/bench_input_latency.py [--seconds S] [--rate HZ] [--frame-ms MS] [--csv PATH]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.config import SCREEN_H, SCREEN_W
+from game.latency import LATENCY_STAGES, InputLatencyTracer
+from game.rendering import FramePresenter
+from Player.Joystick import Joystick
+from Player.can_injector import JoystickInjector, open_virtual_bus
+
+from bench_swept_collision import make_player
+
+LOGIC_TICK_S = 1.0 / 60.0
+
+
+def run(screen, reader, args):
+    channel = f'bench-input-latency-{reader}'
+    joystick = Joystick(reader=reader, bus=open_virtual_bus(channel))
+    player = make_player(screen, (SCREEN_W, SCREEN_H), (SCREEN_W / 2, SCREEN_H / 2))
+    tracer = InputLatencyTracer(window=10 ** 6, max_samples=10 ** 6)
+    joystick.latency_tracer = tracer
+    player.latency_tracer = tracer
+    injector = JoystickInjector(channel, rate_hz=args.rate).start()
+    presenter = FramePresenter()
+
+    accumulated = 0.0
+    last = time.perf_counter()
+    end = last + args.seconds
+    frame = 0
+    while time.perf_counter() < end:
+        now = time.perf_counter()
+        accumulated += now - last
+        last = now
+        joystick.poll()
+        while accumulated >= LOGIC_TICK_S:
+            accumulated -= LOGIC_TICK_S
+            joystick.refresh()
+            player.move_with_joystick(joystick.getJoystickValues(), speed=3, dt_ms=LOGIC_TICK_S * 1000.0)
+        frame += 1
+        screen.fill((frame % 255, 0, 0))
+        time.sleep(args.frame_ms * (3 if frame % 10 == 0 else 1) / 1000.0)
+        presenter.present(screen, [screen.get_rect()])
+        tracer.displayed()
+
+    injector.stop()
+    joystick.close()
+    if args.csv:
+        tracer.export_csv(f'{os.path.splitext(args.csv)[0]}_{reader}.csv')
+    return tracer, injector.sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--rate', type=float, default=100.0, help='joystick frames per second')
+    parser.add_argument('--frame-ms', type=float, default=20.0, help='render time per frame')
+    parser.add_argument('--csv', default=None, help='export the samples (one file per reader)')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    print(f"{'reader':>9} " + ' '.join(f'{stage:>20}' for stage in LATENCY_STAGES)
+          + f" {'sent':>5} {'samples':>7} {'stale':>5}")
+    for reader in ('poll', 'notifier'):
+        tracer, sent = run(screen, reader, args)
+        summary = tracer.summary()
+        stats = tracer.stats()
+        cells = ['/'.join(f'{v:.1f}' for v in summary[stage]) if summary['count'] else '-'
+                 for stage in LATENCY_STAGES]
+        print(f"{reader:>9} " + ' '.join(f'{c:>20}' for c in cells)
+              + f" {sent:>5} {summary['count']:>7} {stats['stale']:>5}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
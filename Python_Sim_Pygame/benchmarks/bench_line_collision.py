@@ -0,0 +1,128 @@
+"""
+Benchmark: sampled check_line_collision vs exact grid traversal (raycast_grid).
+Generates random segments of hitbox length ('edge'/'side' parts) and long
+sensor-like rays over every map in World/Obstacles and reports:
+- the average time per call of both versions;
+- hits the sampled version missed (diagonal cell skips) and hits it found
+  that the traversal did not (should be 0);
+- that every reported hit point (p1 + t * (p2 - p1)) lies on the hit cell.
+
+Uso:
+    python benchmarks/bench_line_collision.py [--segments N] [--seed S]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.collision import build_collision_grid, check_line_collision, point_query, raycast_grid
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+
+
+def check_line_collision_sampled(p1, p2, collision_grid, map_image):
+    """
+    Sampled segment test (one point per unit of length), the
+    check_line_collision before raycast_grid. Can skip cells on diagonals.
+    """
+    x1, y1 = p1
+    x2, y2 = p2
+    dx = x2 - x1
+    dy = y2 - y1
+    length = math.hypot(dx, dy)
+    is_occupied = point_query(collision_grid)
+    if length < 1e-6:
+        # degenerate: treat single point
+        ix, iy = int(round(x1)), int(round(y1))
+        if 0 <= ix < map_image.get_width() and 0 <= iy < map_image.get_height():
+            try:
+                return is_occupied(ix, iy)
+            except Exception:
+                return False
+        return False
+
+    steps = int(math.ceil(length))
+    for i in range(steps + 1):
+        t = float(i) / float(steps)
+        wx = x1 + dx * t
+        wy = y1 + dy * t
+        ix = int(wx)
+        iy = int(wy)
+        if not (0 <= ix < map_image.get_width() and 0 <= iy < map_image.get_height()):
+            continue
+        try:
+            if is_occupied(ix, iy):
+                return True
+        except Exception:
+            continue
+    return False
+
+
+def random_segment(rng, w, h, length):
+    x, y = rng.uniform(0, w), rng.uniform(0, h)
+    angle = rng.uniform(0, 2 * math.pi)
+    return (x, y), (x + length * math.cos(angle), y + length * math.sin(angle))
+
+
+def time_all(fn, segments, *args):
+    start = time.perf_counter()
+    results = [fn(p1, p2, *args) for p1, p2 in segments]
+    return (time.perf_counter() - start) / len(segments), results
+
+
+def hit_on_cell(p1, p2, hit, eps=1e-6):
+    ix, iy, t = hit
+    x = p1[0] + (p2[0] - p1[0]) * t
+    y = p1[1] + (p2[1] - p1[1]) * t
+    return ix - eps <= x <= ix + 1 + eps and iy - eps <= y <= iy + 1 + eps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--segments', type=int, default=5000, help='segments of each kind per map')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rng = random.Random(args.seed)
+
+    print(f"{'map':<48} {'kind':<7} {'sampled':>9} {'dda':>9} {'dda bits':>9} "
+          f"{'missed':>7} {'extra':>6}  t-check")
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        w, h = img.get_size()
+        grid, _occupied = build_collision_grid(img)
+        bitmap = OccupancyBitmap.from_array(grid)
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        # 130 px: robot side; 600 px: a sensor ray
+        for kind, length in (('hitbox', 130), ('ray', 600)):
+            segments = [random_segment(rng, w, h, length) for _ in range(args.segments)]
+            old_s, old = time_all(check_line_collision_sampled, segments, grid, img)
+            new_s, new = time_all(check_line_collision, segments, grid, img)
+            bit_s, bit = time_all(check_line_collision, segments, bitmap, img)
+            missed = sum(1 for a, b in zip(old, new) if b and not a)
+            extra = sum(1 for a, b in zip(old, new) if a and not b)
+            hits = [raycast_grid(p1, p2, bitmap, w, h) for p1, p2 in segments]
+            t_ok = all(hit is None or hit_on_cell(p1, p2, hit) for (p1, p2), hit in zip(segments, hits))
+            t_ok = t_ok and new == bit
+            print(f"{name:<48} {kind:<7} {old_s * 1e6:>7.1f}us {new_s * 1e6:>7.1f}us "
+                  f"{bit_s * 1e6:>7.1f}us {missed:>7} {extra:>6}  {'ok' if t_ok else 'FAIL'}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
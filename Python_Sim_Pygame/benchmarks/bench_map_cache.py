@@ -0,0 +1,199 @@
+"""
+Benchmark: compiled map cache (World/map_cache.py), cold build vs warm load.
+For every map in World/Obstacles it times a cold compile (empty cache dir),
+a warm load from disk (new process state, memory-mapped arrays) and checks
+that both give the same artifacts as analyzing the images directly. The
+distance field is not part of the cold compile: the 'sdf' column is its build
+on first use, and the next warm load must find it saved in the same entry.
+
+With --check-stale it also copies each map to a temporary directory (with its
+own temporary cache dir), edits the obstacle PNG, the EventMap PNG and the
+JSON one at a time and verifies that each edit changes the key and rebuilds
+the entry instead of serving it stale. The user's World/CompiledMaps is never
+written (checked: its files are unchanged afterwards); the script exits with
+status 1 if any check fails.
+
+Uso:
+    python benchmarks/bench_map_cache.py [--repeat N] [--check-stale]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+from game.collision import build_collision_grid
+from World import map_cache
+from World.map_cache import clear_memory_cache, load_compiled_map
+
+from bench_collision_grid import iter_obstacle_maps, time_call
+
+EVENT_MAP_DIR = os.path.join(PROJECT_ROOT, 'World', 'EventMap')
+
+
+def cold_load(path, cache_dir):
+    """Compile `path` into an empty cache dir."""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    clear_memory_cache()
+    return load_compiled_map(path, EVENT_MAP_DIR, cache_dir=cache_dir)
+
+
+def warm_load(path, cache_dir):
+    """Load `path` from the on-disk cache, bypassing the in-process memo."""
+    clear_memory_cache()
+    compiled = load_compiled_map(path, EVENT_MAP_DIR, cache_dir=cache_dir)
+    # touch the arrays so the memory maps are actually read
+    for array in compiled.arrays.values():
+        int(np.count_nonzero(array))
+    return compiled
+
+
+def first_use_sdf(path, cache_dir):
+    """Build the distance field of a warm-loaded map (saved to its entry)."""
+    clear_memory_cache()
+    compiled = load_compiled_map(path, EVENT_MAP_DIR, cache_dir=cache_dir)
+    return compiled.distance_field
+
+
+def same_artifacts(a, b):
+    if a.key != b.key or a.info != b.info or set(a.arrays) != set(b.arrays):
+        return False
+    return all(np.array_equal(a.arrays[name], b.arrays[name]) for name in a.arrays)
+
+
+def cache_dir_snapshot(cache_dir):
+    """{path: (size, mtime)} of every file under cache_dir."""
+    snapshot = {}
+    for root, _dirs, files in os.walk(cache_dir):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            snapshot[os.path.join(root, name)] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def check_stale(path):
+    """Edit each input of a copied map and check that the entry is rebuilt (all in a temp dir)."""
+    map_name = os.path.splitext(os.path.basename(path))[0]
+    results = []
+    with tempfile.TemporaryDirectory(prefix='map_cache_stale_') as tmp:
+        cache_dir = os.path.join(tmp, map_cache.CACHE_DIR_NAME)
+        obstacle_path = os.path.join(tmp, os.path.basename(path))
+        event_dir = os.path.join(tmp, 'EventMap')
+        os.makedirs(event_dir)
+        shutil.copy(path, obstacle_path)
+        for ext in ('.png', '.json'):
+            src = os.path.join(EVENT_MAP_DIR, map_name + ext)
+            if os.path.isfile(src):
+                shutil.copy(src, os.path.join(event_dir, map_name + ext))
+
+        def load():
+            clear_memory_cache()
+            return load_compiled_map(obstacle_path, event_dir, cache_dir=cache_dir)
+
+        base = load()
+        if load().key != base.key:
+            return [('warm load reuses entry', False)]
+
+        # obstacle PNG: paint a black block, the occupancy must grow
+        img = pygame.image.load(obstacle_path)
+        img.fill((0, 0, 0), pygame.Rect(0, 0, 8, 8))
+        pygame.image.save(img, obstacle_path)
+        edited = load()
+        results.append(('obstacle PNG edit', edited.key != base.key and
+                        np.array_equal(edited.occupancy.to_array(), build_collision_grid(img)[0])))
+
+        # EventMap PNG: move the player spawn marker
+        event_png = os.path.join(event_dir, map_name + '.png')
+        if os.path.isfile(event_png):
+            event_img = pygame.image.load(event_png)
+            event_img.fill((0, 0, 0))
+            event_img.fill((0, 255, 0), pygame.Rect(10, 20, 3, 3))
+            pygame.image.save(event_img, event_png)
+            before = edited.key
+            edited = load()
+            results.append(('EventMap PNG edit', edited.key != before and
+                            edited.player_spawn == (11.0, 21.0)))
+
+        # EventMap JSON: any change invalidates the entry
+        json_path = os.path.join(event_dir, map_name + '.json')
+        metadata = {}
+        if os.path.isfile(json_path):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        metadata['bench_edit'] = True
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        before = edited.key
+        edited = load()
+        results.append(('EventMap JSON edit', edited.key != before))
+
+        manifest = os.path.join(cache_dir, map_name, map_cache.MANIFEST_NAME)
+        with open(manifest, 'r', encoding='utf-8') as f:
+            results.append(('manifest updated', json.load(f)['key'] == edited.key))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs of the warm load (best time is kept)')
+    parser.add_argument('--check-stale', action='store_true',
+                        help='also verify that edited inputs invalidate the entry')
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    cache_dir = tempfile.mkdtemp(prefix='compiled_maps_')
+    failed = 0
+    try:
+        print(f"{'map':<48} {'size':>10} {'cold':>10} {'warm':>10} {'speedup':>8} {'sdf':>10}  match")
+        for path in iter_obstacle_maps():
+            cold_s, cold = time_call(cold_load, path, cache_dir)
+            warm_s, warm = time_call(warm_load, path, cache_dir, repeat=args.repeat)
+            sdf_s, _sdf = time_call(first_use_sdf, path, cache_dir)
+            grid, _occupied = build_collision_grid(pygame.image.load(path).convert())
+            match = same_artifacts(cold, warm) and np.array_equal(warm.occupancy.to_array(), grid)
+            match = match and warm_load(path, cache_dir).has_distance_field
+            name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+            failed += 0 if match else 1
+            print(f"{name:<48} {cold.width:>4}x{cold.height:<5} {cold_s * 1000:>8.1f}ms "
+                  f"{warm_s * 1000:>8.2f}ms {cold_s / max(warm_s, 1e-9):>7.1f}x {sdf_s * 1000:>8.1f}ms  "
+                  f"{'ok' if match else 'MISMATCH'}")
+
+        if args.check_stale:
+            print()
+            user_cache_dir = map_cache.default_cache_dir(EVENT_MAP_DIR)
+            before = cache_dir_snapshot(user_cache_dir)
+            for path in iter_obstacle_maps():
+                results = check_stale(path)
+                failed += sum(1 for _label, ok in results if not ok)
+                status = ', '.join(f"{label}: {'ok' if ok else 'FAIL'}" for label, ok in results)
+                print(f"{os.path.basename(path):<48} {status}")
+            untouched = cache_dir_snapshot(user_cache_dir) == before
+            failed += 0 if untouched else 1
+            print(f"{user_cache_dir} untouched: {'ok' if untouched else 'FAIL'}")
+    finally:
+        clear_memory_cache()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    pygame.quit()
+    if failed:
+        print(f"{failed} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
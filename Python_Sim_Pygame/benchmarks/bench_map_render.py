@@ -0,0 +1,185 @@
+"""
+Benchmark: draw_map frame time at camera scales from 0.25 to 4.0.
+For one map (the largest in World/Obstacles by default, optionally upscaled
+with --map-scale to emulate a large map) and each scale the camera pans
+along a path over the map and reports the average and worst frame of:
+- draw_map_rescaled: the whole map rescaled every frame (previous draw_map);
+- draw_map without tiles: cached scaled copies when zoomed out,
+  viewport-only scaling when zoomed in;
+- draw_map with a MapTileRenderer (mip levels, tiles under the view);
+plus the memory each one kept for that scale. Every frame is compared with
+the baseline on the world view: 'diff' is the share of pixels that differ
+(the tiles sample the map slightly differently at tile edges, and zoomed
+out they use filtered mip levels where the baseline skips pixels). A zoom
+ramp (J/K held, ZOOM_SPEED per frame, camera.scale snapped to
+CAMERA_SCALE_STEP as the zoom keys do) is timed too, with the hit rate of
+the scaled map cache over its zoomed-out frames.
+
+Uso:
+    python benchmarks/bench_map_render.py [--map PATH] [--map-scale K] [--frames N] [--no-baseline]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from Camera.Camera import Camera
+from game.config import (
+    BOTTOM_BAR_HEIGHT, MAX_CAMERA_SCALE, MIN_CAMERA_SCALE, PANEL_WIDTH, SCREEN_H, SCREEN_W, ZOOM_SPEED,
+)
+from game.map_scale_cache import ScaledMapCache, ViewportMapScaler, quantize_scale
+from game.map_tiles import MapTileRenderer
+from game.rendering import draw_map, setup_world_view_rect
+
+from bench_collision_grid import iter_obstacle_maps
+
+SCALES = (0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0)
+
+
+def draw_map_rescaled(screen, map_image, camera, world_view_rect):
+    """
+    Rescale the whole map every frame (the draw_map behaviour before the
+    scale cache and the viewport scaler).
+    """
+    prev_clip = screen.get_clip()
+    screen.set_clip(world_view_rect)
+
+    if hasattr(camera, 'scale') and camera.scale != 1.0:
+        map_w = int(map_image.get_width() * camera.scale)
+        map_h = int(map_image.get_height() * camera.scale)
+        scaled_map = pygame.transform.scale(map_image, (map_w, map_h))
+        screen.blit(scaled_map, (-camera.offset_x * camera.scale, -camera.offset_y * camera.scale))
+    else:
+        screen.blit(map_image, (-camera.offset_x, -camera.offset_y))
+
+    screen.set_clip(prev_clip)
+
+
+class _Target:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+def pan(camera, map_size, i, frames):
+    """Camera following a point on an ellipse around the map center."""
+    w, h = map_size
+    angle = 2.0 * math.pi * i / max(1, frames)
+    camera.update(_Target(w / 2 + w * 0.4 * math.cos(angle), h / 2 + h * 0.4 * math.sin(angle)))
+
+
+def time_frames(draw, screen, map_image, camera, view, scales, frames, reference=None):
+    """Per-frame times (s) of draw(); with `reference`, also the share of view pixels that differ from it."""
+    times = []
+    differing = 0
+    total = 0
+    for scale in scales:
+        camera.scale = scale
+        for i in range(frames):
+            pan(camera, map_image.get_size(), i, frames)
+            screen.fill((0, 0, 0))
+            start = time.perf_counter()
+            draw(screen, map_image, camera, view)
+            times.append(time.perf_counter() - start)
+            if reference is not None:
+                got = pygame.surfarray.array3d(screen.subsurface(view))
+                screen.fill((0, 0, 0))
+                reference(screen, map_image, camera, view)
+                expected = pygame.surfarray.array3d(screen.subsurface(view))
+                differing += int((got != expected).any(axis=2).sum())
+                total += view.width * view.height
+    return times, differing / max(1, total)
+
+
+def summary(times):
+    return f"{sum(times) / len(times) * 1e3:>7.2f} {max(times) * 1e3:>7.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--map', default=None, help='map PNG (default: largest in World/Obstacles)')
+    parser.add_argument('--map-scale', type=int, default=1, help='upscale the map K times (large map)')
+    parser.add_argument('--frames', type=int, default=60, help='frames per scale')
+    parser.add_argument('--no-baseline', action='store_true',
+                        help='time draw_map only (whole-map rescales of large maps need gigabytes)')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    path = args.map or max(iter_obstacle_maps(), key=lambda p: os.path.getsize(p))
+    map_image = pygame.image.load(path).convert()
+    if args.map_scale > 1:
+        w, h = map_image.get_size()
+        map_image = pygame.transform.scale(map_image, (w * args.map_scale, h * args.map_scale))
+    view = setup_world_view_rect(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
+    camera = Camera(view.width, view.height)
+    camera.map_width, camera.map_height = map_image.get_size()
+
+    print(f"map: {os.path.relpath(path, PROJECT_ROOT)} {map_image.get_size()}, view {view.size}")
+    start = time.perf_counter()
+    MapTileRenderer(map_image)
+    print(f"mip levels and tiles built in {(time.perf_counter() - start) * 1e3:.0f} ms")
+    print(f"{'scale':>6}  {'rescaled avg/max ms':>19}  {'scaled avg/max ms':>17} {'diff':>6} {'MiB':>5}  "
+          f"{'tiles avg/max ms':>16} {'diff':>6} {'MiB':>5}")
+    reference = None if args.no_baseline else draw_map_rescaled
+    for scale in SCALES:
+        cache = ScaledMapCache()
+        scaler = ViewportMapScaler()
+        tiles = MapTileRenderer(map_image)
+
+        def scaled(s, m, c, v):
+            draw_map(s, m, c, v, cache=cache, scaler=scaler)
+
+        def tiled(s, m, c, v):
+            draw_map(s, m, c, v, tiles=tiles)
+
+        before = [math.nan]
+        if reference is not None:
+            before, _ = time_frames(draw_map_rescaled, screen, map_image, camera, view, [scale], args.frames)
+        after, diff = time_frames(scaled, screen, map_image, camera, view, [scale], args.frames, reference)
+        tiled_times, tiled_diff = time_frames(tiled, screen, map_image, camera, view, [scale], args.frames,
+                                              reference)
+        if reference is None:
+            diff = tiled_diff = math.nan
+        print(f"{scale:>6.2f}  {summary(before):>19}  {summary(after):>17} {diff:>6.2%} "
+              f"{(cache.nbytes + scaler.nbytes) / 2 ** 20:>5.1f}  {summary(tiled_times):>16} {tiled_diff:>6.2%} "
+              f"{tiles.nbytes / 2 ** 20:>5.1f}")
+
+    # zoom ramp: the zoom level moves every frame, camera.scale in steps
+    ramp = []
+    zoom = MIN_CAMERA_SCALE
+    while zoom < MAX_CAMERA_SCALE:
+        ramp.append(quantize_scale(zoom))
+        zoom += ZOOM_SPEED
+    ramp += ramp[::-1]
+    cache = ScaledMapCache()
+    scaler = ViewportMapScaler()
+    tiles = MapTileRenderer(map_image)
+    before = [math.nan]
+    if reference is not None:
+        before, _ = time_frames(draw_map_rescaled, screen, map_image, camera, view, ramp, 1)
+    after, _ = time_frames(lambda s, m, c, v: draw_map(s, m, c, v, cache=cache, scaler=scaler),
+                           screen, map_image, camera, view, ramp, 1)
+    tiled_times, _ = time_frames(lambda s, m, c, v: draw_map(s, m, c, v, tiles=tiles),
+                                 screen, map_image, camera, view, ramp, 1)
+    print(f"{'ramp':>6}  {summary(before):>19}  {summary(after):>17} {'':>6} "
+          f"{(cache.nbytes + scaler.nbytes) / 2 ** 20:>5.1f}  {summary(tiled_times):>16} {'':>6} "
+          f"{tiles.nbytes / 2 ** 20:>5.1f}")
+    lookups = cache.hits + cache.misses
+    print(f"ramp: {len(ramp)} frames, scaled map cache {cache.hits}/{lookups} hits "
+          f"({cache.hits / max(1, lookups):.0%}), {len(cache)} copies")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: list-of-bytearray collision grid vs bit-packed OccupancyBitmap.
+Reports the memory of each representation and the time of random point,
+span and rectangle queries, and checks that both answer the same. The _q
+rows time the point_query/span_query functions the collision tests use.
+
+Runs on every map in World/Obstacles, or on a synthetic warehouse-like map
+of N x N pixels with --synthetic N (e.g. 10000) to see how it scales.
+
+Uso:
+    python benchmarks/bench_occupancy.py [--queries N] [--synthetic SIZE]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+from game.collision import build_collision_grid
+from World.occupancy import OccupancyBitmap, point_query, span_query
+
+from bench_collision_grid import iter_obstacle_maps
+
+
+def legacy_grid(occupancy):
+    """The pre-NumPy collision grid: one bytearray per row."""
+    return [bytearray(row.tobytes()) for row in occupancy]
+
+
+def legacy_nbytes(grid):
+    return sys.getsizeof(grid) + sum(sys.getsizeof(row) for row in grid)
+
+
+def legacy_span(grid, y, x0, x1):
+    if not 0 <= y < len(grid):
+        return False
+    row = grid[y]
+    return any(row[max(x0, 0):min(x1, len(row) - 1) + 1])
+
+
+def legacy_rect(grid, x0, y0, x1, y1):
+    for y in range(max(y0, 0), min(y1, len(grid) - 1) + 1):
+        if legacy_span(grid, y, x0, x1):
+            return True
+    return False
+
+
+def synthetic_occupancy(size, seed=0):
+    """Shelves and walls on an empty floor, like a warehouse layout."""
+    rng = np.random.default_rng(seed)
+    occupancy = np.zeros((size, size), dtype=np.uint8)
+    occupancy[:8, :] = occupancy[-8:, :] = 1
+    occupancy[:, :8] = occupancy[:, -8:] = 1
+    for _ in range(size // 20):
+        x, y = rng.integers(0, size - 200, size=2)
+        w, h = rng.integers(20, 200, size=2)
+        occupancy[y:y + h, x:x + w] = 1
+    return occupancy
+
+
+def time_queries(fn, queries):
+    start = time.perf_counter()
+    results = [fn(*q) for q in queries]
+    return (time.perf_counter() - start) / max(1, len(queries)), results
+
+
+def bench(name, occupancy, n_queries, rng):
+    height, width = occupancy.shape
+    grid = legacy_grid(occupancy)
+    bitmap = OccupancyBitmap.from_array(occupancy)
+
+    # memory-mapped copy, as loaded from the compiled-map cache
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bits.npy')
+        bitmap.save(path)
+        mapped = OccupancyBitmap.load(path, width)
+
+        points = [(rng.randrange(width), rng.randrange(height)) for _ in range(n_queries)]
+        spans = []
+        rects = []
+        for _ in range(n_queries):
+            x, y = rng.randrange(width), rng.randrange(height)
+            spans.append((y, x, min(x + rng.randrange(1, 64), width - 1)))
+            rects.append((x, y, x + rng.randrange(1, 64), y + rng.randrange(1, 64)))
+
+        rows = [
+            ('point', lambda x, y: bool(grid[y][x]), mapped.is_occupied, points),
+            ('span', lambda y, x0, x1: legacy_span(grid, y, x0, x1), mapped.span_occupied, spans),
+            # as the collision tests call them (coordinates already inside the map)
+            ('point_q', point_query(grid), point_query(mapped), points),
+            ('span_q', span_query(grid), span_query(mapped), spans),
+            ('rect', lambda *r: legacy_rect(grid, *r), mapped.rect_occupied, rects),
+        ]
+        print(f"{name}  {width}x{height}  legacy {legacy_nbytes(grid) / 1e6:.1f} MB  "
+              f"uint8 {occupancy.nbytes / 1e6:.1f} MB  bitmap {bitmap.nbytes / 1e6:.2f} MB")
+        for label, legacy_fn, bitmap_fn, queries in rows:
+            legacy_s, legacy_res = time_queries(legacy_fn, queries)
+            bitmap_s, bitmap_res = time_queries(bitmap_fn, queries)
+            match = legacy_res == bitmap_res
+            print(f"    {label:<7} legacy {legacy_s * 1e9:>8.0f} ns  bitmap {bitmap_s * 1e9:>8.0f} ns  "
+                  f"{'ok' if match else 'MISMATCH'}")
+        del mapped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--queries', type=int, default=20000,
+                        help='random queries of each kind per map')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='benchmark a synthetic SIZE x SIZE map instead of the game maps')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    if args.synthetic:
+        bench(f'synthetic {args.synthetic}', synthetic_occupancy(args.synthetic), args.queries, rng)
+        return
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    for path in iter_obstacle_maps():
+        occupancy, _occupied = build_collision_grid(pygame.image.load(path).convert())
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        bench(name, occupancy, args.queries, rng)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: collision queries on a bit-packed grid with and without the
+8/32/128 px occupancy pyramid (OccupancyBitmap.build_pyramid).
+For every map in World/Obstacles:
+1. Parity: random rays (hitbox sides and 600 px sensor rays) must hit the
+   same cell at the same t, and random wheel polygons must agree.
+2. Per-tick cost: random robot poses are split by their hitbox clearance
+   (distance field) into 'open' (>= 20 px from any wall), 'near' (closer)
+   and 'hit' (colliding); for each group the average time of the map
+   collision test (check_player_collision_with_map, raster backend) and of
+   one swept tick is reported without and with the pyramid.
+
+Uso:
+    python benchmarks/bench_occupancy_pyramid.py [--poses N] [--rays N] [--seed S]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.collision import (
+    check_player_collision_with_map, check_poly_collision, raycast_grid,
+    sweep_player_collision_with_map,
+)
+from World.distance_field import DistanceField
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+from bench_footprint_masks import random_pose
+from bench_line_collision import random_segment
+from bench_poly_collision import wheel_poly
+from bench_swept_collision import make_player
+
+NEAR_PX = 20.0
+GROUPS = ('open', 'near', 'hit')
+
+
+def same_hit(a, b):
+    if a is None or b is None:
+        return a is b
+    return a[:2] == b[:2] and abs(a[2] - b[2]) < 1e-9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--poses', type=int, default=2000, help='random robot poses per map')
+    parser.add_argument('--rays', type=int, default=2000, help='random rays/polygons of each kind per map')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1, 1))
+    rng = random.Random(args.seed)
+
+    print(f"{'map':<48} {'pyramid':>8} {'parity':>7}  "
+          + '  '.join(f"{g + ' (n)':<10} {'test':>15} {'sweep':>15}" for g in GROUPS))
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        w, h = img.get_size()
+        plain = OccupancyBitmap.from_surface(img)
+        fast = OccupancyBitmap(plain.bits, plain.width)
+        start = time.perf_counter()
+        pyramid = fast.build_pyramid()
+        build_ms = (time.perf_counter() - start) * 1e3
+        field = DistanceField.from_occupancy(plain)
+
+        parity = True
+        for length in (130, 600):
+            for _ in range(args.rays):
+                p1, p2 = random_segment(rng, w, h, length)
+                if not same_hit(raycast_grid(p1, p2, plain, w, h), raycast_grid(p1, p2, fast, w, h)):
+                    parity = False
+        for _ in range(args.rays):
+            poly = wheel_poly(rng, w, h)
+            if check_poly_collision(poly, plain, img) != check_poly_collision(poly, fast, img):
+                parity = False
+
+        player = make_player(screen, (w, h), (w / 2, h / 2))
+        stats = {g: [0, 0.0, 0.0, 0.0, 0.0] for g in GROUPS}
+        for _ in range(args.poses):
+            random_pose(player, rng, w, h)
+            pose = player.get_pose()
+            player.makeMovement('forward', step=rng.uniform(1.0, 5.0))
+            end_pose = player.get_pose()
+            clearance = field.footprint_clearance(player)
+            collided = check_player_collision_with_map(player, plain, img)
+            group = 'hit' if collided else ('open' if clearance >= NEAR_PX else 'near')
+            row = stats[group]
+            row[0] += 1
+            for i, grid in enumerate((plain, fast)):
+                start = time.perf_counter()
+                if check_player_collision_with_map(player, grid, img) != collided:
+                    parity = False
+                row[1 + i] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                sweep_player_collision_with_map(player, pose, grid, img)
+                row[3 + i] += time.perf_counter() - start
+                player.set_pose(end_pose)
+
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        cells = []
+        for g in GROUPS:
+            n, test_plain, test_fast, sweep_plain, sweep_fast = stats[g]
+            k = max(n, 1) / 1e6
+            cells.append(f"{g + f' ({n})':<10} {test_plain / k:>6.0f}->{test_fast / k:>5.0f}us "
+                         f"{sweep_plain / k:>6.0f}->{sweep_fast / k:>5.0f}us")
+        print(f"{name:<48} {pyramid.nbytes / 1024:>5.1f}KiB {'ok' if parity else 'FAIL':>7}  "
+              + '  '.join(cells) + f"   (built in {build_ms:.1f} ms)")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
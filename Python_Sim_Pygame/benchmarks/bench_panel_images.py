@@ -0,0 +1,113 @@
+"""
+Benchmark: UIManager.draw with the panel image switching (as the external
+system does over CAN id 0x210), without and with the prefetched, prescaled
+images (ui/panel_images.py).
+- before: each image loaded from disk on its first frame, rescaled every
+  frame (no prefetch, ScaledImageCache that keeps nothing);
+- cached: the folder prefetched at startup (waited for here), scaled once per
+  (id, size, mode).
+Each image id is shown for --hold frames, in a shuffled order, twice.
+'first' is the average draw on the frame an id arrives for the first time
+(before: the disk load), 'again' when it comes back, 'max' the worst frame;
+'diff' the pixels of the panel that differ between the two (expected 0),
+over every id.
+
+Uso:
+    python benchmarks/bench_panel_images.py [--hold N]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+from game.config import BOTTOM_BAR_HEIGHT, PANEL_WIDTH, SCREEN_H, SCREEN_W
+from ui.manager import UIManager
+from ui.panel_images import IMAGE_PATTERN, ScaledImageCache, image_id_for_path
+
+from bench_swept_collision import make_player
+
+
+def make_ui(screen, player, cached):
+    panel_rect = (SCREEN_W - PANEL_WIDTH, SCREEN_H - BOTTOM_BAR_HEIGHT - 120, PANEL_WIDTH, 120)
+    ui = UIManager(screen, panel_rect=panel_rect, player=player, prefetch_images=cached)
+    if cached:
+        ui._prefetcher.join()
+    else:
+        ui._scaled_images = ScaledImageCache(max_entries=0)
+    return ui
+
+
+def run(screen, ui, order, hold):
+    frames, switches = [], []
+    for image_id in order:
+        ui.set_image_id(image_id)
+        for i in range(hold):
+            start = time.perf_counter()
+            ui.draw(screen)
+            elapsed = time.perf_counter() - start
+            frames.append(elapsed)
+            if i == 0:
+                switches.append(elapsed)
+    return frames, switches
+
+
+def panel_pixels(screen, ui, image_id):
+    screen.fill((0, 0, 0))
+    ui.set_image_id(image_id)
+    ui.draw(screen)
+    return pygame.surfarray.array3d(screen.subsurface((SCREEN_W - PANEL_WIDTH, 0, PANEL_WIDTH, SCREEN_H)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hold', type=int, default=10, help='frames each image id is shown')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    player = make_player(screen, (SCREEN_W, SCREEN_H), (SCREEN_W / 2, SCREEN_H / 2))
+    probe = UIManager(screen, player=player, prefetch_images=False)
+    ids = [image_id_for_path(p) for p in sorted(glob.glob(os.path.join(probe.image_dir, IMAGE_PATTERN)))]
+    order = ids[:]
+    random.Random(0).shuffle(order)
+    order = order + order
+
+    print(f"{len(ids)} images, {len(order)} switches, {args.hold} frames each")
+    print(f"{'mode':>8} {'':>7} {'avg ms':>8} {'first ms':>9} {'again ms':>9} {'max ms':>8} "
+          f"{'scaled hits/misses':>19} {'diff':>6}")
+    for mode in ('nearest', 'smooth'):
+        results = {}
+        for label, cached in (('before', False), ('cached', True)):
+            ui = make_ui(screen, player, cached)
+            ui.set_image_scale_mode(mode)
+            frames, switches = run(screen, ui, order, args.hold)
+            results[label] = (ui, frames, switches)
+        diff = 0
+        for image_id in ids:
+            a = panel_pixels(screen, results['before'][0], image_id)
+            b = panel_pixels(screen, results['cached'][0], image_id)
+            diff += int(np.any(a != b, axis=2).sum())
+        for label, (ui, frames, switches) in results.items():
+            stats = ui._scaled_images.stats()
+            first, again = switches[:len(ids)], switches[len(ids):]
+            print(f"{mode:>8} {label:>7} {sum(frames) / len(frames) * 1e3:>8.3f} "
+                  f"{sum(first) / len(first) * 1e3:>9.3f} {sum(again) / len(again) * 1e3:>9.3f} "
+                  f"{max(frames) * 1e3:>8.3f} "
+                  f"{stats['hits']:>9}/{stats['misses']:<9} {diff if label == 'cached' else '':>6}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
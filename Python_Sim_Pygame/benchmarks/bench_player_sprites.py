@@ -0,0 +1,309 @@
+"""
+Benchmark: robot sprite draw time with the robot constantly rotating.
+For each camera scale the robot turns HEADING_SPEED degrees per frame (not a
+whole number, so every 1-degree bucket is visited at varying offsets).
+
+Body outline:
+- before: SRCALPHA surface, draw.rect and rotate every frame
+  (rotated_body_surface);
+- cached: Player._body_sprite (RotatedSpriteCache) and one blit;
+plus the whole Player.draw with the caches, the cache hits/misses and memory.
+'warm' is the cached time once the robot has turned a full circle (every
+bucket seen); zoomed in, a full circle of sprites exceeds the budget and
+the LRU keeps the most recent headings.
+'diff' compares the cached frame with the per-frame render at the quantized
+heading (pixels that differ, expected 0); 'quant' with the render at the
+exact heading (the cost of the 1-degree buckets).
+
+Wheels (the four wheels steered apart, turning with the robot):
+- before: smoothscale and rotate per wheel every frame (rotated_wheel_surface);
+- atlas: Wheel.draw from the shared SpriteAtlas (four blits);
+with 'diff' against the per-frame render at the quantized heading.
+
+Lights (critical alert blinking at BLINK_HZ through blink_alert, one logic
+tick per frame, white lights on):
+- before: one SRCALPHA surface per light, drawn and rotated every frame
+  (draw_lights_unbaked);
+- baked: Player.drawLights, one blit of the cached cluster;
+with 'diff/frame' the differing pixels per sampled frame against the
+per-frame render at the quantized heading (the cluster places each bar
+relative to the robot center, so a bar can land 1 px away). The cluster
+cache is warm only once every heading bucket has been seen with both blink
+states, i.e. after a few turns ('warm' = after the third turn); 'parked'
+is the same blinking with the robot standing still (cache hits).
+
+Uso:
+    python benchmarks/bench_player_sprites.py [--frames N]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.config import SCREEN_H, SCREEN_W
+from Player.lights import LIGHT_LAYOUT, OFF_COLOR, OUTLINE_COLOR, OUTLINE_WIDTH, bar_size
+
+from bench_swept_collision import make_player
+
+SCALES = (0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0)
+HEADING_SPEED = 2.7
+BLINK_HZ = 4
+
+
+def rotated_body_surface(width, height, border, color, heading):
+    """
+    The robot body outline as rendered every frame before the sprite cache
+    (SRCALPHA rectangle border, rotated by -heading).
+    """
+    rect_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(rect_surf, color, (0, 0, width, height), border)
+    return pygame.transform.rotate(rect_surf, -heading)
+
+
+def rotated_wheel_surface(base_surface, size, heading):
+    """
+    A wheel as rendered every frame before the sprite atlas (base surface
+    smoothscaled to `size`, rotated by -heading).
+    """
+    scaled = base_surface
+    if size != base_surface.get_size():
+        scaled = pygame.transform.smoothscale(base_surface, size)
+    return pygame.transform.rotate(scaled, -heading)
+
+
+def draw_lights_unbaked(surface, lights, center, heading, to_screen):
+    """
+    The light bars as drawn every frame before LightClusterRenderer: one
+    SRCALPHA surface per light, rotated by -heading and centered on
+    to_screen(world position).
+    """
+    cx, cy = center
+    theta = math.radians(heading)
+    cos_t = math.cos(theta)
+    sin_t = math.sin(theta)
+    for lx, ly, color, index, size in LIGHT_LAYOUT:
+        rx = lx * cos_t - ly * sin_t
+        ry = lx * sin_t + ly * cos_t
+        width, height = bar_size(size)
+        bar_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(bar_surf, color if lights[index] else OFF_COLOR, (0, 0, width, height))
+        pygame.draw.rect(bar_surf, OUTLINE_COLOR, (0, 0, width, height), OUTLINE_WIDTH)
+        rotated_bar = pygame.transform.rotate(bar_surf, -heading)
+        sx, sy = to_screen(cx + rx, cy + ry)
+        surface.blit(rotated_bar, rotated_bar.get_rect(center=(int(sx), int(sy))).topleft)
+
+
+def body_params(player, scale):
+    sw = max(1, int(round(player.width * scale)))
+    sh = max(1, int(round(player.lenght * scale)))
+    return sw, sh, max(1, int(round(6 * scale)))
+
+
+def blit_centered(screen, sprite, center):
+    screen.blit(sprite, sprite.get_rect(center=center).topleft)
+
+
+def differing(screen, draw_a, draw_b):
+    screen.fill((0, 0, 0))
+    draw_a()
+    a = pygame.image.tostring(screen, 'RGB')
+    screen.fill((0, 0, 0))
+    draw_b()
+    b = pygame.image.tostring(screen, 'RGB')
+    return sum(1 for i in range(0, len(a), 3) if a[i:i + 3] != b[i:i + 3]) if a != b else 0
+
+
+def wheel_size(wheel, scale):
+    return (max(1, int(round(wheel.base_surface.get_width() * scale))),
+            max(1, int(round(wheel.base_surface.get_height() * scale))))
+
+
+def bench_wheels(screen, player, frames):
+    camera = player.camera
+    atlas = player.wheel_sprites
+    steer = (0.0, 30.0, 90.0, 135.0)
+    print(f"{'scale':>6}  {'before us':>9}  {'atlas us':>9}  {'warm us':>9}  {'diff':>5}  "
+          f"{'frames':>6} {'rebuilds':>8} {'KiB':>6}")
+    for scale in SCALES:
+        camera.scale = scale
+        atlas.clear()
+        atlas.hits = atlas.misses = atlas.rebuilds = 0
+        before = cached = warm = 0.0
+        warm_frames = 0
+        turn = int(360.0 / HEADING_SPEED) + 1
+        diff = 0
+        for i in range(frames):
+            player.heading = (i * HEADING_SPEED) % 360.0
+            for wheel, angle in zip(player.wheels, steer):
+                wheel.setPosition(player.getPosition())
+                wheel.heading = (player.heading + angle) % 360.0
+            start = time.perf_counter()
+            for wheel in player.wheels:
+                sprite = rotated_wheel_surface(wheel.base_surface, wheel_size(wheel, scale), wheel.heading)
+                blit_centered(screen, sprite, camera.world_to_screen(wheel.pos))
+            before += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for wheel in player.wheels:
+                wheel.draw(screen, camera)
+            elapsed = time.perf_counter() - start
+            cached += elapsed
+            if i >= turn:
+                warm += elapsed
+                warm_frames += 1
+
+            if i % 20 == 7:
+                def atlas_draw():
+                    for wheel in player.wheels:
+                        wheel.draw(screen, camera)
+
+                def reference():
+                    for wheel in player.wheels:
+                        quantized = atlas.bucket(wheel.heading) * atlas.heading_step
+                        sprite = rotated_wheel_surface(wheel.base_surface, wheel_size(wheel, scale), quantized)
+                        blit_centered(screen, sprite, camera.world_to_screen(wheel.pos))
+
+                diff += differing(screen, atlas_draw, reference)
+
+        stats = atlas.stats()
+        print(f"{scale:>6.2f}  {before / frames * 1e6:>9.1f}  {cached / frames * 1e6:>9.1f}  "
+              f"{warm / max(1, warm_frames) * 1e6:>9.1f}  {diff:>5}  {stats['frames']:>6} "
+              f"{stats['rebuilds']:>8} {stats['nbytes'] / 1024:>6.0f}")
+
+
+def bench_lights(screen, player, frames):
+    camera = player.camera
+    lights = player.light_sprites
+    print(f"{'scale':>6}  {'before us':>9}  {'baked us':>9}  {'warm us':>9}  {'parked us':>9}  "
+          f"{'diff/frame':>10}  {'hits':>6} {'misses':>6} {'KiB':>6}")
+    for scale in SCALES:
+        camera.scale = scale
+        lights.sprites.clear()
+        lights.sprites.hits = lights.sprites.misses = 0
+        before = cached = warm = 0.0
+        warm_frames = 0
+        turn = int(360.0 / HEADING_SPEED) + 1
+        turn *= 3
+        diff = samples = 0
+        player.lights = [False, False, False, True, False]
+        for i in range(frames):
+            player.heading = (i * HEADING_SPEED) % 360.0
+            player.logic_tick_count = i
+            player.blink_alert(BLINK_HZ, 'critico')
+            center = player.getPosition()
+            start = time.perf_counter()
+            draw_lights_unbaked(screen, player.lights, center, player.heading,
+                                lambda x, y: camera.world_to_screen((x, y)))
+            before += time.perf_counter() - start
+
+            start = time.perf_counter()
+            player.drawLights(camera)
+            elapsed = time.perf_counter() - start
+            cached += elapsed
+            if i >= turn:
+                warm += elapsed
+                warm_frames += 1
+
+            if i % 20 == 7:
+                quantized = lights.sprites.bucket(player.heading) * lights.sprites.heading_step
+                diff += differing(screen, lambda: player.drawLights(camera), lambda: draw_lights_unbaked(
+                    screen, player.lights, center, quantized, lambda x, y: camera.world_to_screen((x, y))))
+                samples += 1
+
+        parked = 0.0
+        for i in range(frames):
+            player.logic_tick_count = i
+            player.blink_alert(BLINK_HZ, 'critico')
+            start = time.perf_counter()
+            player.drawLights(camera)
+            parked += time.perf_counter() - start
+
+        stats = lights.stats()
+        print(f"{scale:>6.2f}  {before / frames * 1e6:>9.1f}  {cached / frames * 1e6:>9.1f}  "
+              f"{warm / max(1, warm_frames) * 1e6:>9.1f}  {parked / frames * 1e6:>9.1f}  "
+              f"{diff / max(1, samples):>10.1f}  "
+              f"{stats['hits']:>6} {stats['misses']:>6} {stats['nbytes'] / 1024:>6.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=600, help='frames per scale')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    player = make_player(screen, (SCREEN_W, SCREEN_H), (SCREEN_W / 2, SCREEN_H / 2))
+    camera = player.camera
+    center = (SCREEN_W // 2, SCREEN_H // 2)
+
+    print(f"{'scale':>6}  {'before us':>9}  {'cached us':>9}  {'warm us':>9}  {'draw() ms':>9}  "
+          f"{'diff':>5}  {'quant':>5}  {'hits':>6} {'misses':>6} {'KiB':>6}")
+    for scale in SCALES:
+        camera.scale = scale
+        player.body_sprites.clear()
+        player.body_sprites.hits = player.body_sprites.misses = 0
+        sw, sh, border = body_params(player, scale)
+
+        before = cached = warm = whole = 0.0
+        warm_frames = 0
+        turn = int(360.0 / HEADING_SPEED) + 1
+        diff = quant = 0
+        for i in range(args.frames):
+            player.heading = (i * HEADING_SPEED) % 360.0
+            start = time.perf_counter()
+            blit_centered(screen, rotated_body_surface(sw, sh, border, player.color, player.heading), center)
+            before += time.perf_counter() - start
+
+            start = time.perf_counter()
+            blit_centered(screen, player._body_sprite(sw, sh, border), center)
+            elapsed = time.perf_counter() - start
+            cached += elapsed
+            if i >= turn:
+                warm += elapsed
+                warm_frames += 1
+
+            start = time.perf_counter()
+            player.draw(camera)
+            whole += time.perf_counter() - start
+
+            if i % 20 == 7:
+                quantized = player.body_sprites.bucket(player.heading) * player.body_sprites.heading_step
+                cached_draw = lambda: blit_centered(screen, player._body_sprite(sw, sh, border), center)
+                diff += differing(screen, cached_draw, lambda: blit_centered(
+                    screen, rotated_body_surface(sw, sh, border, player.color, quantized), center))
+                quant += differing(screen, cached_draw, lambda: blit_centered(
+                    screen, rotated_body_surface(sw, sh, border, player.color, player.heading), center))
+
+        stats = player.body_sprites.stats()
+        n = args.frames
+        print(f"{scale:>6.2f}  {before / n * 1e6:>9.1f}  {cached / n * 1e6:>9.1f}  "
+              f"{warm / max(1, warm_frames) * 1e6:>9.1f}  {whole / n * 1e3:>9.2f}  {diff:>5}  {quant:>5}  "
+              f"{stats['hits']:>6} {stats['misses']:>6} {stats['nbytes'] / 1024:>6.0f}")
+
+    print()
+    bench_wheels(screen, player, args.frames)
+
+    print()
+    bench_lights(screen, player, args.frames)
+
+    # size/color change invalidates the cache
+    player.body_sprites.get((1, 1, 1), 0, lambda: pygame.Surface((1, 1)))
+    player.color = (0, 200, 255)
+    player._body_sprite(*body_params(player, camera.scale))
+    print(f"after a color change: {len(player.body_sprites)} sprite(s) cached")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
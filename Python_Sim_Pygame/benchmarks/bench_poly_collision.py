@@ -0,0 +1,118 @@
+"""
+Benchmark: per-pixel point_in_poly vs scanline check_poly_collision.
+Generates random wheel-sized rotated rectangles (the 'wheel' hitbox parts)
+and random, possibly concave or self-intersecting polygons over every map
+in World/Obstacles, checks that both implementations agree on every
+polygon and prints the average time per call.
+
+Uso:
+    python benchmarks/bench_poly_collision.py [--polys N] [--seed S]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.collision import build_collision_grid, check_poly_collision, point_in_poly, point_query
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+
+# Player/Wheels.py wheel hitbox size
+WHEEL_WIDTH = 28
+WHEEL_LENGTH = 10
+
+
+def check_poly_collision_per_pixel(poly, collision_grid, map_image):
+    """
+    Per-pixel polygon test: point_in_poly on every pixel center of the
+    bounding box (the check_poly_collision replaced by the scanline test).
+    """
+    xs = [p[0] for p in poly]
+    ys = [p[1] for p in poly]
+    minx = max(int(math.floor(min(xs))), 0)
+    maxx = min(int(math.ceil(max(xs))), map_image.get_width() - 1)
+    miny = max(int(math.floor(min(ys))), 0)
+    maxy = min(int(math.ceil(max(ys))), map_image.get_height() - 1)
+    is_occupied = point_query(collision_grid)
+
+    for px in range(minx, maxx + 1):
+        for py in range(miny, maxy + 1):
+            world_x = px + 0.5
+            world_y = py + 0.5
+            if point_in_poly(world_x, world_y, poly):
+                map_x = int(world_x)
+                map_y = int(world_y)
+                if not (0 <= map_x < map_image.get_width() and 0 <= map_y < map_image.get_height()):
+                    continue
+                try:
+                    if is_occupied(map_x, map_y):
+                        return True
+                except Exception:
+                    continue
+    return False
+
+
+def wheel_poly(rng, w, h):
+    cx, cy = rng.uniform(-20, w + 20), rng.uniform(-20, h + 20)
+    angle = rng.uniform(0, 2 * math.pi)
+    c, s = math.cos(angle), math.sin(angle)
+    hw, hl = WHEEL_WIDTH / 2, WHEEL_LENGTH / 2
+    return [(cx + x * c - y * s, cy + x * s + y * c)
+            for x, y in ((-hw, -hl), (hw, -hl), (hw, hl), (-hw, hl))]
+
+
+def random_poly(rng, w, h):
+    cx, cy = rng.uniform(0, w), rng.uniform(0, h)
+    n = rng.randint(3, 8)
+    return [(cx + rng.uniform(-40, 40), cy + rng.uniform(-40, 40)) for _ in range(n)]
+
+
+def time_all(fn, polys, grid, img):
+    start = time.perf_counter()
+    results = [fn(poly, grid, img) for poly in polys]
+    return (time.perf_counter() - start) / len(polys), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--polys', type=int, default=3000, help='polygons of each kind per map')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    rng = random.Random(args.seed)
+
+    print(f"{'map':<48} {'kind':<7} {'per-pixel':>11} {'scanline':>11} {'bitmap':>11}  match")
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        w, h = img.get_size()
+        grid, _occupied = build_collision_grid(img)
+        bitmap = OccupancyBitmap.from_array(grid)
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        for kind, make in (('wheel', wheel_poly), ('random', random_poly)):
+            polys = [make(rng, w, h) for _ in range(args.polys)]
+            old_s, old = time_all(check_poly_collision_per_pixel, polys, grid, img)
+            new_s, new = time_all(check_poly_collision, polys, grid, img)
+            bit_s, bit = time_all(check_poly_collision, polys, bitmap, img)
+            match = old == new == bit
+            print(f"{name:<48} {kind:<7} {old_s * 1e6:>9.1f}us {new_s * 1e6:>9.1f}us "
+                  f"{bit_s * 1e6:>9.1f}us  {'ok' if match else 'MISMATCH'}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
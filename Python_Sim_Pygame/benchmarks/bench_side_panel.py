@@ -0,0 +1,141 @@
+"""
+Benchmark: side panel draw time per frame, immediate vs retained
+(game/rendering.py RetainedSidePanel).
+- before: draw_ui_panels, Player.draw_icamento_ui and UIManager.draw every
+  frame, as the main loop did;
+- retained: RetainedSidePanel.draw_chrome + draw (blits, redrawn on a state
+  change).
+Scenarios: 'static' (nothing changes), 'modes' (mode/speed/lights change
+every 30 frames), 'lifting' (icamento cursor moves every frame: drawn
+straight on the screen over the cached chrome, the worst case). 'redraws'
+counts the layer rebuilds, 'immediate' the frames drawn straight. The map under the panel is noise that scrolls every
+frame. 'diff' compares the final screens: panel column and bottom bar
+(expected 0) and the strip of labels over the map ('spill', the antialiased
+edges are blended with alpha instead of drawn on the map; 'max' is the
+largest channel difference). 'dirty' is the share of the screen the main
+loop sends to the display per frame (FramePresenter).
+
+Uso:
+    python benchmarks/bench_side_panel.py [--frames N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+from game.config import BOTTOM_BAR_HEIGHT, PANEL_WIDTH, SCREEN_H, SCREEN_W, SIDE_PANEL_SPILL_PX
+from game.rendering import FramePresenter, RetainedSidePanel, draw_ui_panels, setup_world_view_rect
+from ui.manager import UIManager
+
+from bench_swept_collision import make_player
+
+MODES = ('straight', 'diagonal', 'pivotal', 'icamento')
+SPEEDS = ('lenta', 'média', 'rápida')
+
+
+def set_state(player, scenario, i):
+    if scenario == 'modes':
+        step = i // 30
+        player.curve_mode = MODES[step % len(MODES)]
+        player.speed_mode = SPEEDS[step % len(SPEEDS)]
+        player.lights = [bool((step >> bit) & 1) for bit in range(5)]
+    elif scenario == 'lifting':
+        player.curve_mode = 'icamento'
+        player.icamento_cursor = (i % 100) / 100.0
+
+
+def draw_before(screen, ui, player, mode_text):
+    draw_ui_panels(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
+    player.draw_icamento_ui(screen)
+    ui.draw(screen, mode_text=mode_text)
+    return [screen.get_rect()]
+
+
+def draw_retained(screen, ui, player, mode_text, panel):
+    panel.draw_chrome(screen)
+    return panel.draw(screen, ui, player, mode_text=mode_text)
+
+
+def run(screen, background, ui, player, scenario, frames, panel=None):
+    world = setup_world_view_rect(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
+    presenter = FramePresenter()
+    times = []
+    area = 0
+    for i in range(frames):
+        set_state(player, scenario, i)
+        mode_text = f'Modo: {player.curve_mode}'
+        screen.blit(background, (0, 0), pygame.Rect(i % 97, 0, SCREEN_W, SCREEN_H))
+        start = time.perf_counter()
+        if panel is None:
+            dirty = draw_before(screen, ui, player, mode_text)
+        else:
+            dirty = draw_retained(screen, ui, player, mode_text, panel)
+        times.append(time.perf_counter() - start)
+        bottom = pygame.Rect(0, world.bottom, world.width, SCREEN_H - world.bottom)
+        rects = presenter.present(screen, [world, bottom] + dirty, full=panel is None)
+        area += sum(r.width * r.height for r in rects)
+    return times, area / (frames * SCREEN_W * SCREEN_H)
+
+
+def region_diff(a, b, rect):
+    delta = np.abs(a[rect.x:rect.right, rect.y:rect.bottom] - b[rect.x:rect.right, rect.y:rect.bottom])
+    return int((delta.max(axis=2) > 0).sum()), int(delta.max()) if delta.size else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    rng = np.random.default_rng(0)
+    background = pygame.surfarray.make_surface(
+        rng.integers(0, 256, (SCREEN_W + 100, SCREEN_H, 3), dtype=np.uint8)).convert()
+    player = make_player(screen, (SCREEN_W, SCREEN_H), (SCREEN_W / 2, SCREEN_H / 2))
+    player.camera.width = SCREEN_W - PANEL_WIDTH
+    player.icamento_cursor = 0.6
+    panel_rect = (SCREEN_W - PANEL_WIDTH, SCREEN_H - BOTTOM_BAR_HEIGHT - 120, PANEL_WIDTH, 120)
+    ui = UIManager(screen, panel_rect=panel_rect, player=player)
+
+    ui_x = SCREEN_W - PANEL_WIDTH
+    column = pygame.Rect(ui_x - 1, 0, PANEL_WIDTH + 1, SCREEN_H)
+    bottom = pygame.Rect(0, SCREEN_H - BOTTOM_BAR_HEIGHT, ui_x - 1, BOTTOM_BAR_HEIGHT)
+    spill = pygame.Rect(ui_x - 1 - SIDE_PANEL_SPILL_PX, 0, SIDE_PANEL_SPILL_PX, SCREEN_H)
+
+    print(f"{'scenario':>9} {'before ms':>10} {'retained ms':>12} {'redraws':>8} {'immediate':>9} {'dirty':>6}  "
+          f"{'column':>6} {'bottom':>6} {'spill':>6} {'max':>4}")
+    for scenario in ('static', 'modes', 'lifting'):
+        player.curve_mode, player.speed_mode = 'straight', 'média'
+        player.lights = [False] * 5
+        before, _ = run(screen, background, ui, player, scenario, args.frames)
+        expected = pygame.surfarray.array3d(screen).astype(np.int16)
+
+        player.curve_mode, player.speed_mode = 'straight', 'média'
+        player.lights = [False] * 5
+        panel = RetainedSidePanel()
+        retained, dirty = run(screen, background, ui, player, scenario, args.frames, panel)
+        got = pygame.surfarray.array3d(screen).astype(np.int16)
+
+        column_px, _ = region_diff(got, expected, column)
+        bottom_px, _ = region_diff(got, expected, bottom)
+        spill_px, spill_max = region_diff(got, expected, spill)
+        stats = panel.stats()
+        print(f"{scenario:>9} {sum(before) / len(before) * 1e3:>10.3f} {sum(retained) / len(retained) * 1e3:>12.3f} "
+              f"{stats['redraws']:>8} {stats['immediate']:>9} {dirty:>6.1%}  "
+              f"{column_px:>6} {bottom_px:>6} {spill_px:>6} {spill_max:>4}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
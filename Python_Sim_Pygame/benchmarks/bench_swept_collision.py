@@ -0,0 +1,200 @@
+"""
+Benchmark: discrete (final pose) vs swept map collision per logic tick.
+
+1. Tunneling check: the robot drives at several per-tick steps over a
+   short 1 px wall, straight and along an arc. The discrete test only looks at
+   the final pose and misses the wall once the step is large enough; the
+   swept test must always report the hit and leave the robot at the
+   contact pose (colliding, with no collision earlier along the path),
+   without and with a distance field (conservative advancement).
+2. Cost: random ticks over every map in World/Obstacles, timing
+   check_player_collision_with_map vs sweep_player_collision_with_map with
+   the map's distance field, as the game calls them: mean, and 99th
+   percentile of the swept test over all ticks and over the ticks that hit
+   a wall. The percentiles are thread CPU time (time.thread_time), so the
+   process being preempted does not count; 'wall p99' is the wall-clock
+   one, for reference. The swept p99 of the hit ticks must stay under
+   SWEPT_P99_BUDGET_MS, an eighth of a 60 Hz tick (a frame may run several).
+Exits with status 1 if a tunneling check fails or a p99 exceeds the budget.
+
+Uso:
+    python benchmarks/bench_swept_collision.py [--ticks N] [--seed S]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+from game.collision import (
+    body_motion, build_collision_grid, check_player_collision_with_map, pose_along_motion,
+    sweep_player_collision_with_map,
+)
+from game.config import SWEEP_BISECTION_STEPS
+from game.initialization import init_player_and_camera
+from World.distance_field import DistanceField
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+
+WALL_Y = 300
+# a short 1 px wall: narrower than the track, so once the front edge has
+# jumped over it the wall sits inside the hitbox outline, touching nothing
+WALL_X0, WALL_X1 = 385, 415
+
+SWEPT_P99_BUDGET_MS = 1000.0 / 60.0 / 8
+
+
+def make_player(screen, map_size, pos):
+    player, camera = init_player_and_camera(screen, pos)
+    camera.map_width, camera.map_height = map_size
+    player.setPosition(pos)
+    for wheel in player.wheels:
+        wheel.setPosition(player.getPosition())
+    return player
+
+
+def thin_wall_map(size=(800, 600)):
+    grid = np.zeros((size[1], size[0]), dtype=np.uint8)
+    grid[WALL_Y, WALL_X0:WALL_X1] = 1
+    return grid, pygame.Surface(size)
+
+
+def tick(player, mode, step):
+    """One movement tick: straight ahead, or an arc about an ICR 400 px to the left."""
+    if mode == 'straight':
+        player.makeMovement('forward', step=step)
+        return
+    icr = (player.x - 400.0, player.y)
+    motion = (-step / 400.0, icr, (0.0, 0.0))
+    player.set_pose(pose_along_motion(player.get_pose(), motion, 1.0))
+
+
+def tunneling(screen, mode, step, distance_field=None):
+    """Drive up to the wall, then one tick of `step` px over it."""
+    grid, surface = thin_wall_map()
+    player = make_player(screen, surface.get_size(), (400, WALL_Y + 120))
+    # creep until the next 0.1 px would touch the wall
+    while True:
+        pose = player.get_pose()
+        tick(player, mode, 0.1)
+        if check_player_collision_with_map(player, grid, surface):
+            player.set_pose(pose)
+            break
+    pose = player.get_pose()
+    tick(player, mode, step)
+    end_pose = player.get_pose()
+    discrete = check_player_collision_with_map(player, grid, surface)
+    swept, toi = sweep_player_collision_with_map(player, pose, grid, surface, distance_field=distance_field)
+    contact_ok = True
+    if swept:
+        # stopped at contact: colliding now, and no densely sampled pose
+        # before the time of impact (minus the bisection resolution) collides
+        contact_ok = check_player_collision_with_map(player, grid, surface)
+        motion = body_motion(pose, end_pose)
+        free_until = max(0.0, toi - 1.0 / 2 ** SWEEP_BISECTION_STEPS)
+        for i in range(200):
+            player.set_pose(pose_along_motion(end_pose, motion, free_until * i / 200 - 1.0))
+            if check_player_collision_with_map(player, grid, surface):
+                contact_ok = False
+    return discrete, swept, toi, contact_ok
+
+
+def p99_ms(times):
+    if not times:
+        return 0.0
+    times = sorted(times)
+    return times[max(0, int(len(times) * 0.99) - 1)] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ticks', type=int, default=2000, help='random ticks per map')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1100, 600))
+    rng = random.Random(args.seed)
+
+    failed = 0
+    wall_field = DistanceField.from_occupancy(thin_wall_map()[0])
+    print('Tunneling over a short 1 px wall (one tick):')
+    print(f"    {'mode':<9} {'field':>5} {'step':>5} {'discrete':>9} {'swept':>6} {'toi':>6}  contact")
+    for mode in ('straight', 'curve'):
+        for field in (None, wall_field):
+            for step in (1.0, 2.2, 4.4, 8.0, 20.0, 60.0):
+                discrete, swept, toi, contact_ok = tunneling(screen, mode, step, field)
+                ok = swept and contact_ok
+                failed += not ok
+                print(f"    {mode:<9} {'sdf' if field else '-':>5} {step:>5.1f} "
+                      f"{'hit' if discrete else 'miss':>9} {'hit' if swept else 'miss':>6} {toi:>6.3f}  "
+                      f"{'ok' if ok else 'FAIL'}")
+
+    print()
+    print(f"{'map':<48} {'discrete':>10} {'swept':>10} {'swept p99':>10} {'hit p99':>10} "
+          f"{'wall p99':>10}  hits d/s")
+    for path in iter_obstacle_maps():
+        img = pygame.image.load(path).convert()
+        occupancy = build_collision_grid(img)[0]
+        grid = OccupancyBitmap.from_array(occupancy)
+        field = DistanceField.from_occupancy(occupancy)
+        w, h = img.get_size()
+        player = make_player(screen, (w, h), (w / 2, h / 2))
+        discrete_s = 0.0
+        swept_times = []
+        hit_times = []
+        wall_times = []
+        hits_d = hits_s = 0
+        for _ in range(args.ticks):
+            player.setHeading(rng.uniform(0, 360))
+            player.setPosition((rng.uniform(60, w - 60), rng.uniform(60, h - 60)))
+            for wheel in player.wheels:
+                wheel.setPosition(player.getPosition())
+            pose = player.get_pose()
+            player.makeMovement('forward', step=rng.uniform(1.0, 5.0))
+            end_pose = player.get_pose()
+
+            start = time.perf_counter()
+            hits_d += check_player_collision_with_map(player, grid, img, distance_field=field)
+            discrete_s += time.perf_counter() - start
+
+            start = time.perf_counter()
+            cpu_start = time.thread_time()
+            swept = sweep_player_collision_with_map(player, pose, grid, img, distance_field=field)[0]
+            cpu = time.thread_time() - cpu_start
+            wall_times.append(time.perf_counter() - start)
+            swept_times.append(cpu)
+            if swept:
+                hits_s += 1
+                hit_times.append(cpu)
+            player.set_pose(end_pose)
+
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        p99, hit_p99, wall_p99 = (p99_ms(times) for times in (swept_times, hit_times, wall_times))
+        within = hit_p99 < SWEPT_P99_BUDGET_MS
+        failed += not within
+        print(f"{name:<48} {discrete_s / args.ticks * 1e3:>8.3f}ms "
+              f"{sum(swept_times) / args.ticks * 1e3:>8.3f}ms {p99:>8.2f}ms {hit_p99:>8.2f}ms "
+              f"{wall_p99:>8.2f}ms  {hits_d}/{hits_s}"
+              f"{'' if within else f'  FAIL (p99 > {SWEPT_P99_BUDGET_MS:.2f} ms)'}")
+
+    pygame.quit()
+    if failed:
+        print(f"{failed} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: text drawing per frame with and without the shared font
+registry and text cache (ui/fonts.py).
+Each frame draws what the main loop draws every frame with text: the HUD
+(draw_hud_info, with a changing accelerometer value and clearance), the
+side panel (UIManager.draw), the icamento UI, the collision overlay and the
+trafo badge. 'before' swaps in a registry that calls pygame.font.SysFont on
+every request and a text cache that keeps nothing (the previous behavior);
+'cached' uses the shared ones. Reports the average and worst frame and the
+hit/miss counters (font_stats()).
+
+Outlined text: the labels drawn with an outline, before (the cached glyphs
+blitted once per outline offset, then the text) and with the cached
+outlined surface (one blit), on a noisy background; 'diff' is the share of pixels
+that differ and 'max' the largest channel difference (the outline and the
+text are blended into one surface first, which rounds antialiased edges a
+little differently).
+
+Uso:
+    python benchmarks/bench_text_cache.py [--frames N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+import pygame
+
+import ui.fonts as fonts
+from game.config import BOTTOM_BAR_HEIGHT, PANEL_WIDTH, SCREEN_H, SCREEN_W
+from game.rendering import draw_collision_overlay, draw_hud_info, draw_trafo_carried_badge
+from ui.manager import UIManager
+
+from bench_swept_collision import make_player
+
+
+class _UncachedFonts(fonts.FontRegistry):
+    """pygame.font.SysFont on every request, as before the registry."""
+
+    def get(self, name=None, size=20, bold=False, italic=False):
+        self.misses += 1
+        return pygame.font.SysFont(name, int(size), bold=bool(bold), italic=bool(italic))
+
+
+def frame(screen, player, ui, i):
+    draw_hud_info(screen, player, player.camera, 'keyboard', False, False, i % 120, 120,
+                  clearance_px=10.0 + (i // 6) % 20)
+    ui.draw(screen, mode_text=player.curve_mode)
+    player.draw_icamento_ui(screen)
+    draw_trafo_carried_badge(screen)
+    draw_collision_overlay(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
+
+
+def run(screen, player, ui, frames):
+    times = []
+    for i in range(frames):
+        screen.fill((0, 0, 0))
+        start = time.perf_counter()
+        frame(screen, player, ui, i)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+OUTLINED = (
+    (14, 'VELOCIDADE', (150, 255, 170), 'square'),
+    (16, '250 mm', (228, 255, 228), 'square'),
+    (14, 'ICAMENTO READY', (230, 255, 230), 'cross'),
+    (20, 'Control: KEYBOARD  Zoom: 1.50', (255, 255, 255), 'square'),
+    (28, 'Modo: CURVA', (255, 255, 255), 'square'),
+)
+
+
+def outline_blits(screen, edge, text_surf, pos, shape):
+    """Outline as drawn before: the black glyphs at every offset, then the text."""
+    for dx, dy in fonts.outline_offsets(1, shape):
+        screen.blit(edge, (pos[0] + dx, pos[1] + dy))
+    screen.blit(text_surf, pos)
+
+
+def bench_outlined(screen, frames):
+    rng = np.random.default_rng(0)
+    background = pygame.surfarray.make_surface(rng.integers(0, 256, (400, 60, 3), dtype=np.uint8))
+    cache = fonts.TextCache()
+    print(f"{'text':>30} {'before us':>10} {'cached us':>10} {'diff':>7} {'max':>4}")
+    for size, text, color, shape in OUTLINED:
+        font = fonts.FontRegistry().get(None, size)
+        pos = (10, 10)
+        edge = font.render(text, True, (0, 0, 0))
+        text_surf = font.render(text, True, color)
+        start = time.perf_counter()
+        for _ in range(frames):
+            outline_blits(screen, edge, text_surf, pos, shape)
+        before = (time.perf_counter() - start) / frames
+        start = time.perf_counter()
+        for _ in range(frames):
+            screen.blit(cache.render(font, text, color, outline=((0, 0, 0), 1, shape)), (pos[0] - 1, pos[1] - 1))
+        cached = (time.perf_counter() - start) / frames
+
+        screen.blit(background, (0, 0))
+        outline_blits(screen, edge, text_surf, pos, shape)
+        expected = pygame.surfarray.array3d(screen.subsurface((0, 0, 400, 60))).astype(np.int16)
+        screen.blit(background, (0, 0))
+        screen.blit(cache.render(font, text, color, outline=((0, 0, 0), 1, shape)), (pos[0] - 1, pos[1] - 1))
+        got = pygame.surfarray.array3d(screen.subsurface((0, 0, 400, 60))).astype(np.int16)
+        delta = np.abs(got - expected)
+        print(f"{text:>30} {before * 1e6:>10.1f} {cached * 1e6:>10.1f} {(delta.max(axis=2) > 0).mean():>7.2%} "
+              f"{int(delta.max()):>4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    player = make_player(screen, (SCREEN_W, SCREEN_H), (SCREEN_W / 2, SCREEN_H / 2))
+    player.curve_mode = 'icamento'
+    player.icamento_cursor = 0.6
+    panel_rect = (SCREEN_W - PANEL_WIDTH, SCREEN_H - BOTTOM_BAR_HEIGHT - 120, PANEL_WIDTH, 120)
+    ui = UIManager(screen, panel_rect=panel_rect, player=player)
+
+    results = {}
+    for label, registry, cache in (('before', _UncachedFonts(), fonts.TextCache(max_entries=0)),
+                                   ('cached', fonts.FontRegistry(), fonts.TextCache())):
+        fonts._shared_fonts, fonts._shared_text_cache = registry, cache
+        times = run(screen, player, ui, args.frames)
+        results[label] = (times, fonts.font_stats())
+
+    print(f"{'':>7} {'avg ms':>8} {'max ms':>8}  {'font hits/misses':>16}  {'text hits/misses':>16}")
+    for label, (times, stats) in results.items():
+        print(f"{label:>7} {sum(times) / len(times) * 1e3:>8.3f} {max(times) * 1e3:>8.3f}  "
+              f"{stats['fonts']['hits']:>8}/{stats['fonts']['misses']:<7}  "
+              f"{stats['text']['hits']:>8}/{stats['text']['misses']:<7}")
+    print()
+    bench_outlined(screen, args.frames)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: raster hitbox test vs the vector backend (simplified obstacle
+outlines in a BVH, World/map_vector.py + game.collision.VectorCollider).
+For every map in World/Obstacles, at each map scale (the PNG upscaled with
+nearest neighbour and the hitbox scaled with it, i.e. the same scene at a
+higher resolution) reports:
+- outlines, edges after Douglas-Peucker, BVH nodes and the time to trace them;
+- the average time of check_hitbox_collision_with_map on random poses with
+  the raster test and with the VectorCollider;
+- hit/miss parity: poses where both agree and hits only one of them found
+  (these lie within the outline tolerance of a wall).
+The raster cost grows with the scale (more pixels under the hitbox); the
+vector cost should not.
+
+Uso:
+    python benchmarks/bench_vector_collision.py [--poses N] [--scales 1,2] [--seed S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from game.collision import VectorCollider, check_hitbox_collision_with_map
+from World.map_vector import MapContours
+from World.occupancy import OccupancyBitmap
+
+from bench_collision_grid import iter_obstacle_maps
+from bench_footprint_masks import random_pose
+from bench_swept_collision import make_player
+
+
+def scale_parts(parts, k):
+    return [(kind, [(x * k, y * k) for x, y in data]) for kind, data in parts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--poses', type=int, default=3000, help='random poses per map and scale')
+    parser.add_argument('--scales', default='1,2', help='comma separated map scales')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+
+    pygame.init()
+    screen = pygame.display.set_mode((1, 1))
+
+    print(f"{'map':<44} {'scale':>5} {'outlines':>8} {'edges':>6} {'nodes':>6} {'trace':>7} "
+          f"{'raster':>9} {'vector':>9} {'agree':>7} {'raster-only':>11} {'vector-only':>11}")
+    for path in iter_obstacle_maps():
+        base = pygame.image.load(path).convert()
+        w, h = base.get_size()
+        name = os.path.relpath(path, os.path.join(PROJECT_ROOT, 'World', 'Obstacles'))
+        for k in scales:
+            img = base if k == 1 else pygame.transform.scale(base, (w * k, h * k))
+            grid = OccupancyBitmap.from_surface(img)
+            grid.build_pyramid()
+
+            start = time.perf_counter()
+            contours = MapContours.from_occupancy(grid)
+            collider = VectorCollider(contours, grid, img)
+            trace_s = time.perf_counter() - start
+
+            # same poses at every scale
+            rng = random.Random(args.seed)
+            player = make_player(screen, (w, h), (w / 2, h / 2))
+            raster_s = vector_s = 0.0
+            agree = raster_only = vector_only = 0
+            for _ in range(args.poses):
+                random_pose(player, rng, w, h)
+                parts = scale_parts(player.get_rotated_hitbox(), k)
+
+                start = time.perf_counter()
+                raster = check_hitbox_collision_with_map(parts, grid, img)
+                raster_s += time.perf_counter() - start
+
+                start = time.perf_counter()
+                vector = check_hitbox_collision_with_map(parts, grid, img, collider)
+                vector_s += time.perf_counter() - start
+
+                if raster == vector:
+                    agree += 1
+                elif raster:
+                    raster_only += 1
+                else:
+                    vector_only += 1
+
+            print(f"{name:<44} {k:>4}x {len(contours):>8} {contours.edge_count:>6} "
+                  f"{collider.bvh.node_count:>6} {trace_s:>6.2f}s "
+                  f"{raster_s / args.poses * 1e6:>7.1f}us {vector_s / args.poses * 1e6:>7.1f}us "
+                  f"{agree / args.poses:>7.2%} {raster_only:>11} {vector_only:>11}")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
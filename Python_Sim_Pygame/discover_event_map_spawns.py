@@ -9,45 +9,8 @@ Uso:
 import os
 import json
 import pygame
-from typing import Tuple, Optional
 
-
-def find_green_center(img) -> Optional[Tuple[float, float]]:
-    """
-    Finds the centroid of green pixels (player spawn point).
-    Green is defined as: g >= 200, r < 100, b < 100
-    """
-    w, h = img.get_width(), img.get_height()
-    totx = toty = count = 0
-    for y in range(h):
-        for x in range(w):
-            r, g, b, *rest = img.get_at((x, y))
-            if g >= 200 and r < 100 and b < 100:
-                totx += x
-                toty += y
-                count += 1
-    if count == 0:
-        return None
-    return (totx / count, toty / count)
-
-
-def find_blue_center(img) -> Optional[Tuple[float, float]]:
-    """
-    Finds the centroid of blue pixels (trafo spawn point).
-    Blue is defined as: b > max(r,g) + 30 and b > 80
-    """
-    w, h = img.get_width(), img.get_height()
-    totx = toty = count = 0
-    for y in range(h):
-        for x in range(w):
-            r, g, b, *rest = img.get_at((x, y))
-            if b > max(r, g) + 30 and b > 80:
-                totx += x
-                toty += y
-                count += 1
-    if count == 0:
-        return None
-    return (totx / count, toty / count)
+from World.map_raster import LABEL_BLUE, LABEL_GREEN, analyze_map
 
 
 def discover_and_update_event_maps():
@@ -80,9 +43,10 @@ def discover_and_update_event_maps():
             # Carregar imagem
             img = pygame.image.load(image_path).convert()
             
-            # Descobrir spawn points
-            green = find_green_center(img)
-            blue = find_blue_center(img)
+            # Descobrir spawn points (uma única passada sobre a imagem)
+            analysis = analyze_map(img, labels=LABEL_GREEN | LABEL_BLUE)
+            green = analysis.green_center
+            blue = analysis.blue_center
             
             # Criar/atualizar JSON
             if os.path.exists(json_path):
@@ -10,6 +10,9 @@ BASE_SCREEN_W = 800
 BASE_SCREEN_H = 600
 SCREEN_W = BASE_SCREEN_W + PANEL_WIDTH
 SCREEN_H = BASE_SCREEN_H
+# Side panel labels may stick out this far into the world view (retained
+# side panel, game/rendering.py RetainedSidePanel)
+SIDE_PANEL_SPILL_PX = 48
 
 # Game settings
 DEFAULT_HARDCORE_MODE = False
@@ -23,7 +26,11 @@ DEFAULT_SPAWN_POINT = (200, 200)
 MIN_CAMERA_SCALE = 0.25
 MAX_CAMERA_SCALE = 4.0
 ZOOM_SPEED = 0.04
+CAMERA_SCALE_STEP = 1 / 16        # camera.scale snaps to these steps, so draw_map reuses its scaled map copies
 DEFAULT_CAMERA_SCALE = 1.0
+MAP_SCALE_CACHE_BUDGET_MB = 96    # zoomed map copies kept by draw_map (game/map_scale_cache.py)
+MAP_TILE_SIZE = 256               # map tile size of the mipmapped renderer (game/map_tiles.py)
+MAP_TILE_CACHE_BUDGET_MB = 32     # scaled map tiles kept between frames
 
 # Trafo settings
 TRAFO_SIZE = 60
@@ -45,6 +52,30 @@ ICAMENTO_CRITICO_THRESHOLD_MM = 400
 # Game loop settings
 TARGET_FPS = 60
 
+# Swept (continuous) map collision between logic ticks
+SWEEP_MAX_STEP_PX = 8.0       # max hitbox displacement per substep (< wheel hitbox thickness, 10 px)
+SWEEP_MAX_SUBSTEPS = 8        # cap on substeps per tick before bisection
+SWEEP_BISECTION_STEPS = 4     # refinement steps of the time of impact
+SWEEP_MAX_TESTS = 6           # hard cap on hitbox tests per tick; then the hit found so far is kept
+
+# Map collision backend: 'raster' (per-part geometry on the grid), 'mask'
+# (precomputed pygame.mask footprints, game/footprint.py) or 'vector'
+# (simplified obstacle outlines + BVH, World/map_vector.py). A map can pick
+# its own with "collision_backend" in its EventMap JSON. 'mask' is
+# conservative (may report a hit up to ~2 px before the wall), so the exact
+# geometric test stays the default.
+COLLISION_BACKENDS = ('raster', 'mask', 'vector')
+COLLISION_BACKEND = 'raster'          # default backend
+
+# Precomputed pygame.mask hitbox footprints (game/footprint.py)
+FOOTPRINT_HEADING_STEP_DEG = 0.5      # heading quantization of the cached footprints
+FOOTPRINT_SIZE_STEP_PX = 0.5          # wheel/segment size quantization of the cache keys
+FOOTPRINT_MAP_MASK_MAX_PX = 4096 * 4096  # larger maps fall back to the geometric test (the map mask is not memory-mapped)
+
+# Near-miss warning on the HUD (hitbox clearance from the distance field)
+PROXIMITY_WARNING_PX = 20
+PROXIMITY_CRITICAL_PX = 8
+
 # UI Colors
 COLOR_BG_LIGHT = (236, 243, 252)
 COLOR_BORDER = (190, 206, 225)
@@ -57,6 +88,31 @@ COLOR_SKY_BLUE = (220, 230, 255)
 CAN_MOVEMENT_NEUTRAL = 30000  # neutral position for CAN movement (0-60000)
 CAN_MOVEMENT_MAX = 60000
 CAN_MOVEMENT_MIN = 0
+# How the CAN joystick is read (Player/Joystick.py): 'poll' drains the bus
+# once per frame from the main loop; 'notifier' decodes every frame on a
+# reader thread as it arrives (the logic tick reads the latest snapshot).
+# 'notifier' moves the decoding off the main loop but gives no input latency
+# gain: the logic ticks run right after poll() either way
+CAN_READER_MODE = 'poll'
+# How the simulator frames (inclinometer 0x220, traction 0x222) are sent:
+# 'sync' calls bus.send() in the logic tick; 'scheduler' hands the latest
+# value per id to a TX thread that sends it at CAN_TX_RATE_HZ when it changes,
+# and again every CAN_TX_HEARTBEAT_S while it holds
+CAN_TX_MODE = 'scheduler'
+CAN_TX_RATE_HZ = 60.0
+CAN_TX_HEARTBEAT_S = 0.1
+# Virtual CAN stand-in (Player/can_injector.py): a python-can 'virtual'
+# channel name to read the joystick from instead of the PCAN adapter, fed by
+# an injector thread at CAN_VIRTUAL_RATE_HZ (None: the real adapter)
+CAN_VIRTUAL_CHANNEL = None
+CAN_VIRTUAL_RATE_HZ = 100.0
+
+# Input latency instrumentation (game/latency.py): F3 shows the overlay, F4
+# writes the samples to LATENCY_CSV_DIR
+LATENCY_WINDOW = 1000        # samples behind the p50/p95/p99 of the overlay
+LATENCY_MAX_SAMPLES = 20000  # samples kept for the CSV export
+LATENCY_STALE_S = 0.5        # decoded frames no logic tick used for this long are dropped
+LATENCY_CSV_DIR = 'LatencyLogs'
 
 # Control modes
 CONTROL_MODE_KEYBOARD = 'keyboard'
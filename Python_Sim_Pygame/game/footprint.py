@@ -0,0 +1,275 @@
+"""
+Footprint module - Cached pygame.mask footprints of the robot hitbox.
+
+The hitbox parts never change shape, only pose: a wheel is always the same
+rotated rectangle and the body edges/sides always have the same length. Each
+part shape is rasterized once per quantized heading
+(FOOTPRINT_HEADING_STEP_DEG) into a pygame.mask.Mask, with the same pixel
+rules as the geometric tests (pixel centers for wheel polygons, grid
+traversal for segments). A collision test is then one C-level Mask.overlap
+per part against a mask of the map, at the part's integer offset.
+
+The wheels steer independently of the body, so footprints are cached per
+part shape rather than per robot pose. The quantization moves a part by up
+to half a heading step on its half length, half a size step and the half
+pixel lost by the integer offset; the footprints are grown by that bound
+(plus half a cell diagonal for segments, which the grid traversal tests
+cell by cell), so they are conservative: every hit of
+check_hitbox_collision_with_map is a hit here too, and a hit here lies at
+most about two pixels from the wall.
+"""
+
+import math
+import pygame
+
+from World.map_raster import np
+from World.occupancy import OccupancyBitmap
+from game.collision import check_hitbox_collision_with_map
+from game.config import FOOTPRINT_HEADING_STEP_DEG, FOOTPRINT_MAP_MASK_MAX_PX, FOOTPRINT_SIZE_STEP_PX
+
+
+# Grid rows converted per band when building a map mask (bounds temporary memory)
+MAP_MASK_BAND_ROWS = 256
+
+# half a pixel per axis: the integer offset of a footprint
+_OFFSET_SLACK = math.sqrt(0.5)
+
+
+def mask_nbytes(mask):
+    """Approximate memory of a pygame mask (rows of 64-bit words)."""
+    width, height = mask.get_size()
+    return ((width + 63) // 64) * 8 * height
+
+
+def build_map_mask(collision_grid, band_rows=MAP_MASK_BAND_ROWS, max_pixels=FOOTPRINT_MAP_MASK_MAX_PX):
+    """
+    pygame.mask.Mask with the occupied cells of any collision grid flavour
+    (OccupancyBitmap, (height, width) array or list of rows) set.
+    Raises ValueError for maps of more than `max_pixels` pixels: the mask
+    holds the whole map, unlike the memory-mapped bitmap.
+    """
+    if isinstance(collision_grid, OccupancyBitmap):
+        width, height = collision_grid.width, collision_grid.height
+
+        def band(y0, y1):
+            return np.unpackbits(collision_grid.bits[y0:y1], axis=1, count=width)
+    else:
+        height = len(collision_grid)
+        width = len(collision_grid[0]) if height else 0
+
+        def band(y0, y1):
+            return np.asarray(collision_grid[y0:y1], dtype=np.uint8)
+
+    if width * height > max_pixels:
+        raise ValueError(f"{width}x{height} map exceeds the map mask limit of {max_pixels} px")
+
+    mask = pygame.mask.Mask((width, height))
+    if np is None:
+        # no NumPy: set the occupied cells one by one
+        for y in range(height):
+            for x in range(width):
+                if collision_grid[y][x]:
+                    mask.set_at((x, y))
+        return mask
+
+    for y0 in range(0, height, band_rows):
+        rows = band(y0, min(y0 + band_rows, height))
+        # opaque where occupied: from_surface keeps pixels with alpha > 127
+        rgba = np.repeat((rows != 0).astype(np.uint8) * 255, 4, axis=1)
+        surface = pygame.image.frombuffer(rgba.tobytes(), (width, rows.shape[0]), 'RGBA')
+        mask.draw(pygame.mask.from_surface(surface, 127), (0, y0))
+    return mask
+
+
+class FootprintCache:
+    """
+    Masks of the hitbox part shapes keyed by (kind, quantized size, quantized
+    heading). Wheel rectangles and segments are symmetric about their
+    center, so headings are folded into [0, 180). Each mask is centered on
+    pixel (k, k): a part centered at world (cx, cy) sits at the integer
+    offset (floor(cx) - k, floor(cy) - k).
+    """
+
+    def __init__(self, heading_step=FOOTPRINT_HEADING_STEP_DEG, size_step=FOOTPRINT_SIZE_STEP_PX):
+        self.heading_step = float(heading_step)
+        self.size_step = float(size_step)
+        self._buckets = max(1, int(round(180.0 / self.heading_step)))
+        # key scales (radians -> buckets, pixels -> size steps)
+        self._heading_scale = 180.0 / math.pi / self.heading_step
+        self._size_scale = 1.0 / self.size_step
+        self._masks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._masks)
+
+    @property
+    def nbytes(self):
+        return sum(mask_nbytes(mask) for mask, _k in self._masks.values())
+
+    def stats(self):
+        return {'entries': len(self._masks), 'hits': self.hits, 'misses': self.misses,
+                'nbytes': self.nbytes}
+
+    def clear(self):
+        self._masks.clear()
+        self.hits = self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def wheel_footprint(self, poly):
+        """(mask, offset) of a wheel polygon from Wheel.get_rotated_wheel_hitbox()."""
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = poly
+        size_scale = self._size_scale
+        key = ('wheel', int(round(math.hypot(x1 - x0, y1 - y0) * size_scale)),
+               int(round(math.hypot(x2 - x1, y2 - y1) * size_scale)),
+               int(round(math.atan2(y1 - y0, x1 - x0) * self._heading_scale)) % self._buckets)
+        return self._lookup(key, (x0 + x1 + x2 + x3) * 0.25, (y0 + y1 + y2 + y3) * 0.25)
+
+    def segment_footprint(self, p1, p2):
+        """(mask, offset) of an 'edge'/'side' hitbox segment."""
+        dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+        key = ('segment', int(round(math.hypot(dx, dy) * self._size_scale)),
+               int(round(math.atan2(dy, dx) * self._heading_scale)) % self._buckets)
+        return self._lookup(key, (p1[0] + p2[0]) * 0.5, (p1[1] + p2[1]) * 0.5)
+
+    def warm(self, parts):
+        """Build the footprints of every heading bucket for these hitbox parts."""
+        for kind, data in parts:
+            if kind == 'wheel' and len(data) == 4:
+                (x0, y0), (x1, y1), (x2, y2) = data[0], data[1], data[2]
+                sizes = (self._size_key(math.hypot(x1 - x0, y1 - y0)),
+                         self._size_key(math.hypot(x2 - x1, y2 - y1)))
+            elif kind in ('edge', 'line', 'side'):
+                (x0, y0), (x1, y1) = data
+                kind = 'segment'
+                sizes = (self._size_key(math.hypot(x1 - x0, y1 - y0)),)
+            else:
+                continue
+            for bucket in range(self._buckets):
+                key = (kind,) + sizes + (bucket,)
+                if key not in self._masks:
+                    self._masks[key] = self._build(key)
+
+    def _size_key(self, size):
+        return int(round(size * self._size_scale))
+
+    def _lookup(self, key, cx, cy):
+        entry = self._masks.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._masks[key] = self._build(key)
+        else:
+            self.hits += 1
+        mask, k = entry
+        return mask, (math.floor(cx) - k, math.floor(cy) - k)
+
+    # ------------------------------------------------------------------
+    # Rasterization (conservative: covers the pixels the geometric tests
+    # can reach from any pose of the key)
+    # ------------------------------------------------------------------
+    def slack(self, radius):
+        """
+        Farthest a point `radius` px from a part center can sit from its
+        footprint: integer offset (half a pixel per axis), half a heading
+        step and half a size step.
+        """
+        return (_OFFSET_SLACK + radius * math.sin(math.radians(self.heading_step / 2.0))
+                + self.size_step / 2.0)
+
+    def _build(self, key):
+        kind, sizes, bucket = key[0], key[1:-1], key[-1]
+        theta = math.radians(bucket * self.heading_step)
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+
+        if kind == 'wheel':
+            # pixel centers inside the polygon: centers within `reach` of the rectangle
+            hw = sizes[0] * self.size_step / 2.0
+            hl = sizes[1] * self.size_step / 2.0
+            reach = self.slack(math.hypot(hw, hl))
+        else:
+            # cells the segment crosses: cell centers within reach + half a
+            # diagonal of the segment
+            hw = sizes[0] * self.size_step / 2.0
+            hl = 0.0
+            reach = self.slack(hw) + _OFFSET_SLACK
+        k = int(math.ceil(math.hypot(hw, hl) + reach)) + 1
+        size = 2 * k + 1
+        mask = pygame.mask.Mask((size, size))
+        # pixel px has its center at px + 0.5, the part center is at k + 0.5
+        if np is not None:
+            d = np.arange(size, dtype=np.float64) - k
+            dx, dy = d[np.newaxis, :], d[:, np.newaxis]
+            u = np.maximum(np.abs(dx * cos_t + dy * sin_t) - hw, 0.0)
+            v = np.maximum(np.abs(dy * cos_t - dx * sin_t) - hl, 0.0)
+            for py, px in np.argwhere(u * u + v * v <= reach * reach):
+                mask.set_at((int(px), int(py)))
+            return mask, k
+        for py in range(size):
+            for px in range(size):
+                dx, dy = px - k, py - k
+                u = max(abs(dx * cos_t + dy * sin_t) - hw, 0.0)
+                v = max(abs(dy * cos_t - dx * sin_t) - hl, 0.0)
+                if u * u + v * v <= reach * reach:
+                    mask.set_at((px, py))
+        return mask, k
+
+
+# Part shapes do not depend on the map: every collider shares one cache
+_shared_cache = FootprintCache()
+
+
+def shared_footprint_cache():
+    return _shared_cache
+
+
+class FootprintCollider:
+    """
+    Mask-based hitbox test for one map. Pass it as `footprints` to
+    check_hitbox_collision_with_map / sweep_player_collision_with_map.
+    Parts without a cached footprint (e.g. the swept quads) fall back to the
+    geometric test on the collision grid.
+    """
+
+    def __init__(self, collision_grid, map_image, cache=None):
+        self.collision_grid = collision_grid
+        self.map_image = map_image
+        self.map_mask = build_map_mask(collision_grid)
+        self.cache = cache if cache is not None else _shared_cache
+
+    @property
+    def nbytes(self):
+        return mask_nbytes(self.map_mask)
+
+    def hitbox_collides(self, parts):
+        map_mask = self.map_mask
+        cache = self.cache
+        for kind, data in parts:
+            try:
+                if kind == 'wheel' and len(data) == 4:
+                    mask, offset = cache.wheel_footprint(data)
+                elif kind in ('edge', 'line', 'side'):
+                    mask, offset = cache.segment_footprint(*data)
+                else:
+                    if check_hitbox_collision_with_map([(kind, data)], self.collision_grid, self.map_image):
+                        return True
+                    continue
+                if map_mask.overlap(mask, offset) is not None:
+                    return True
+            except Exception:
+                # safe fallback: ignore this part on error
+                continue
+        return False
+
+
+def make_footprint_collider(backend, collision_grid, map_image):
+    """FootprintCollider for the 'mask' backend, None for the geometric one."""
+    if backend != 'mask':
+        return None
+    try:
+        return FootprintCollider(collision_grid, map_image)
+    except Exception as e:
+        print(f"[Footprint] Backend de máscaras indisponível, usando geometria: {e}")
+        return None
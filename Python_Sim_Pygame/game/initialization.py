@@ -5,19 +5,31 @@ Loads resources, initializes objects, and sets up the game state.
 
 import pygame
 import os
+import threading
 from .config import (
     SCREEN_W, SCREEN_H, PANEL_WIDTH, BOTTOM_BAR_HEIGHT,
     DEFAULT_SPAWN_POINT, TRAFO_SIZE, CONTROL_MODE_KEYBOARD,
-    CONTROL_MODE_JOYSTICK, DEFAULT_TTC_CONTROL,
+    CONTROL_MODE_JOYSTICK, DEFAULT_TTC_CONTROL, COLLISION_BACKEND, COLLISION_BACKENDS,
+    CAN_READER_MODE, CAN_TX_MODE, CAN_TX_RATE_HZ, CAN_TX_HEARTBEAT_S,
+    CAN_VIRTUAL_CHANNEL, CAN_VIRTUAL_RATE_HZ,
 )
-from .collision import find_green_center, find_blue_center, build_collision_grid
+from .collision import (
+    find_green_center, find_blue_center, build_collision_grid, make_vector_collider,
+)
+from .footprint import make_footprint_collider
+from .map_tiles import MapTileRenderer
+from .latency import shared_latency_tracer
 from World.World import World as world
+from World.map_raster import np
+from World.map_vector import MapContours
+from World.occupancy import OccupancyBitmap
 from World.Dialogue import DialogueManager
 from World.Trafo import Trafo
 from World.EventMapManager import EventMapManager
 from Player.Player import Player
 from Camera.Camera import Camera
 from Player.Joystick import Joystick as JoystickController
+from Player.can_injector import JoystickInjector, open_virtual_bus
 
 
 def init_pygame():
@@ -37,6 +49,15 @@ def init_pygame():
     return screen
 
 
+def load_map_tiles(map_image):
+    """Tiled, mipmapped renderer of the map image (None: draw_map scales the image)."""
+    try:
+        return MapTileRenderer(map_image)
+    except Exception as e:
+        print(f"[Init] Erro ao montar os tiles do mapa: {e}")
+        return None
+
+
 def load_map(selected_map_path=None):
     """Load the game map image."""
     if selected_map_path:
@@ -56,7 +77,7 @@ def infer_dialogue_phase_from_map(path):
         return 'Mapa Tutorial Alertas de Inclinação'
 
 
-def init_dialogue_manager(project_root, map_path, map_image):
+def init_dialogue_manager(project_root, map_path, map_image, compiled_map=None):
     """Initialize the dialogue manager."""
     dialogue_phase = infer_dialogue_phase_from_map(map_path)
     
@@ -65,9 +86,109 @@ def init_dialogue_manager(project_root, map_path, map_image):
         obstacle_map_path=map_path,
         obstacle_map_size=map_image.get_size(),
         phase=dialogue_phase,
+        compiled_map=compiled_map,
     )
 
 
+def load_collision_grid(compiled_map, map_image):
+    """
+    Return (collision_grid, occupied_pixels). The grid is the bit-packed,
+    memory-mapped OccupancyBitmap of the compiled map cache when it matches the
+    loaded map, and a bitmap packed from the map image otherwise (the uint8
+    grid when NumPy is missing). Bitmaps get their occupancy pyramid here, so
+    collision queries over free space stop at the coarse levels.
+    """
+    grid = None
+    if compiled_map is not None and compiled_map.occupancy is not None:
+        if (compiled_map.width, compiled_map.height) == map_image.get_size():
+            grid, occupied_pixels = compiled_map.occupancy, compiled_map.occupied_pixels
+    if grid is None:
+        grid, occupied_pixels = build_collision_grid(map_image)
+        if np is not None and isinstance(grid, np.ndarray):
+            grid = OccupancyBitmap.from_array(grid)
+    if isinstance(grid, OccupancyBitmap):
+        try:
+            grid.build_pyramid()
+        except Exception as e:
+            print(f"[Init] Erro ao construir a pirâmide de ocupação: {e}")
+    return grid, occupied_pixels
+
+
+class PendingDistanceField:
+    """
+    Builds the DistanceField of a compiled map on a daemon thread (cold or
+    stale cache entry), so loading the map does not wait for it. result()
+    is None until it is ready; the collision and proximity code run without
+    the clearance early-outs meanwhile.
+    """
+
+    def __init__(self, compiled_map):
+        self._result = None
+        self._thread = threading.Thread(target=self._run, args=(compiled_map,),
+                                        name='sdf-build', daemon=True)
+        self._thread.start()
+
+    def _run(self, compiled_map):
+        try:
+            self._result = compiled_map.distance_field
+        except Exception as e:
+            print(f"[Init] Erro ao construir o campo de distância: {e}")
+
+    def result(self):
+        return self._result
+
+
+def load_distance_field(compiled_map, map_image):
+    """
+    (DistanceField, pending) of the compiled map: the field when the cache
+    entry already has it, else None and a PendingDistanceField building it.
+    Both are None when it is unavailable or does not match the loaded map image.
+    """
+    try:
+        if compiled_map is not None and (compiled_map.width, compiled_map.height) == map_image.get_size():
+            if compiled_map.has_distance_field:
+                return compiled_map.distance_field, None
+            return None, PendingDistanceField(compiled_map)
+    except Exception:
+        pass
+    return None, None
+
+
+def select_collision_backend(event_map):
+    """Collision backend of the map: its EventMap JSON choice, else COLLISION_BACKEND."""
+    backend = None
+    try:
+        backend = event_map.get_collision_backend()
+    except Exception:
+        pass
+    if backend is None:
+        return COLLISION_BACKEND
+    if backend not in COLLISION_BACKENDS:
+        print(f"[Init] Backend de colisão desconhecido '{backend}', usando '{COLLISION_BACKEND}'")
+        return COLLISION_BACKEND
+    return backend
+
+
+def load_part_collider(backend, compiled_map, collision_grid, map_image):
+    """
+    Part collider for check_hitbox_collision_with_map: cached mask
+    footprints for 'mask', outline BVH for 'vector' (contours of the
+    compiled map, traced from the grid when it does not match the loaded
+    map), None for the per-part raster test.
+    """
+    if backend != 'vector':
+        return make_footprint_collider(backend, collision_grid, map_image)
+    contours = None
+    try:
+        if compiled_map is not None and (compiled_map.width, compiled_map.height) == map_image.get_size():
+            contours = compiled_map.contours
+        if contours is None:
+            contours = MapContours.from_occupancy(collision_grid)
+    except Exception as e:
+        print(f"[Init] Erro ao vetorizar os obstáculos: {e}")
+    return make_vector_collider(contours, collision_grid, map_image)
+
+
 def init_player_and_camera(screen, spawn_point):
     """Initialize player and camera objects."""
     camera = Camera(max(1, SCREEN_W - PANEL_WIDTH), max(1, SCREEN_H - BOTTOM_BAR_HEIGHT))
@@ -88,8 +209,23 @@ def init_trafo(event_map, spawn_point):
 
 
 def init_joystick_controller(ui):
-    """Initialize joystick controller."""
-    joystick_controller = JoystickController(ui)
+    """Initialize joystick controller (on the virtual CAN stand-in if CAN_VIRTUAL_CHANNEL is set)."""
+    bus = None
+    injector = None
+    if CAN_VIRTUAL_CHANNEL:
+        try:
+            bus = open_virtual_bus(CAN_VIRTUAL_CHANNEL)
+            injector = JoystickInjector(CAN_VIRTUAL_CHANNEL, rate_hz=CAN_VIRTUAL_RATE_HZ)
+        except Exception as e:
+            print(f"[Init] CAN virtual '{CAN_VIRTUAL_CHANNEL}' indisponível: {e}")
+            bus = None
+    joystick_controller = JoystickController(
+        ui, reader=CAN_READER_MODE, bus=bus,
+        tx=CAN_TX_MODE, tx_rate_hz=CAN_TX_RATE_HZ, tx_heartbeat_s=CAN_TX_HEARTBEAT_S,
+    )
+    if injector is not None and getattr(joystick_controller, 'available', False):
+        # started after the Joystick drained the bus
+        joystick_controller.injector = injector.start()
     
     try:
         joystick_available = bool(getattr(joystick_controller, 'available', False))
@@ -123,11 +259,25 @@ def setup_game_objects(screen, selected_map_path=None):
     # Load map
     map_path, map_image = load_map(selected_map_path)
     
+    # Mip levels and tiles for drawing the map
+    map_tiles = load_map_tiles(map_image)
+    
     # Load EventMap - responsável pela lógica do mapa
     event_map = EventMapManager(map_path)
     
-    # Build collision grid from map visualization
-    collision_grid, occupied_pixels = build_collision_grid(map_image)
+    # Compiled map artifacts (cached on disk, rebuilt when the PNG/JSON change)
+    compiled_map = event_map.get_compiled_map()
+    
+    # Collision grid from the compiled map (or built from map visualization)
+    collision_grid, occupied_pixels = load_collision_grid(compiled_map, map_image)
+    
+    # Hitbox part collider of the map's backend: mask footprints or vector
+    # outlines (None: per-part raster geometry)
+    collision_backend = select_collision_backend(event_map)
+    footprints = load_part_collider(collision_backend, compiled_map, collision_grid, map_image)
+    
+    # Signed distance field: O(1) collision early-out and near-miss warnings
+    distance_field, distance_field_pending = load_distance_field(compiled_map, map_image)
     
     # Get spawn point from EventMap (now the source of truth)
     spawn_point = event_map.get_player_spawn()
@@ -136,7 +286,8 @@ def setup_game_objects(screen, selected_map_path=None):
     dialogue_manager = init_dialogue_manager(
         os.path.dirname(os.path.dirname(__file__)),
         map_path,
-        map_image
+        map_image,
+        compiled_map=compiled_map,
     )
     
     # Initialize player and camera
@@ -184,12 +335,23 @@ def setup_game_objects(screen, selected_map_path=None):
     # Initialize joystick
     joystick_controller, joystick_available = init_joystick_controller(ui)
     
+    # Input latency instrumentation: frames timed from the bus to the screen
+    latency_tracer = shared_latency_tracer()
+    player.latency_tracer = latency_tracer
+    joystick_controller.latency_tracer = latency_tracer
+    
     return {
         'screen': screen,
         'map_image': map_image,
+        'map_tiles': map_tiles,
         'map_path': map_path,
         'event_map': event_map,
         'collision_grid': collision_grid,
+        'collision_backend': collision_backend,
+        'footprints': footprints,
+        'distance_field': distance_field,
+        'distance_field_pending': distance_field_pending,
+        'compiled_map': compiled_map,
         'dialogue_manager': dialogue_manager,
         'player': player,
         'camera': camera,
@@ -197,5 +359,6 @@ def setup_game_objects(screen, selected_map_path=None):
         'ui': ui,
         'joystick_controller': joystick_controller,
         'joystick_available': joystick_available,
+        'latency_tracer': latency_tracer,
         'spawn_point': spawn_point,
     }
@@ -120,19 +120,28 @@ class InputHandler:
             pass
     
     def process_zoom_keys(self, current_keys, camera, dt):
-        """Process zoom control keys (J = zoom out, K = zoom in)."""
+        """
+        Process zoom control keys (J = zoom out, K = zoom in).
+        The zoom level changes smoothly (camera.zoom); camera.scale follows
+        it in CAMERA_SCALE_STEP steps, the scales draw_map keeps copies of.
+        """
         from .config import ZOOM_SPEED, MIN_CAMERA_SCALE, MAX_CAMERA_SCALE
+        from .map_scale_cache import quantize_scale
         
         zoom_changed = False
+        zoom = getattr(camera, 'zoom', camera.scale)
         
         if current_keys[pygame.K_j]:
-            camera.scale = max(MIN_CAMERA_SCALE, camera.scale - ZOOM_SPEED * (dt / 16.0))
+            zoom = max(MIN_CAMERA_SCALE, zoom - ZOOM_SPEED * (dt / 16.0))
             zoom_changed = True
         
         if current_keys[pygame.K_k]:
-            camera.scale = min(MAX_CAMERA_SCALE, camera.scale + ZOOM_SPEED * (dt / 16.0))
+            zoom = min(MAX_CAMERA_SCALE, zoom + ZOOM_SPEED * (dt / 16.0))
             zoom_changed = True
         
+        if zoom_changed:
+            camera.zoom = zoom
+            camera.scale = quantize_scale(zoom)
         return zoom_changed
     
     def process_movement(self, current_keys, player, joystick_controller, 
@@ -0,0 +1,163 @@
+"""
+Latency module - End-to-end input latency, from a joystick CAN frame to the frame on screen.
+
+Every joystick frame (0x200) gets four timestamps (time.time() seconds):
+- bus: msg.timestamp, set by the CAN interface when the frame arrived (by
+  send() on python-can's 'virtual' interface);
+- decode: Joystick._on_frame decoded it (in poll(), or on the reader thread
+  in 'notifier' mode);
+- consume: the first Player.move_with_joystick after the decode, the logic
+  tick that moved the robot with it or a newer value;
+- display: the first FramePresenter.present after the consume.
+InputLatencyTracer keeps the completed samples and reports p50/p95/p99 of
+each stage (bus->decode, decode->consume, consume->display) and of the
+total over the last `window` samples; export_csv writes them all.
+
+The tracer is passed to the Joystick and the Player as their
+`latency_tracer` attribute (setup_game_objects), so Player code does not
+import game.*. Frames never consumed (keyboard control, pause menu) are
+dropped once older than stale_s instead of counting the pause.
+"""
+
+import csv
+import os
+import threading
+import time
+from collections import deque
+
+from .config import LATENCY_MAX_SAMPLES, LATENCY_STALE_S, LATENCY_WINDOW
+
+
+JOYSTICK_FRAME_ID = 0x200
+
+LATENCY_STAGES = ('bus_to_decode', 'decode_to_consume', 'consume_to_display', 'total')
+LATENCY_PERCENTILES = (50, 95, 99)
+
+CSV_HEADER = ('bus_time', 'decode_time', 'consume_time', 'display_time') + tuple(
+    f'{stage}_ms' for stage in LATENCY_STAGES)
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    index = int(round(p / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[min(len(sorted_values) - 1, max(0, index))]
+
+
+def stage_times_ms(sample):
+    """(bus_to_decode, decode_to_consume, consume_to_display, total) of one sample, in ms."""
+    bus, decode, consume, display = sample
+    return ((decode - bus) * 1000.0, (consume - decode) * 1000.0,
+            (display - consume) * 1000.0, (display - bus) * 1000.0)
+
+
+class InputLatencyTracer:
+    """Timestamps of joystick frames through decode, logic tick and display."""
+
+    def __init__(self, window=LATENCY_WINDOW, max_samples=LATENCY_MAX_SAMPLES, stale_s=LATENCY_STALE_S,
+                 frame_ids=(JOYSTICK_FRAME_ID,)):
+        self.window = int(window)
+        self.stale_s = float(stale_s)
+        self.frame_ids = frozenset(frame_ids)
+        self._lock = threading.Lock()
+        self._decoded = deque()   # (bus, decode) waiting for a logic tick
+        self._consumed = []       # (bus, decode, consume) waiting for the display
+        self.samples = deque(maxlen=int(max_samples))
+        self.frames = 0
+        self.stale = 0
+        self._summary = None
+        self._summary_time = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._decoded.clear()
+        self._consumed = []
+        self.samples.clear()
+        self.frames = 0
+        self.stale = 0
+        self._summary = None
+
+    def frame_decoded(self, arbitration_id, bus_time, decode_time=None):
+        """A frame was decoded (any thread)."""
+        if arbitration_id not in self.frame_ids:
+            return
+        if decode_time is None:
+            decode_time = time.time()
+        with self._lock:
+            self._decoded.append((bus_time or decode_time, decode_time))
+            self.frames += 1
+
+    def consumed(self, now=None):
+        """The logic tick moved the robot with the latest joystick value (main thread)."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            decoded = self._decoded
+            self._decoded = deque()
+        for bus_time, decode_time in decoded:
+            if now - decode_time > self.stale_s:
+                self.stale += 1
+            else:
+                self._consumed.append((bus_time, decode_time, now))
+
+    def displayed(self, now=None):
+        """A frame was presented (main thread, after FramePresenter.present)."""
+        if not self._consumed:
+            return
+        if now is None:
+            now = time.time()
+        for bus_time, decode_time, consume_time in self._consumed:
+            self.samples.append((bus_time, decode_time, consume_time, now))
+        self._consumed = []
+
+    def summary(self, max_age_s=0.0):
+        """
+        {stage: (p50, p95, p99) ms} over the last `window` samples, plus
+        'count'. Recomputed at most every max_age_s (the overlay asks every
+        frame).
+        """
+        now = time.perf_counter()
+        if self._summary is not None and now - self._summary_time < max_age_s:
+            return self._summary
+        recent = list(self.samples)[-self.window:]
+        columns = list(zip(*(stage_times_ms(s) for s in recent))) if recent else [()] * len(LATENCY_STAGES)
+        result = {'count': len(recent)}
+        for stage, values in zip(LATENCY_STAGES, columns):
+            values = sorted(values)
+            result[stage] = tuple(percentile(values, p) for p in LATENCY_PERCENTILES)
+        self._summary = result
+        self._summary_time = now
+        return result
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'samples': len(self.samples),
+            'stale': self.stale,
+            'pending': len(self._decoded) + len(self._consumed),
+        }
+
+    def export_csv(self, path):
+        """Write every kept sample (timestamps and stage times) to `path`; returns the row count."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        samples = list(self.samples)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for sample in samples:
+                writer.writerow([f'{t:.6f}' for t in sample] + [f'{ms:.3f}' for ms in stage_times_ms(sample)])
+        return len(samples)
+
+
+_shared_tracer = None
+
+
+def shared_latency_tracer():
+    """Process-wide tracer: the samples survive a map change (new Player/Joystick)."""
+    global _shared_tracer
+    if _shared_tracer is None:
+        _shared_tracer = InputLatencyTracer()
+    return _shared_tracer
@@ -0,0 +1,181 @@
+"""
+Map scale cache module - Zoomed pictures of the map image for draw_map.
+
+draw_map needs the map at camera.scale. Rescaling the whole image every frame
+costs tens of milliseconds at the default zoom, and a whole zoomed-in copy is
+huge (7680x4320 for a 1920x1080 map at 4.0). Two strategies:
+
+- ViewportMapScaler (zoom in): crops the world rectangle under the view and
+  scales only that into a buffer the size of the view, so memory follows the
+  screen, not the map. The result is reused while the camera stands still.
+- ScaledMapCache (zoom out): whole scaled copies, smaller than the map
+  itself, rendered at the scale rounded to CAMERA_SCALE_STEP (the zoom
+  keys snap camera.scale to the same steps, so a zoom sweep revisits a few
+  copies instead of making a new one per frame), with LRU eviction under a
+  memory budget (MAP_SCALE_CACHE_BUDGET_MB). A copy larger than the budget
+  is not kept.
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+from .config import CAMERA_SCALE_STEP, MAP_SCALE_CACHE_BUDGET_MB
+
+
+def surface_nbytes(surface):
+    """Pixel memory of a surface."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def quantize_scale(scale, step=CAMERA_SCALE_STEP):
+    """`scale` rounded to a multiple of `step` (at least one step)."""
+    return max(step, round(scale / step) * step)
+
+
+def scaled_size(map_image, scale):
+    """Size of the map image at `scale` (what draw_map always used)."""
+    return (max(1, int(map_image.get_width() * scale)), max(1, int(map_image.get_height() * scale)))
+
+
+class ScaledMapCache:
+    """
+    LRU cache of scaled copies of one map image (cleared when another image
+    is requested).
+    """
+
+    def __init__(self, budget_bytes=MAP_SCALE_CACHE_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = int(budget_bytes)
+        self._source = None
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def get(self, map_image, scale):
+        """
+        map_image scaled to scaled_size(map_image, quantize_scale(scale)),
+        cached when it fits the budget.
+        """
+        if map_image is not self._source:
+            self.clear()
+            self._source = map_image
+        key = scaled_size(map_image, quantize_scale(scale))
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = pygame.transform.scale(map_image, key)
+        size = surface_nbytes(surface)
+        if size > self.budget_bytes:
+            return surface
+        while self._entries and self.nbytes + size > self.budget_bytes:
+            _key, old = self._entries.popitem(last=False)
+            self.nbytes -= surface_nbytes(old)
+            self.evictions += 1
+        self._entries[key] = surface
+        self.nbytes += size
+        return surface
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class ViewportMapScaler:
+    """
+    Scales the part of a map image under a view rectangle, into one reused
+    buffer. Placement matches blitting the whole map scaled to
+    scaled_size() at (-offset * scale): map column c lands on screen column
+    int(-offset_x * scale) + int(c * scale).
+    """
+
+    def __init__(self):
+        self._buffer = None
+        self._source = None
+        self._key = None
+        self._result = None
+        self.rescales = 0
+        self.reuses = 0
+
+    @property
+    def nbytes(self):
+        return surface_nbytes(self._buffer) if self._buffer is not None else 0
+
+    def _target(self, map_image, size):
+        """Subsurface of the buffer with `size`, growing the buffer if needed."""
+        buffer = self._buffer
+        if buffer is None or buffer.get_width() < size[0] or buffer.get_height() < size[1]:
+            width = max(size[0], buffer.get_width() if buffer is not None else 0)
+            height = max(size[1], buffer.get_height() if buffer is not None else 0)
+            buffer = self._buffer = pygame.Surface((width, height), 0, map_image)
+        return buffer.subsurface((0, 0, size[0], size[1]))
+
+    def render(self, map_image, camera, view_rect):
+        """
+        (surface, dest) with the map part under view_rect at camera.scale,
+        or (None, None) when the map is out of view.
+        """
+        scale = camera.scale
+        width, height = map_image.get_size()
+        origin_x = int(-camera.offset_x * scale)
+        origin_y = int(-camera.offset_y * scale)
+
+        # map columns/rows (whole pixels) under the view
+        c0 = max(0, int(math.floor((view_rect.left - origin_x) / scale)))
+        r0 = max(0, int(math.floor((view_rect.top - origin_y) / scale)))
+        c1 = min(width, int(math.ceil((view_rect.right - origin_x) / scale)) + 1)
+        r1 = min(height, int(math.ceil((view_rect.bottom - origin_y) / scale)) + 1)
+        if c0 >= c1 or r0 >= r1:
+            return None, None
+
+        x0, y0 = int(c0 * scale), int(r0 * scale)
+        size = (max(1, int(c1 * scale) - x0), max(1, int(r1 * scale) - y0))
+        dest = (origin_x + x0, origin_y + y0)
+        key = (c0, r0, c1, r1, size)
+        if map_image is self._source and key == self._key:
+            self.reuses += 1
+            return self._result, dest
+
+        target = self._target(map_image, size)
+        pygame.transform.scale(map_image.subsurface((c0, r0, c1 - c0, r1 - r0)), size, target)
+        self._source, self._key, self._result = map_image, key, target
+        self.rescales += 1
+        return target, dest
+
+
+_shared_cache = None
+_shared_scaler = None
+
+
+def shared_map_scale_cache():
+    """Process-wide ScaledMapCache used by draw_map."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ScaledMapCache()
+    return _shared_cache
+
+
+def shared_viewport_scaler():
+    """Process-wide ViewportMapScaler used by draw_map."""
+    global _shared_scaler
+    if _shared_scaler is None:
+        _shared_scaler = ViewportMapScaler()
+    return _shared_scaler
@@ -0,0 +1,158 @@
+"""
+Map tiles module - Tiled, mipmapped background renderer for the map image.
+
+The map image is split into fixed-size tiles (MAP_TILE_SIZE) at power-of-two
+mip levels (level k is the map at 1/2^k, filtered down from level k - 1),
+only as many levels as MIN_CAMERA_SCALE needs. Each frame picks the finest
+level that is not magnified (floor(log2(1 / scale)), 0 when zoomed in) and
+draws only the tiles that intersect the view. Zoomed in, the tiles are cut
+smaller (MAP_TILE_SIZE / 2^ceil(log2(scale))) so they still cover about
+MAP_TILE_SIZE screen pixels once scaled. Tiles scaled to the remaining
+factor are kept in an LRU cache (MAP_TILE_CACHE_BUDGET_MB), so panning only
+scales the tiles that come into view. The work per frame follows the view
+size, not the map size.
+
+Tiles are placed like the whole map scaled at camera.scale and blitted at
+(-offset * scale): level pixel p lands on screen pixel
+int(-offset * scale) + int(p * scale * 2^level).
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+from .config import MAP_TILE_CACHE_BUDGET_MB, MAP_TILE_SIZE, MIN_CAMERA_SCALE
+from .map_scale_cache import surface_nbytes
+
+
+# Smallest tile cut from the map when zoomed in
+MIN_TILE_SIZE = 16
+
+
+def build_mip_levels(map_image, min_scale=MIN_CAMERA_SCALE):
+    """[map_image, map at 1/2, 1/4, ...] down to the level min_scale draws from."""
+    levels = [map_image]
+    count = max(0, int(math.floor(math.log2(1.0 / min_scale)))) if min_scale < 1.0 else 0
+    for _ in range(count):
+        prev = levels[-1]
+        size = (max(1, prev.get_width() // 2), max(1, prev.get_height() // 2))
+        if size == prev.get_size():
+            break
+        try:
+            levels.append(pygame.transform.smoothscale(prev, size))
+        except (ValueError, pygame.error):
+            # smoothscale needs 24/32-bit surfaces
+            levels.append(pygame.transform.scale(prev, size))
+    return levels
+
+
+class MapTileRenderer:
+    """Draws a map image through its mip levels and scaled-tile cache."""
+
+    def __init__(self, map_image, tile_size=MAP_TILE_SIZE, min_scale=MIN_CAMERA_SCALE,
+                 budget_bytes=MAP_TILE_CACHE_BUDGET_MB * 1024 * 1024):
+        self.source = map_image
+        self.tile_size = int(tile_size)
+        self.budget_bytes = int(budget_bytes)
+        self.levels = build_mip_levels(map_image, min_scale)
+        self._tiles = [{} for _ in self.levels]     # unscaled tiles (subsurfaces) per level
+        self._scaled = OrderedDict()                # (level, tile size, tx, ty, size) -> surface
+        self.scaled_nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def nbytes(self):
+        """Memory of the extra mip levels and the scaled tiles (the map itself excluded)."""
+        return sum(surface_nbytes(level) for level in self.levels[1:]) + self.scaled_nbytes
+
+    def level_for(self, scale):
+        """Finest mip level that is not magnified at `scale`."""
+        if scale >= 1.0:
+            return 0
+        return min(len(self.levels) - 1, int(math.floor(math.log2(1.0 / scale))))
+
+    def source_tile_size(self, factor):
+        """Tile size (level pixels) that covers about tile_size screen pixels at `factor`."""
+        if factor <= 1.0:
+            return self.tile_size
+        return max(MIN_TILE_SIZE, self.tile_size >> int(math.ceil(math.log2(factor))))
+
+    def _tile(self, level, t, tx, ty):
+        tiles = self._tiles[level]
+        tile = tiles.get((t, tx, ty))
+        if tile is None:
+            surface = self.levels[level]
+            rect = pygame.Rect(tx * t, ty * t, t, t).clip(surface.get_rect())
+            tile = tiles[(t, tx, ty)] = surface.subsurface(rect)
+        return tile
+
+    def _scaled_tile(self, level, t, tx, ty, size):
+        tile = self._tile(level, t, tx, ty)
+        if tile.get_size() == size:
+            return tile
+        key = (level, t, tx, ty, size)
+        scaled = self._scaled.get(key)
+        if scaled is not None:
+            self._scaled.move_to_end(key)
+            self.hits += 1
+            return scaled
+
+        self.misses += 1
+        scaled = pygame.transform.scale(tile, size)
+        nbytes = surface_nbytes(scaled)
+        while self._scaled and self.scaled_nbytes + nbytes > self.budget_bytes:
+            _key, old = self._scaled.popitem(last=False)
+            self.scaled_nbytes -= surface_nbytes(old)
+            self.evictions += 1
+        if nbytes <= self.budget_bytes:
+            self._scaled[key] = scaled
+            self.scaled_nbytes += nbytes
+        return scaled
+
+    def draw(self, screen, camera, view_rect):
+        """Blit the tiles under view_rect at camera.scale. Returns the number of tiles drawn."""
+        scale = getattr(camera, 'scale', 1.0)
+        level = self.level_for(scale)
+        factor = scale * (1 << level)
+        surface = self.levels[level]
+        width, height = surface.get_size()
+        t = self.source_tile_size(factor)
+        origin_x = int(-camera.offset_x * scale)
+        origin_y = int(-camera.offset_y * scale)
+
+        # level pixels, then tiles, under the view
+        p0 = max(0, int(math.floor((view_rect.left - origin_x) / factor)))
+        q0 = max(0, int(math.floor((view_rect.top - origin_y) / factor)))
+        p1 = min(width, int(math.ceil((view_rect.right - origin_x) / factor)) + 1)
+        q1 = min(height, int(math.ceil((view_rect.bottom - origin_y) / factor)) + 1)
+        if p0 >= p1 or q0 >= q1:
+            return 0
+
+        drawn = 0
+        for ty in range(q0 // t, (q1 - 1) // t + 1):
+            y0 = int(ty * t * factor)
+            y1 = int(min((ty + 1) * t, height) * factor)
+            if y1 <= y0:
+                continue
+            for tx in range(p0 // t, (p1 - 1) // t + 1):
+                x0 = int(tx * t * factor)
+                x1 = int(min((tx + 1) * t, width) * factor)
+                if x1 <= x0:
+                    continue
+                tile = self._scaled_tile(level, t, tx, ty, (x1 - x0, y1 - y0))
+                screen.blit(tile, (origin_x + x0, origin_y + y0))
+                drawn += 1
+        return drawn
+
+    def stats(self):
+        return {
+            'levels': len(self.levels),
+            'scaled_tiles': len(self._scaled),
+            'nbytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
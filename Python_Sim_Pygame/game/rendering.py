@@ -14,21 +14,49 @@ from .config import (
     COLOR_SHADOW_ALPHA,
     COLOR_SKY_BLUE,
     TRAFO_PICKUP_DISPLAY_MS,
+    PROXIMITY_WARNING_PX,
+    PROXIMITY_CRITICAL_PX,
+    SIDE_PANEL_SPILL_PX,
 )
+from .map_scale_cache import quantize_scale, shared_map_scale_cache, shared_viewport_scaler
+from ui.fonts import get_font, render_text
 
 
-def draw_map(screen, map_image, camera, world_view_rect):
-    """Draw the game map with camera offset and zoom."""
+def draw_map(screen, map_image, camera, world_view_rect, cache=None, scaler=None, tiles=None):
+    """
+    Draw the game map with camera offset and zoom.
+    With a MapTileRenderer of map_image as `tiles` only the mip level tiles
+    under the view are drawn. Without it: zoomed in, only the world rectangle under world_view_rect is cropped and
+    scaled, by a ViewportMapScaler (memory follows the screen). Zoomed out,
+    the scaled map comes from a ScaledMapCache. Both default to the shared
+    instances.
+    """
     prev_clip = screen.get_clip()
     screen.set_clip(world_view_rect)
+    view = screen.get_clip()
     
-    if hasattr(camera, 'scale') and camera.scale != 1.0:
-        map_w = int(map_image.get_width() * camera.scale)
-        map_h = int(map_image.get_height() * camera.scale)
-        scaled_map = pygame.transform.scale(map_image, (map_w, map_h))
-        screen.blit(scaled_map, (-camera.offset_x * camera.scale, -camera.offset_y * camera.scale))
+    scale = getattr(camera, 'scale', 1.0)
+    if tiles is not None and tiles.source is map_image:
+        tiles.draw(screen, camera, view)
+    elif scale > 1.0:
+        if scaler is None:
+            scaler = shared_viewport_scaler()
+        surface, dest = scaler.render(map_image, camera, view)
+        if surface is not None:
+            screen.blit(surface, dest)
     else:
-        screen.blit(map_image, (-camera.offset_x, -camera.offset_y))
+        if scale != 1.0:
+            if cache is None:
+                cache = shared_map_scale_cache()
+            # the copy is at the quantized scale: place it at that scale too
+            scale = quantize_scale(scale)
+            surface = cache.get(map_image, scale)
+        else:
+            surface = map_image
+        # same placement as blitting the whole map at (-offset * scale)
+        dest_x = int(-camera.offset_x * scale)
+        dest_y = int(-camera.offset_y * scale)
+        screen.blit(surface, view.topleft, pygame.Rect(view.x - dest_x, view.y - dest_y, view.width, view.height))
     
     screen.set_clip(prev_clip)
 
@@ -84,27 +112,203 @@ def draw_ui_panels(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT):
         pass
 
 
+class RetainedSidePanel:
+    """
+    The right side panel (draw_ui_panels chrome, the icamento UI and
+    UIManager.draw) kept in offscreen layers and redrawn only when what it
+    shows changes: UIManager.state_key() (mode, speed, lights, image id,
+    screen size, ...) and the icamento cursor. Otherwise a frame blits the
+    bottom bar (draw_chrome) and the panel column (draw) as opaque layers,
+    plus the labels that stick out up to SIDE_PANEL_SPILL_PX into the world
+    view, kept with alpha since the map under them changes every frame.
+
+    While the state changes every frame (e.g. the icamento cursor moving) the
+    panel is drawn straight on the screen over the cached chrome; the layers
+    are rebuilt once the state holds for two frames.
+    """
+
+    def __init__(self, panel_width=PANEL_WIDTH, bottom_bar_height=BOTTOM_BAR_HEIGHT, spill=SIDE_PANEL_SPILL_PX):
+        self.panel_width = int(panel_width)
+        self.bottom_bar_height = int(bottom_bar_height)
+        self.spill = int(spill)
+        self._size = None
+        self._key = None
+        self._last_key = None
+        self._scratch = None
+        self._overlay = None
+        self.chrome_column = None
+        self.column = None
+        self.column_rect = None
+        self.bottom = None
+        self.bottom_rect = None
+        self.spill_layer = None
+        self.spill_pos = (0, 0)
+        self.redraws = 0
+        self.immediate = 0
+        self.hits = 0
+
+    def state_key(self, screen, ui, player, mode_text=None, warning=None):
+        """Key of what the panel shows, or None when it must be redrawn every frame."""
+        ui_key = ui.state_key(screen, mode_text, warning) if ui is not None else ()
+        if ui_key is None:
+            return None
+        camera = getattr(player, 'camera', None)
+        return (screen.get_size(), id(ui), id(player), ui_key,
+                getattr(player, 'curve_mode', None), getattr(player, 'icamento_cursor', None),
+                getattr(camera, 'width', None))
+
+    def _prepare(self, screen):
+        """Chrome layers and scratch surfaces for the screen size."""
+        size = screen.get_size()
+        if size == self._size:
+            return
+        sw, sh = size
+        bounds = screen.get_rect()
+        ui_x = max(0, sw - self.panel_width)
+        self._scratch = pygame.Surface(size, 0, screen)
+        self._overlay = pygame.Surface(size, pygame.SRCALPHA)
+        draw_ui_panels(self._scratch, self.panel_width, self.bottom_bar_height)
+        # the column starts at the panel's dark outline, 1 px left of ui_x
+        self.column_rect = pygame.Rect(ui_x - 1, 0, sw - ui_x + 1, sh).clip(bounds)
+        self.bottom_rect = pygame.Rect(0, max(0, sh - self.bottom_bar_height),
+                                       max(0, ui_x - 1), self.bottom_bar_height).clip(bounds)
+        self.chrome_column = self._scratch.subsurface(self.column_rect).copy()
+        self.bottom = self._scratch.subsurface(self.bottom_rect).copy()
+        self.column = None
+        self.spill_layer = None
+        self._key = self._last_key = None
+        self._size = size
+
+    def _draw_contents(self, surface, ui, player, mode_text, warning):
+        """The icamento UI and UIManager.draw, in the main loop order."""
+        try:
+            if hasattr(player, 'draw_icamento_ui'):
+                player.draw_icamento_ui(surface)
+        except Exception:
+            pass
+        try:
+            if ui is not None:
+                ui.draw(surface, mode_text=mode_text, warning=warning)
+        except Exception:
+            pass
+
+    def render(self, screen, ui, player, mode_text=None, warning=None):
+        """Redraw the panel layers for the current state."""
+        self._prepare(screen)
+        scratch = self._scratch
+        scratch.blit(self.chrome_column, self.column_rect)
+        self._draw_contents(scratch, ui, player, mode_text, warning)
+        self.column = scratch.subsurface(self.column_rect).copy()
+
+        # labels over the map: drawn again on a transparent surface, cropped
+        spill_rect = pygame.Rect(self.column_rect.x - self.spill, 0, self.spill,
+                                 self.column_rect.height).clip(screen.get_rect())
+        self.spill_layer = None
+        if spill_rect.width and spill_rect.height:
+            overlay = self._overlay
+            overlay.set_clip(spill_rect)
+            overlay.fill((0, 0, 0, 0))
+            self._draw_contents(overlay, ui, player, mode_text, warning)
+            overlay.set_clip(None)
+            strip = overlay.subsurface(spill_rect)
+            used = strip.get_bounding_rect()
+            if used.width and used.height:
+                self.spill_layer = strip.subsurface(used).copy()
+                self.spill_pos = (spill_rect.x + used.x, spill_rect.y + used.y)
+        self.redraws += 1
+
+    def draw_chrome(self, screen):
+        """The bottom bar, where draw_ui_panels was called."""
+        self._prepare(screen)
+        screen.blit(self.bottom, self.bottom_rect)
+
+    def draw(self, screen, ui, player, mode_text=None, warning=None):
+        """
+        Blit the panel, redrawing it first if its state changed. Returns the
+        rects whose content changed ([] when the panel was only blitted).
+        """
+        self._prepare(screen)
+        key = self.state_key(screen, ui, player, mode_text, warning)
+        if key is not None and key == self._key and self.column is not None:
+            self.hits += 1
+            dirty = []
+        elif key is not None and key == self._last_key:
+            self.render(screen, ui, player, mode_text, warning)
+            self._key = key
+            dirty = [self.column_rect.copy()]
+        else:
+            # state still changing: straight on the screen, over the cached chrome
+            self._last_key = key
+            self.immediate += 1
+            screen.blit(self.chrome_column, self.column_rect)
+            self._draw_contents(screen, ui, player, mode_text, warning)
+            return [self.column_rect.copy()]
+        screen.blit(self.column, self.column_rect)
+        if self.spill_layer is not None:
+            screen.blit(self.spill_layer, self.spill_pos)
+        return dirty
+
+    def stats(self):
+        return {'redraws': self.redraws, 'immediate': self.immediate, 'hits': self.hits}
+
+
+class FramePresenter:
+    """
+    Shows a frame with pygame.display.update() for the rects that changed, or
+    flip() when all of it may have: the first frame, a new screen size, a
+    full-screen overlay in this frame or the previous one, or invalidate()
+    (after menus that draw and flip on their own).
+    """
+
+    def __init__(self):
+        self._size = None
+        self._full_next = True
+        self.frames = 0
+        self.full_frames = 0
+        self.last_rects = []
+
+    def invalidate(self):
+        self._full_next = True
+
+    def present(self, screen, dirty_rects, full=False):
+        """Show the frame; returns the rects sent to the display."""
+        size = screen.get_size()
+        self.frames += 1
+        if full or self._full_next or size != self._size:
+            pygame.display.flip()
+            self.full_frames += 1
+            self.last_rects = [screen.get_rect()]
+        else:
+            self.last_rects = [pygame.Rect(r) for r in dirty_rects if r]
+            pygame.display.update(self.last_rects)
+        self._size = size
+        self._full_next = bool(full)
+        return self.last_rects
+
+
 def draw_hud_info(screen, player, camera, control_mode, hardcore_mode, 
-                  ttc_control, accelerometer_value, ACCELEROMETER_MAX_VALUE):
-    """Draw HUD information (control mode, zoom, accelerometer, etc)."""
+                  ttc_control, accelerometer_value, ACCELEROMETER_MAX_VALUE,
+                  clearance_px=None):
+    """
+    Draw HUD information (control mode, zoom, accelerometer, etc).
+    clearance_px is the hitbox clearance of this tick (DistanceField.
+    footprint_clearance); below PROXIMITY_WARNING_PX a near-miss warning is shown.
+    """
     try:
-        font = pygame.font.SysFont(None, 20)
+        font = get_font(None, 20)
         
         # Top-left info: control mode, zoom, hardcore, ttc_control
         hud_label = f'Control: {control_mode.upper()}  Zoom: {camera.scale:.2f}  ' \
                     f'Hardcore: {"ON" if hardcore_mode else "OFF"}  TTC.Ctrl: {"ON" if ttc_control else "OFF"}'
-        hud_text = font.render(hud_label, True, (255, 255, 255))
-        hud_outline = font.render(hud_label, True, (0, 0, 0))
         hud_x, hud_y = 8, 8
         
-        # Draw text outline
-        for ox, oy in [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            screen.blit(hud_outline, (hud_x + ox, hud_y + oy))
-        screen.blit(hud_text, (hud_x, hud_y))
+        # Text with a 1 px outline (composited once per label, see ui/fonts.py)
+        hud_text = render_text(font, hud_label, (255, 255, 255), outline=((0, 0, 0), 1))
+        screen.blit(hud_text, (hud_x - 1, hud_y - 1))
         
         # Accelerometer display
-        accel_text = font.render(f'Acelerômetro: {accelerometer_value} / {ACCELEROMETER_MAX_VALUE}', 
-                                True, (255, 100, 100))
+        accel_text = render_text(font, f'Acelerômetro: {accelerometer_value} / {ACCELEROMETER_MAX_VALUE}',
+                                 (255, 100, 100))
         screen.blit(accel_text, (8, 32))
         
         # Mode and speed display
@@ -126,9 +330,66 @@ def draw_hud_info(screen, player, camera, control_mode, hardcore_mode,
         bg_surf = pygame.Surface((bg_w, bg_h), pygame.SRCALPHA)
         bg_surf.fill((0, 0, 0, 150))
         screen.blit(bg_surf, (x - padding, y - padding // 2))
-        mode_text_render = font.render(mode_str, True, (255, 255, 255))
+        mode_text_render = render_text(font, mode_str, (255, 255, 255))
         screen.blit(mode_text_render, (x, y))
         
+        # Near-miss warning (top center)
+        if clearance_px is not None and clearance_px < PROXIMITY_WARNING_PX \
+                and not (hasattr(player, 'is_dead') and player.is_dead()):
+            critical = clearance_px < PROXIMITY_CRITICAL_PX
+            warn_color = (220, 40, 40, 200) if critical else (230, 150, 20, 200)
+            warn_text = render_text(font, f'Obstáculo próximo: {max(0.0, clearance_px):.0f} px', (255, 255, 255))
+            warn_bg = pygame.Surface((warn_text.get_width() + padding * 2,
+                                      warn_text.get_height() + padding), pygame.SRCALPHA)
+            warn_bg.fill(warn_color)
+            wx = (screen.get_width() - PANEL_WIDTH - warn_bg.get_width()) // 2
+            wy = 8
+            screen.blit(warn_bg, (wx, wy))
+            screen.blit(warn_text, (wx + padding, wy + padding // 2))
+        
+    except Exception:
+        pass
+
+
+LATENCY_OVERLAY_ROWS = (
+    ('CAN->decode', 'bus_to_decode'),
+    ('decode->tick', 'decode_to_consume'),
+    ('tick->tela', 'consume_to_display'),
+    ('total', 'total'),
+)
+
+
+def draw_latency_overlay(screen, tracer, world_view_rect):
+    """
+    Debug overlay (F3) of the input latency (game/latency.py): p50/p95/p99
+    in ms of each stage, top right of the world view. The percentiles are
+    recomputed twice a second.
+    """
+    try:
+        font = get_font(None, 20)
+        summary = tracer.summary(max_age_s=0.5)
+        stats = tracer.stats()
+
+        def fmt(values):
+            return ' / '.join('-' if v is None else f'{v:.1f}' for v in values)
+
+        lines = ['Latência (ms)  p50 / p95 / p99']
+        lines += [f'{label}: {fmt(summary[stage])}' for label, stage in LATENCY_OVERLAY_ROWS]
+        lines.append(f'{summary["count"]} amostras  {stats["frames"]} frames  {stats["stale"]} descartados')
+
+        texts = [render_text(font, line, (255, 255, 255)) for line in lines]
+        padding = 6
+        box_w = max(t.get_width() for t in texts) + padding * 2
+        box_h = sum(t.get_height() for t in texts) + padding * 2
+        x = world_view_rect.right - box_w - 8
+        y = world_view_rect.top + 8
+        bg = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
+        bg.fill((0, 0, 0, 170))
+        screen.blit(bg, (x, y))
+        ty = y + padding
+        for text in texts:
+            screen.blit(text, (x + padding, ty))
+            ty += text.get_height()
     except Exception:
         pass
 
@@ -136,8 +397,8 @@ def draw_hud_info(screen, player, camera, control_mode, hardcore_mode,
 def draw_trafo_carried_badge(screen):
     """Draw a badge indicating trafo is being carried."""
     try:
-        badge_font = pygame.font.SysFont(None, 20)
-        badge_txt = badge_font.render('Trafo: CARRIED', True, (255, 255, 255))
+        badge_font = get_font(None, 20)
+        badge_txt = render_text(badge_font, 'Trafo: CARRIED', (255, 255, 255))
         bx, by = 8, 36
         bg = pygame.Surface((badge_txt.get_width() + 12, badge_txt.get_height() + 8), pygame.SRCALPHA)
         bg.fill((200, 40, 40, 200))
@@ -150,12 +411,12 @@ def draw_trafo_carried_badge(screen):
 def draw_trafo_pickup_indicator(screen, trafo_pickup_time):
     """Draw transient indicator when trafo was recently picked up."""
     try:
-        font = pygame.font.SysFont(None, 20)
+        font = get_font(None, 20)
         now_pick = pygame.time.get_ticks()
         
         if trafo_pickup_time and (now_pick - trafo_pickup_time) < TRAFO_PICKUP_DISPLAY_MS:
-            pick_font = pygame.font.SysFont(None, 28)
-            pick_txt = pick_font.render('Trafo picked up!', True, (40, 220, 40))
+            pick_font = get_font(None, 28)
+            pick_txt = render_text(pick_font, 'Trafo picked up!', (40, 220, 40))
             
             # Position above lower-left
             pad = 8
@@ -175,7 +436,7 @@ def draw_trafo_pickup_indicator(screen, trafo_pickup_time):
 def draw_collision_overlay(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT):
     """Draw the collision warning overlay."""
     try:
-        fonte = pygame.font.SysFont(None, 48)
+        fonte = get_font(None, 48)
 
         world_w = max(1, int(screen.get_width() - PANEL_WIDTH))
         world_h = max(1, int(screen.get_height() - BOTTOM_BAR_HEIGHT))
@@ -183,7 +444,7 @@ def draw_collision_overlay(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT):
 
         # Keeps the warning legible when the available viewport gets narrow.
         line_texts = ['Colisão Detectada!', 'Mova para sair.']
-        rendered_lines = [fonte.render(line, True, (255, 0, 0)) for line in line_texts]
+        rendered_lines = [render_text(fonte, line, (255, 0, 0)) for line in line_texts]
 
         line_gap = 8
         max_line_w = max(line.get_width() for line in rendered_lines)
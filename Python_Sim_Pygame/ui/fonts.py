@@ -0,0 +1,211 @@
+"""
+Fonts module - Process-wide font registry and rendered-text cache.
+
+pygame.font.SysFont resolves and loads a system font on every call, and the
+HUD, the side panel and the overlays used to call it (and Font.render) every
+frame. FontRegistry loads each (name, size) once; TextCache keeps rendered
+text surfaces in an LRU keyed by (font, text, color, outline). Both count
+hits and misses (font_stats()) for profiling.
+
+Outlined text (render_outlined) is built once per key: the glyphs are
+rendered once in the outline color and composited at every offset of the
+outline, then the text on top, into one padded surface. Drawing it is then a
+single blit at (x - width, y - width) instead of one blit per offset.
+
+Cached surfaces are shared: callers blit them and must not draw on them
+(copy() first when a modified version is needed).
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+# Rendered text surfaces kept by the shared TextCache
+TEXT_CACHE_MAX_ENTRIES = 512
+
+
+class FontRegistry:
+    """pygame.font.SysFont per (name, size, bold, italic), loaded once."""
+
+    def __init__(self):
+        self._fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def get(self, name=None, size=20, bold=False, italic=False):
+        key = (name, int(size), bool(bold), bool(italic))
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        self.misses += 1
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = self._fonts[key] = pygame.font.SysFont(name, int(size), bold=bool(bold), italic=bool(italic))
+        return font
+
+    def stats(self):
+        return {'fonts': len(self._fonts), 'hits': self.hits, 'misses': self.misses}
+
+
+OUTLINE_SHAPES = ('square', 'cross')
+
+
+def outline_offsets(width, shape='square'):
+    """
+    Offsets the outline is drawn at: every (dx, dy) within `width` pixels
+    ('square', like the 8 neighbours for width 1) or only the axes ('cross',
+    the 4 neighbours for width 1).
+    """
+    offsets = []
+    for dx in range(-width, width + 1):
+        for dy in range(-width, width + 1):
+            if (dx or dy) and (shape == 'square' or not (dx and dy)):
+                offsets.append((dx, dy))
+    return offsets
+
+
+def normalize_outline(outline):
+    """(color, width) or (color, width, shape) -> (color tuple, width, shape)."""
+    if outline is None:
+        return None
+    color, width = outline[0], outline[1]
+    shape = outline[2] if len(outline) > 2 else 'square'
+    if shape not in OUTLINE_SHAPES:
+        raise ValueError(f"outline shape must be one of {OUTLINE_SHAPES}, got {shape!r}")
+    return (tuple(color), max(0, int(width)), shape)
+
+
+def composite_outline(text_surf, edge_surf, width, shape='square'):
+    """edge_surf at every outline offset, text_surf on top, into a surface padded by `width`."""
+    surface = pygame.Surface((text_surf.get_width() + 2 * width, text_surf.get_height() + 2 * width),
+                             pygame.SRCALPHA)
+    for dx, dy in outline_offsets(width, shape):
+        surface.blit(edge_surf, (width + dx, width + dy))
+    surface.blit(text_surf, (width, width))
+    return surface
+
+
+def render_outlined(font, text, color, outline, antialias=True):
+    """
+    Text with an outline: outline = (outline_color, width[, shape]), see
+    outline_offsets(). The surface is padded by `width` on every side.
+    """
+    outline_color, width, shape = normalize_outline(outline)
+    text_surf = font.render(text, antialias, color)
+    edge_surf = font.render(text, antialias, outline_color)
+    return composite_outline(text_surf, edge_surf, width, shape)
+
+
+def colorized(text_surface, color):
+    """Copy of a rendered text surface with its glyphs in `color` (alpha kept)."""
+    edge_surf = text_surface.copy()
+    edge_surf.fill((color[0], color[1], color[2], 255), special_flags=pygame.BLEND_RGBA_MULT)
+    return edge_surf
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color, outline)."""
+
+    def __init__(self, max_entries=TEXT_CACHE_MAX_ENTRIES):
+        self.max_entries = int(max_entries)
+        self._entries = OrderedDict()
+        self._keys = {}     # id(cached surface) -> key, for outlined()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys.clear()
+
+    def render(self, font, text, color, antialias=True, outline=None):
+        """font.render(text, antialias, color), or render_outlined() with `outline`, cached."""
+        key = (font, str(text), tuple(color), bool(antialias), normalize_outline(outline))
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if outline is None:
+            surface = font.render(key[1], antialias, color)
+        else:
+            surface = render_outlined(font, key[1], color, key[4], antialias)
+        self._entries[key] = surface
+        self._keys[id(surface)] = key
+        while len(self._entries) > self.max_entries:
+            _key, old = self._entries.popitem(last=False)
+            self._keys.pop(id(old), None)
+            self.evictions += 1
+        return surface
+
+    def outlined(self, text_surface, outline_color=(0, 0, 0), width=1, shape='square'):
+        """
+        Outlined version of a surface returned by render(), from the cache.
+        The outline is the glyphs in outline_color. A surface this cache did
+        not render is outlined with colorized() (the glyphs' colors
+        multiplied by outline_color) and not cached.
+        """
+        key = self._keys.get(id(text_surface))
+        if key is not None and self._entries.get(key) is text_surface and key[4] is None:
+            font, text, color, antialias, _outline = key
+            return self.render(font, text, color, antialias, (outline_color, width, shape))
+        self.misses += 1
+        return composite_outline(text_surface, colorized(text_surface, outline_color), int(width), shape)
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+_shared_fonts = None
+_shared_text_cache = None
+
+
+def shared_fonts():
+    """Process-wide FontRegistry."""
+    global _shared_fonts
+    if _shared_fonts is None:
+        _shared_fonts = FontRegistry()
+    return _shared_fonts
+
+
+def shared_text_cache():
+    """Process-wide TextCache."""
+    global _shared_text_cache
+    if _shared_text_cache is None:
+        _shared_text_cache = TextCache()
+    return _shared_text_cache
+
+
+def get_font(name=None, size=20, bold=False, italic=False):
+    """Shared SysFont for (name, size): drop-in for pygame.font.SysFont(name, size)."""
+    return shared_fonts().get(name, size, bold, italic)
+
+
+def render_text(font, text, color, antialias=True, outline=None):
+    """Cached font.render(text, antialias, color) from the shared TextCache."""
+    return shared_text_cache().render(font, text, color, antialias, outline)
+
+
+def outlined_text(text_surface, outline_color=(0, 0, 0), width=1, shape='square'):
+    """Cached outlined version of a render_text() surface (TextCache.outlined)."""
+    return shared_text_cache().outlined(text_surface, outline_color, width, shape)
+
+
+def font_stats():
+    """Hit/miss counters of the shared font registry and text cache."""
+    return {'fonts': shared_fonts().stats(), 'text': shared_text_cache().stats()}
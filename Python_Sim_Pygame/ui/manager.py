@@ -2,14 +2,17 @@ import pygame
 import os
 import math
 from .screens.screen_base import ScreenBase
+from .fonts import get_font, outlined_text, render_text
+from .panel_images import ImagePrefetcher, ScaledImageCache
 
 class UIManager:
     """Simple UI manager for bottom-left panel.
     Keeps screens modular; exposes navigation API compatible with previous code.
     """
-    def __init__(self, screen, panel_rect=None, font=None, player=None, image_only=True, default_image_id='01'):
+    def __init__(self, screen, panel_rect=None, font=None, player=None, image_only=True, default_image_id='01',
+                 prefetch_images=True):
         self.screen = screen
-        self.font = font or pygame.font.SysFont(None, 28)
+        self.font = font or get_font(None, 28)
         self.screens = []
         self.current = 0
         self.selected = 0
@@ -49,6 +52,14 @@ class UIManager:
         self._image_cache = {}
         self._current_image_id = None
         self._current_image_surface = None
+        # images scaled to the image area per (id, target size, scale mode);
+        # cleared when the panel or the screen changes size
+        self._scaled_images = ScaledImageCache()
+        self._scaled_for_size = None
+        # load the whole image folder in the background (ui/panel_images.py)
+        self._prefetcher = None
+        if prefetch_images:
+            self.prefetch_images()
         # If True, skip all legacy UI drawing and show BMPs only (or a placeholder)
         self.image_only = bool(image_only)
         # Optionally set an initial image id for quick testing
@@ -76,19 +87,10 @@ class UIManager:
     def _draw_text_with_outline(self, surf, text_surface, x, y, outline_color=(0,0,0), outline_width=1):
         """Draw text with outline only (no background highlight box)."""
         try:
-            # Colorize a copy of the text preserving alpha, so only glyph pixels
-            # are drawn for the outline (no rectangular black background).
-            outline_surf = text_surface.copy()
-            outline_surf.fill((outline_color[0], outline_color[1], outline_color[2], 255), special_flags=pygame.BLEND_RGBA_MULT)
-
-            # Draw outline around the text
-            for dx in range(-outline_width, outline_width + 1):
-                for dy in range(-outline_width, outline_width + 1):
-                    if dx != 0 or dy != 0:
-                        surf.blit(outline_surf, (x + dx, y + dy))
-
-            # Draw original text on top
-            surf.blit(text_surface, (x, y))
+            # Outline + text composited once and cached (ui/fonts.py): one blit,
+            # shifted by the outline width the surface is padded with.
+            outlined = outlined_text(text_surface, outline_color, outline_width)
+            surf.blit(outlined, (x - outline_width, y - outline_width))
         except Exception:
             # Fallback: just draw normally if outline fails
             surf.blit(text_surface, (x, y))
@@ -328,8 +330,8 @@ class UIManager:
 
             # Draw title "MODOS" above the selector
             try:
-                title_font = pygame.font.SysFont(None, 14)
-                title_text = title_font.render('MODOS', True, (150, 255, 170))
+                title_font = get_font(None, 14)
+                title_text = render_text(title_font, 'MODOS', (150, 255, 170))
                 title_x = cx - title_text.get_width() // 2
                 title_y = cy - 60
                 self._draw_text_with_outline(surf, title_text, title_x, title_y)
@@ -398,8 +400,8 @@ class UIManager:
 
             # Draw title "VELOCIDADE" above the selector
             try:
-                title_font = pygame.font.SysFont(None, 14)
-                title_text = title_font.render('VELOCIDADE', True, (150, 255, 170))
+                title_font = get_font(None, 14)
+                title_text = render_text(title_font, 'VELOCIDADE', (150, 255, 170))
                 title_x = cx - title_text.get_width() // 2
                 title_y = cy - 60
                 self._draw_text_with_outline(surf, title_text, title_x, title_y)
@@ -433,12 +435,12 @@ class UIManager:
                     pygame.draw.circle(surf, (185, 185, 185), (dot_x, dot_y), 2)
 
             # symbols for differentiation: left='-', middle='o', right='+'
-            sym_font = pygame.font.SysFont(None, 18)
+            sym_font = get_font(None, 18)
             symbols = ['-', '-', '+']
             for idx, (ox, oy) in enumerate(detents):
                 sx = cx + int(ox * 1.28)
                 sy = cy + int(oy * 1.28)
-                text = sym_font.render(symbols[idx], True, (255, 225, 110))
+                text = render_text(sym_font, symbols[idx], (255, 225, 110))
                 rect = text.get_rect(center=(sx, sy))
                 self._draw_text_with_outline(surf, text, rect.x, rect.y)
 
@@ -459,8 +461,8 @@ class UIManager:
             radius = 20
 
             try:
-                title_font = pygame.font.SysFont(None, 14)
-                title_text = title_font.render('PNEUS', True, (150, 255, 170))
+                title_font = get_font(None, 14)
+                title_text = render_text(title_font, 'PNEUS', (150, 255, 170))
                 title_x = cx - title_text.get_width() // 2
                 title_y = cy - 60
                 self._draw_text_with_outline(surf, title_text, title_x, title_y)
@@ -490,12 +492,12 @@ class UIManager:
                     pygame.draw.circle(surf, (40, 40, 40), (dot_x, dot_y), 4)
                     pygame.draw.circle(surf, (185, 185, 185), (dot_x, dot_y), 2)
 
-            sym_font = pygame.font.SysFont(None, 16)
+            sym_font = get_font(None, 16)
             symbols = ['E', '-', 'D']
             for idx, (ox, oy) in enumerate(detents):
                 sx = cx + int(ox * 1.28)
                 sy = cy + int(oy * 1.28)
-                text = sym_font.render(symbols[idx], True, (255, 225, 110))
+                text = render_text(sym_font, symbols[idx], (255, 225, 110))
                 rect = text.get_rect(center=(sx, sy))
                 self._draw_text_with_outline(surf, text, rect.x, rect.y)
 
@@ -526,8 +528,8 @@ class UIManager:
             
             # Draw title "LUZES" above the lever
             try:
-                title_font = pygame.font.SysFont(None, 14)
-                title_text = title_font.render('LUZES', True, (150, 255, 170))
+                title_font = get_font(None, 14)
+                title_text = render_text(title_font, 'LUZES', (150, 255, 170))
                 title_x = cx - title_text.get_width() // 2
                 title_y = cy - 28
                 self._draw_text_with_outline(surf, title_text, title_x, title_y)
@@ -554,9 +556,9 @@ class UIManager:
             
             # Labels: OFF (Left) and ON (Right) with black outline
             try:
-                label_font = pygame.font.SysFont(None, 16)
-                label_left = label_font.render('OFF', True, (255, 225, 110))
-                label_right = label_font.render('ON', True, (255, 225, 110))
+                label_font = get_font(None, 16)
+                label_left = render_text(label_font, 'OFF', (255, 225, 110))
+                label_right = render_text(label_font, 'ON', (255, 225, 110))
                 # Draw labels with white outline
                 left_rect = label_left.get_rect()
                 left_x = cx - 52 - (32 - left_rect.width) // 2
@@ -589,8 +591,8 @@ class UIManager:
             
             # Draw title "PNEUS" above the lever
             try:
-                title_font = pygame.font.SysFont(None, 14)
-                title_text = title_font.render('PNEUS', True, (150, 255, 170))
+                title_font = get_font(None, 14)
+                title_text = render_text(title_font, 'PNEUS', (150, 255, 170))
                 title_x = cx - title_text.get_width() // 2
                 title_y = cy - 28
                 self._draw_text_with_outline(surf, title_text, title_x, title_y)
@@ -622,9 +624,9 @@ class UIManager:
             
             # Labels: FRENTE (Up) and TRÁS (Down) with black outline (inverted)
             try:
-                label_font = pygame.font.SysFont(None, 14)
-                label_up = label_font.render('FRENTE', True, (255, 225, 110))
-                label_down = label_font.render('TRÁS', True, (255, 225, 110))
+                label_font = get_font(None, 14)
+                label_up = render_text(label_font, 'FRENTE', (255, 225, 110))
+                label_down = render_text(label_font, 'TRÁS', (255, 225, 110))
                 # Draw labels with white outline
                 up_rect = label_up.get_rect()
                 up_x = cx - up_rect.width // 2
@@ -719,14 +721,24 @@ class UIManager:
             if path is None:
                 return
             self.image_dir = str(path)
+            if self._prefetcher is not None:
+                self.prefetch_images()
         except Exception:
             pass
 
+    def prefetch_images(self):
+        """Start loading every img_<ID>.bmp of image_dir on a background thread."""
+        try:
+            self._prefetcher = ImagePrefetcher(self.image_dir).start()
+        except Exception:
+            self._prefetcher = None
+
     def set_panel_size(self, width, height):
         """Resize the UI panel where BMPs are drawn."""
         try:
             self.panel_rect.width = int(width)
             self.panel_rect.height = int(height)
+            self._scaled_images.invalidate()
         except Exception:
             pass
 
@@ -759,7 +771,10 @@ class UIManager:
         try:
             # Debug: remember attempted path
             self._last_image_load_path = fp
-            surf = pygame.image.load(fp)
+            # already loaded by the background prefetch, or from disk now
+            surf = self._prefetcher.take(key) if self._prefetcher is not None else None
+            if surf is None:
+                surf = pygame.image.load(fp)
             # convert to display format (keep alpha if present)
             try:
                 surf = surf.convert_alpha()
@@ -802,6 +817,9 @@ class UIManager:
             try:
                 if key in self._image_cache:
                     del self._image_cache[key]
+                self._scaled_images.invalidate(key)
+                if self._prefetcher is not None:
+                    self._prefetcher.take(key)
             except Exception:
                 pass
         # Set the current id; actual loading is lazy and happens in draw()
@@ -816,6 +834,42 @@ class UIManager:
         except Exception:
             pass
 
+    def state_key(self, surf=None, mode_text=None, warning=None):
+        """Everything draw() reads in image-only mode, as a hashable tuple.
+
+        Two calls with equal keys draw the same pixels, so a caller can keep the
+        panel in an offscreen surface and redraw it only when the key changes
+        (game/rendering.py RetainedSidePanel). Returns None for the legacy
+        screens, which read too much state: redraw those every frame.
+        """
+        if not self.image_only:
+            return None
+        if surf is None:
+            surf = self.screen
+        try:
+            import sys
+            main_module = sys.modules.get('__main__')
+            player = self.player
+            image = self._current_image_surface
+            return (
+                surf.get_size(),
+                tuple(self.panel_rect),
+                mode_text,
+                warning,
+                self._current_image_id,
+                id(image) if image is not None else None,
+                self.image_scale_mode,
+                self.image_preserve_aspect,
+                self.controls_group_y_offset,
+                getattr(player, 'curve_mode', None),
+                getattr(player, 'speed_mode', None),
+                tuple(getattr(player, 'lights', None) or ()),
+                getattr(main_module, 'lever_mode_position', 0),
+                getattr(main_module, 'lever_speed_position', 1),
+            )
+        except Exception:
+            return None
+
     def draw(self, surf=None, mode_text=None, warning=None):
         # ensure we have a surface reference early
         if surf is None:
@@ -912,10 +966,12 @@ class UIManager:
                         else:
                             target_size = (target_w, target_h)
                         if img.get_size() != target_size:
-                            if getattr(self, 'image_scale_mode', 'nearest') == 'smooth':
-                                img = pygame.transform.smoothscale(img, target_size)
-                            else:
-                                img = pygame.transform.scale(img, target_size)
+                            # scaled once per (id, size, mode); a new screen size (fullscreen) drops them
+                            if self._scaled_for_size != (sw, sh):
+                                self._scaled_images.invalidate()
+                                self._scaled_for_size = (sw, sh)
+                            img = self._scaled_images.get(self._current_image_id, img, target_size,
+                                                          getattr(self, 'image_scale_mode', 'nearest'))
                         # Center image horizontally and anchor it near the bottom of the image area
                         dx = self.panel_rect.x + (self.panel_rect.width - img.get_width()) // 2
                         dy = image_area_top + image_area_h - img.get_height()
@@ -936,7 +992,7 @@ class UIManager:
                         pygame.draw.rect(surf, (30, 30, 30), ph_rect)
                         pygame.draw.rect(surf, (200, 0, 0), ph_rect, 2)
                         label = f'Missing: img_{self._current_image_id or "<ID>"}.bmp'
-                        t = self.font.render(label, True, (255, 255, 255))
+                        t = render_text(self.font, label, (255, 255, 255))
                         tx = ph_rect.x + (ph_rect.width - t.get_width())//2
                         ty = ph_rect.y + (ph_rect.height - t.get_height())//2
                         surf.blit(t, (tx, ty))
@@ -955,7 +1011,7 @@ class UIManager:
         pygame.draw.rect(surf, (255, 255, 255), self.panel_rect)
         pygame.draw.rect(surf, (200, 0, 0), self.panel_rect, 2)
         if not self.screens:
-            t = self.font.render('Panel (empty)', True, (255, 255, 255))
+            t = render_text(self.font, 'Panel (empty)', (255, 255, 255))
             self._draw_text_with_outline(surf, t, self.panel_rect.x + 8, self.panel_rect.y + 8)
             return
         title = self.screens[self.current].get('title', '')
@@ -990,15 +1046,15 @@ class UIManager:
             if blue_sirene:
                 # Draw a larger blue ball, then white exclamation
                 pygame.draw.circle(surf, (0,70,220), (ex_x, ex_y), 12)
-                excl = self.font.render('!', True, (255,255,255))
+                excl = render_text(self.font, '!', (255,255,255))
                 surf.blit(excl, (ex_x-5, ex_y-8))
             else:
                 pygame.draw.circle(surf, (255,255,255), (ex_x, ex_y), 8)
-                excl = self.font.render('!', True, (0,70,220))
+                excl = render_text(self.font, '!', (0,70,220))
                 surf.blit(excl, (ex_x-5, ex_y-8))
             # Mode text - always white with black outline
             mode_str = mode_text or 'Modo: desconhecido'
-            mode_render = self.font.render(mode_str, True, (255, 255, 255))
+            mode_render = render_text(self.font, mode_str, (255, 255, 255))
             mode_x = ex_x + 18
             self._draw_text_with_outline(surf, mode_render, mode_x, top_y)
 
@@ -1021,7 +1077,7 @@ class UIManager:
             # Bottom row: right side selectable 'Menu' and arrow
             menu_str = 'Menu'
             menu_selected = (self.selected == 0)
-            menu_render = self.font.render(menu_str, True, (255, 255, 255))
+            menu_render = render_text(self.font, menu_str, (255, 255, 255))
             menu_bg_rect = menu_render.get_rect()
             menu_bg_rect.x = self.panel_rect.right - menu_render.get_width() - 24 - pad
             menu_bg_rect.y = self.panel_rect.bottom - menu_render.get_height() - pad
@@ -1060,11 +1116,11 @@ class UIManager:
             aviso_pad = pad
             for idx, (warn_text, warn_type) in enumerate(warnings_to_show):
                 aviso_label = 'Aviso: '
-                aviso_label_render = self.font.render(aviso_label, True, (255,255,255))
+                aviso_label_render = render_text(self.font, aviso_label, (255,255,255))
                 is_erro = (warn_text == 'ERRO')
                 erro_selected = (self.selected == 1 and is_erro)
                 if warn_type == 'battery':
-                    warn_render = self.font.render(warn_text, True, (255,255,255))
+                    warn_render = render_text(self.font, warn_text, (255,255,255))
                     bg_rect = warn_render.get_rect()
                     bg_rect.x = self.panel_rect.x + aviso_pad + aviso_label_render.get_width()
                     bg_rect.y = self.panel_rect.bottom - warn_render.get_height()*(len(warnings_to_show)-idx) - pad
@@ -1075,7 +1131,7 @@ class UIManager:
                     self._draw_text_with_outline(surf, warn_render, bg_rect.x + 4, bg_rect.y)
                 else:
                     # ERRO or custom
-                    warn_render = self.font.render(warn_text, True, (255,255,255))
+                    warn_render = render_text(self.font, warn_text, (255,255,255))
                     y_pos_label = self.panel_rect.bottom - aviso_label_render.get_height()*(len(warnings_to_show)-idx) - pad
                     x_base = self.panel_rect.x + aviso_pad
                     if erro_selected:
@@ -1095,10 +1151,10 @@ class UIManager:
             # Render header title (keep title at top)
             title_text = 'MENU'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # draw a back-arrow button at the top-left of the panel to indicate "volta"
@@ -1131,7 +1187,7 @@ class UIManager:
             if len(opts) > 0:
                 label0 = opts[0][0]
                 selected0 = (self.selected == 0)
-                txt0 = self.font.render(label0, True, (255,255,255) if selected0 else (0,70,220))
+                txt0 = render_text(self.font, label0, (255,255,255) if selected0 else (0,70,220))
                 txt_w0 = txt0.get_width()
                 btn_w = min(self.panel_rect.width - 24, txt_w0 + 24)
                 btn_x = self.panel_rect.x + (self.panel_rect.width - btn_w) // 2
@@ -1147,7 +1203,7 @@ class UIManager:
             bottom_opts = opts[1:]
             if bottom_opts:
                 gap = 12
-                texts = [self.font.render(o[0], True, (0,70,220)) for o in bottom_opts]
+                texts = [render_text(self.font, o[0], (0,70,220)) for o in bottom_opts]
                 txt_widths = [t.get_width() for t in texts]
                 total_text_w = sum(txt_widths)
                 btn_w_available = self.panel_rect.width - 24 - gap * (len(bottom_opts)-1)
@@ -1166,10 +1222,10 @@ class UIManager:
                     # white background and blue text when unselected; blue bg and white text when selected
                     if sel:
                         pygame.draw.rect(surf, (0,70,220), (x, oy, w, h))
-                        txt = self.font.render(label, True, (255,255,255))
+                        txt = render_text(self.font, label, (255,255,255))
                     else:
                         pygame.draw.rect(surf, (255,255,255), (x, oy, w, h))
-                        txt = self.font.render(label, True, (0,70,220))
+                        txt = render_text(self.font, label, (0,70,220))
                     self._draw_text_with_outline(surf, txt, x + (w - txt.get_width())//2, oy + 4)
                     x += w + gap
             return
@@ -1177,10 +1233,10 @@ class UIManager:
             # FS_MENU: Title 'Funções' and two stacked options (Funções Basicas, Funções Avançadas)
             title_text = 'Funções'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left (same place as Menu_01)
@@ -1206,7 +1262,7 @@ class UIManager:
             spacing = self.font.get_height() + 10
             for idx, (label, _) in enumerate(opts):
                 sel = (self.selected == idx)
-                txt = self.font.render(label, True, (255,255,255) if sel else (0,70,220))
+                txt = render_text(self.font, label, (255,255,255) if sel else (0,70,220))
                 w = txt.get_width() + 20
                 h = self.font.get_height() + 8
                 x = self.panel_rect.x + (self.panel_rect.width - w)//2
@@ -1221,10 +1277,10 @@ class UIManager:
             # FS_ADVANCED: Title 'Funções Avançadas' and two stacked options
             title_text = 'Funções Avançadas'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (255,255,255))
+            header_render = render_text(header_font, title_text, (255,255,255))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left (same as other submenus)
@@ -1251,7 +1307,7 @@ class UIManager:
             rects = []
             for idx, (label, _) in enumerate(opts):
                 sel = (self.selected == idx)
-                txt = self.font.render(label, True, (255,255,255) if sel else (0,70,220))
+                txt = render_text(self.font, label, (255,255,255) if sel else (0,70,220))
                 w = txt.get_width() + 20
                 h = self.font.get_height() + 8
                 x = self.panel_rect.x + (self.panel_rect.width - w)//2
@@ -1271,10 +1327,10 @@ class UIManager:
             # FS_OPMODE: Title 'Modo operação' and two stacked options: Malha aberta / Malha fechada
             title_text = 'Modo operação'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1301,7 +1357,7 @@ class UIManager:
             rects = []
             for idx, (label, _) in enumerate(opts):
                 sel = (self.selected == idx)
-                txt = self.font.render(label, True, (255,255,255) if sel else (0,70,220))
+                txt = render_text(self.font, label, (255,255,255) if sel else (0,70,220))
                 w = txt.get_width() + 20
                 h = self.font.get_height() + 8
                 x = self.panel_rect.x + (self.panel_rect.width - w)//2
@@ -1321,10 +1377,10 @@ class UIManager:
             # FS_LIGHTS: Title 'Luz sinalizadora' and two side-by-side options Habilitar/Desabilitar
             title_text = 'Luz sinalizadora'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1348,7 +1404,7 @@ class UIManager:
             opts = self._opts()
             opt_labels = [o[0] for o in opts[:2]]
             gap = 16
-            texts = [self.font.render(l, True, (0,70,220)) for l in opt_labels]
+            texts = [render_text(self.font, l, (0,70,220)) for l in opt_labels]
             txt_widths = [t.get_width() for t in texts]
             btn_ws = [w + 24 for w in txt_widths]
             total_w = sum(btn_ws) + gap * (len(btn_ws)-1)
@@ -1362,10 +1418,10 @@ class UIManager:
                 h = self.font.get_height() + 8
                 if sel:
                     pygame.draw.rect(surf, (0,70,220), (x, oy, w, h))
-                    txt = self.font.render(label, True, (255,255,255))
+                    txt = render_text(self.font, label, (255,255,255))
                 else:
                     pygame.draw.rect(surf, (255,255,255), (x, oy, w, h))
-                    txt = self.font.render(label, True, (0,70,220))
+                    txt = render_text(self.font, label, (0,70,220))
                 surf.blit(txt, (x + (w - txt.get_width())//2, oy + 4))
                 rects.append(pygame.Rect(x, oy, w, h))
                 x += w + gap
@@ -1378,10 +1434,10 @@ class UIManager:
             # Sensores screen: title and arrows both sides, two layers of info
             title_text = 'Sensores'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # left back arrow
@@ -1417,7 +1473,7 @@ class UIManager:
             surf.blit(header_render, (hx, hy))
 
             # hint arrow: right arrow key should go to second sensores page
-            hint = self.font.render('→', True, (0,70,220))
+            hint = render_text(self.font, '→', (0,70,220))
             try:
                 surf.blit(hint, (self.panel_rect.right - 26, hy))
             except Exception:
@@ -1428,7 +1484,7 @@ class UIManager:
                 altura_label = f'Altura: {int(self.sensor_altura)} cm'
             except Exception:
                 altura_label = f'Altura: {self.sensor_altura} cm'
-            txt0 = self.font.render(altura_label, True, (0,70,220))
+            txt0 = render_text(self.font, altura_label, (0,70,220))
             content_w = self.panel_rect.width - 24
             h0 = self.font.get_height() + 8
             x0 = self.panel_rect.x + 12
@@ -1438,7 +1494,7 @@ class UIManager:
 
             # Second layer: Inclin X / Y
             inclin_label = f'Inclin: X: {int(self.inclin_x)}     Y: {int(self.inclin_y)}'
-            txt1 = self.font.render(inclin_label, True, (0,70,220))
+            txt1 = render_text(self.font, inclin_label, (0,70,220))
             content_w = self.panel_rect.width - 24
             h1 = self.font.get_height() + 8
             x1 = self.panel_rect.x + 12
@@ -1450,10 +1506,10 @@ class UIManager:
             # Second Sensores page: same header, show Anq. esterçamento and Velocidade
             title_text = 'Sensores'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1478,7 +1534,7 @@ class UIManager:
                 anq_label = f'Anq. esterçamento: {int(self.anq_est)}'
             except Exception:
                 anq_label = f'Anq. esterçamento: {self.anq_est}'
-            txt0 = self.font.render(anq_label, True, (0,70,220))
+            txt0 = render_text(self.font, anq_label, (0,70,220))
             content_w = self.panel_rect.width - 24
             h0 = self.font.get_height() + 8
             x0 = self.panel_rect.x + 12
@@ -1491,7 +1547,7 @@ class UIManager:
                 vel_label = f'Velocidade : {float(self.velocidade):.2f} m/s'
             except Exception:
                 vel_label = f'Velocidade : {self.velocidade} m/s'
-            txt1 = self.font.render(vel_label, True, (0,70,220))
+            txt1 = render_text(self.font, vel_label, (0,70,220))
             h1 = self.font.get_height() + 8
             x1 = self.panel_rect.x + 12
             y1 = y0 + h0 + 8
@@ -1502,10 +1558,10 @@ class UIManager:
             # FS_BASIC: Title 'Funções Básicas' and two side-by-side centered options
             title_text = 'Funções Básicas'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left (same place as other submenus)
@@ -1530,7 +1586,7 @@ class UIManager:
             # Render only first two options if present
             opt_labels = [o[0] for o in opts[:2]]
             gap = 16
-            texts = [self.font.render(l, True, (0,70,220)) for l in opt_labels]
+            texts = [render_text(self.font, l, (0,70,220)) for l in opt_labels]
             txt_widths = [t.get_width() for t in texts]
             btn_ws = [w + 24 for w in txt_widths]
             total_w = sum(btn_ws) + gap * (len(btn_ws)-1)
@@ -1544,10 +1600,10 @@ class UIManager:
                 h = self.font.get_height() + 8
                 if sel:
                     pygame.draw.rect(surf, (0,70,220), (x, oy, w, h))
-                    txt = self.font.render(label, True, (255,255,255))
+                    txt = render_text(self.font, label, (255,255,255))
                 else:
                     pygame.draw.rect(surf, (255,255,255), (x, oy, w, h))
-                    txt = self.font.render(label, True, (0,70,220))
+                    txt = render_text(self.font, label, (0,70,220))
                 surf.blit(txt, (x + (w - txt.get_width())//2, oy + 4))
                 rects.append(pygame.Rect(x, oy, w, h))
                 x += w + gap
@@ -1577,10 +1633,10 @@ class UIManager:
             # Autonivelamento screen with two side-by-side options: Habilitar / Desabilitar
             title_text = 'Autonivelamento'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1604,7 +1660,7 @@ class UIManager:
             opts = self._opts()
             opt_labels = [o[0] for o in opts[:2]]
             gap = 16
-            texts = [self.font.render(l, True, (0,70,220)) for l in opt_labels]
+            texts = [render_text(self.font, l, (0,70,220)) for l in opt_labels]
             txt_widths = [t.get_width() for t in texts]
             btn_ws = [w + 24 for w in txt_widths]
             total_w = sum(btn_ws) + gap * (len(btn_ws)-1)
@@ -1618,10 +1674,10 @@ class UIManager:
                 h = self.font.get_height() + 8
                 if sel:
                     pygame.draw.rect(surf, (0,70,220), (x, oy, w, h))
-                    txt = self.font.render(label, True, (255,255,255))
+                    txt = render_text(self.font, label, (255,255,255))
                 else:
                     pygame.draw.rect(surf, (255,255,255), (x, oy, w, h))
-                    txt = self.font.render(label, True, (0,70,220))
+                    txt = render_text(self.font, label, (0,70,220))
                 surf.blit(txt, (x + (w - txt.get_width())//2, oy + 4))
                 rects.append(pygame.Rect(x, oy, w, h))
                 x += w + gap
@@ -1634,10 +1690,10 @@ class UIManager:
             # Freio screen with two side-by-side options: Habilitar / Desabilitar
             title_text = 'Freio'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.2))
+                header_font = get_font(None, int(self.font.get_height() * 1.2))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1661,7 +1717,7 @@ class UIManager:
             opts = self._opts()
             opt_labels = [o[0] for o in opts[:2]]
             gap = 16
-            texts = [self.font.render(l, True, (0,70,220)) for l in opt_labels]
+            texts = [render_text(self.font, l, (0,70,220)) for l in opt_labels]
             txt_widths = [t.get_width() for t in texts]
             btn_ws = [w + 24 for w in txt_widths]
             total_w = sum(btn_ws) + gap * (len(btn_ws)-1)
@@ -1675,10 +1731,10 @@ class UIManager:
                 h = self.font.get_height() + 8
                 if sel:
                     pygame.draw.rect(surf, (0,70,220), (x, oy, w, h))
-                    txt = self.font.render(label, True, (255,255,255))
+                    txt = render_text(self.font, label, (255,255,255))
                 else:
                     pygame.draw.rect(surf, (255,255,255), (x, oy, w, h))
-                    txt = self.font.render(label, True, (0,70,220))
+                    txt = render_text(self.font, label, (0,70,220))
                 surf.blit(txt, (x + (w - txt.get_width())//2, oy + 4))
                 rects.append(pygame.Rect(x, oy, w, h))
                 x += w + gap
@@ -1692,10 +1748,10 @@ class UIManager:
             # wheel index stored in self._fs_select_columns_config_wheel
             title_text = 'Configurar roda'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.1))
+                header_font = get_font(None, int(self.font.get_height() * 1.1))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1725,13 +1781,13 @@ class UIManager:
                 wheel_label = f'Roda {wheel_names[widx]}'
             except Exception:
                 wheel_label = 'Roda'
-            wl_txt = self.font.render(wheel_label, True, (0,70,220))
+            wl_txt = render_text(self.font, wheel_label, (0,70,220))
             surf.blit(wl_txt, (self.panel_rect.x + (self.panel_rect.width - wl_txt.get_width())//2, hy + header_render.get_height() + 6))
 
             # two side-by-side options: Habilitar / Desabilitar
             opt_labels = ['Habilitar', 'Desabilitar']
             gap = 16
-            texts = [self.font.render(l, True, (0,70,220)) for l in opt_labels]
+            texts = [render_text(self.font, l, (0,70,220)) for l in opt_labels]
             txt_widths = [t.get_width() for t in texts]
             btn_ws = [w + 24 for w in txt_widths]
             total_w = sum(btn_ws) + gap * (len(btn_ws)-1)
@@ -1745,10 +1801,10 @@ class UIManager:
                 h = self.font.get_height() + 8
                 if sel:
                     pygame.draw.rect(surf, (0,70,220), (x, oy, w, h))
-                    txt = self.font.render(label, True, (255,255,255))
+                    txt = render_text(self.font, label, (255,255,255))
                 else:
                     pygame.draw.rect(surf, (255,255,255), (x, oy, w, h))
-                    txt = self.font.render(label, True, (0,70,220))
+                    txt = render_text(self.font, label, (0,70,220))
                 surf.blit(txt, (x + (w - txt.get_width())//2, oy + 4))
                 rects.append(pygame.Rect(x, oy, w, h))
                 x += w + gap
@@ -1761,10 +1817,10 @@ class UIManager:
             # Small robot drawing with 4 wheel selectable rectangles (TL, TR, BL, BR)
             title_text = 'Selecionar colunas'
             try:
-                header_font = pygame.font.SysFont(None, int(self.font.get_height() * 1.1))
+                header_font = get_font(None, int(self.font.get_height() * 1.1))
             except Exception:
                 header_font = self.font
-            header_render = header_font.render(title_text, True, (0,70,220))
+            header_render = render_text(header_font, title_text, (0,70,220))
             hx = self.panel_rect.x + (self.panel_rect.width - header_render.get_width()) // 2
             hy = self.panel_rect.y + 6
             # back arrow at top-left
@@ -1845,7 +1901,7 @@ class UIManager:
             return
         else:
             # Default: draw title and options horizontally
-            t = self.font.render(title, True, (255, 255, 255))
+            t = render_text(self.font, title, (255, 255, 255))
             surf.blit(t, (self.panel_rect.x + 8, self.panel_rect.y + 8))
             oy = self.panel_rect.y + 8 + t.get_height() + 8
             x = self.panel_rect.x + 8
@@ -1853,7 +1909,7 @@ class UIManager:
             for idx, (label, _) in enumerate(self._opts()):
                 txt_color = (255, 255, 255) if idx == self.selected else (0, 70, 220)
                 bg_color = (0, 70, 220) if idx == self.selected else None
-                txt = self.font.render(label, True, txt_color)
+                txt = render_text(self.font, label, txt_color)
                 item_w = txt.get_width() + 12
                 if bg_color:
                     pygame.draw.rect(surf, bg_color, (x - 6, oy - 2, item_w + 6, self.font.get_height() + 4))
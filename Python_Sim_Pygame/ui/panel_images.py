@@ -0,0 +1,131 @@
+"""
+Panel images module - Prefetched and prescaled BMPs for the UIManager image area.
+
+The external system switches the panel image (img_<ID>.bmp) over CAN id
+0x210, and UIManager.draw used to load an image from disk on its first
+frame and rescale it on every frame. ImagePrefetcher loads the whole image
+folder on a background thread at startup, so a switch does not wait for the
+disk; ScaledImageCache keeps the image scaled to the image area, keyed by
+(image id, target size, scale mode). UIManager clears it when the panel or
+the screen changes size (set_panel_size, fullscreen toggle).
+
+Surfaces are only loaded on the thread: converting them to the display
+format stays on the main thread (UIManager._load_image_for_id).
+"""
+
+import glob
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+# Scaled images kept by ScaledImageCache (one per id at a given panel size)
+SCALED_IMAGE_CACHE_MAX_ENTRIES = 128
+
+IMAGE_PATTERN = 'img_*.bmp'
+
+
+def image_id_for_path(path):
+    """'.../img_0C.bmp' -> '0C'."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name[len('img_'):]
+
+
+def scale_image(image, target_size, mode='nearest'):
+    """image at target_size: smoothscale for mode 'smooth', scale otherwise (as UIManager.draw did)."""
+    if mode == 'smooth':
+        return pygame.transform.smoothscale(image, target_size)
+    return pygame.transform.scale(image, target_size)
+
+
+class ImagePrefetcher:
+    """Loads every img_<ID>.bmp of a folder on a daemon thread."""
+
+    def __init__(self, image_dir):
+        self.image_dir = image_dir
+        self._images = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.loaded = 0
+        self.errors = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='panel-image-prefetch', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        for path in sorted(glob.glob(os.path.join(self.image_dir, IMAGE_PATTERN))):
+            try:
+                image = pygame.image.load(path)
+            except Exception:
+                self.errors += 1
+                continue
+            with self._lock:
+                self._images[image_id_for_path(path)] = image
+            self.loaded += 1
+
+    @property
+    def done(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def take(self, image_id):
+        """The loaded (not converted) surface for image_id, once; None if not loaded (yet)."""
+        with self._lock:
+            return self._images.pop(str(image_id), None)
+
+
+class ScaledImageCache:
+    """LRU cache of panel images scaled to a target size, keyed by (image id, target size, mode)."""
+
+    def __init__(self, max_entries=SCALED_IMAGE_CACHE_MAX_ENTRIES):
+        self.max_entries = int(max_entries)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, image_id=None):
+        """Drop every scaled image, or only those of image_id."""
+        if image_id is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == image_id]:
+                del self._entries[key]
+        self.invalidations += 1
+
+    def get(self, image_id, image, target_size, mode='nearest'):
+        """`image` (the surface loaded for image_id) scaled to target_size, cached."""
+        # id(image): a reloaded image (force_reload) is scaled again
+        key = (image_id, tuple(target_size), mode, id(image))
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = scale_image(image, key[1], mode)
+        if self.max_entries > 0:
+            self._entries[key] = surface
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+        }
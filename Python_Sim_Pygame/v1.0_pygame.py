@@ -17,6 +17,7 @@ import pygame
 import math
 import os
 import sys
+import time
 
 from game.tutorial_progress import (
     get_next_tutorial_map,
@@ -31,7 +32,7 @@ from game.config import (
     DEFAULT_HARDCORE_MODE, DEFAULT_FULLSCREEN_MODE, DEFAULT_TTC_CONTROL,
     CAN_MOVEMENT_NEUTRAL, CAN_MOVEMENT_MAX, CAN_MOVEMENT_MIN,
     ACCELEROMETER_MAX_VALUE, TRAFO_DEATH_LOCK_MS, TRAFO_PICKUP_DISPLAY_MS,
-    COLOR_SKY_BLUE,
+    COLOR_SKY_BLUE, PROXIMITY_WARNING_PX, LATENCY_CSV_DIR,
 )
 
 # Import modules
@@ -39,21 +40,23 @@ from game.initialization import setup_game_objects
 from game.input_handler import InputHandler
 from game.collision import (
     find_green_center, find_blue_center, check_player_collision_with_map, 
-    poly_rect_collision, line_rect_collision
+    sweep_player_collision_with_map, poly_rect_collision, line_rect_collision
 )
 from game.accelerometer import (
     calculate_accelerometer_value, determine_light_mode, get_icamento_mm,
     can_pickup_trafo,
 )
 from game.rendering import (
-    draw_map, draw_ui_panels, draw_hud_info, draw_trafo_carried_badge,
+    draw_map, draw_hud_info, draw_trafo_carried_badge,
     draw_trafo_pickup_indicator, draw_collision_overlay, setup_world_view_rect,
+    RetainedSidePanel, FramePresenter, draw_latency_overlay,
 )
 
 # Import UI
 from ui.menu_screen import run_start_menu
 from ui.control_screen import run_control_screen
 from ui.pausemenu import create_pause_menu
+from ui.fonts import get_font, render_text
 
 try:
     from ui.screens.map_select_screen import run_map_select_menu, run_tutorial_select_menu
@@ -398,7 +401,11 @@ game_state = setup_game_objects(screen=None, selected_map_path=selected_map_path
 # Extract game objects
 screen = game_state['screen']
 map_image = game_state['map_image']
+map_tiles = game_state.get('map_tiles')
 collision_grid = game_state['collision_grid']
+footprints = game_state.get('footprints')
+distance_field = game_state.get('distance_field')
+distance_field_pending = game_state.get('distance_field_pending')
 dialogue_manager = game_state['dialogue_manager']
 player = game_state['player']
 camera = game_state['camera']
@@ -408,6 +415,8 @@ joystick_controller = game_state['joystick_controller']
 joystick_available = game_state['joystick_available']
 spawn_point = game_state['spawn_point']
 event_map = game_state['event_map']
+# shared by every map (game/latency.py shared_latency_tracer)
+latency_tracer = game_state.get('latency_tracer')
 
 # ===== APPLY EventMap PHASE CONFIGURATIONS =====
 # Remover trafo se a configuração do mapa diz para não spawnar
@@ -444,6 +453,7 @@ tutorial_completion_zone = None
 
 can_movement_value = CAN_MOVEMENT_NEUTRAL
 current_accelerometer_value = 0
+hitbox_clearance = None
 trafo_pickup_time = 0
 trafo_death_expire = 0
 
@@ -452,6 +462,10 @@ lever_state = {
     'speed_position': 1,
 }
 
+# Side panel redrawn only when its state changes; frames show only the changed rects
+side_panel = RetainedSidePanel(PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
+frame_presenter = FramePresenter()
+
 # Setup UI screens
 setup_ui_screens()
 init_tutorial_state(selected_map_path, dialogue_manager, event_map)
@@ -511,6 +525,23 @@ trafo_caused_death = False
 LOGIC_TICK_TIME = 16.67  # ms (1000 / 60)
 accumulated_time = 0.0   # acumulador de tempo real
 
+# Overlay de latência da entrada (F3); F4 exporta as amostras em CSV
+show_latency_overlay = False
+
+
+def export_latency_csv():
+    """Write the input latency samples to LATENCY_CSV_DIR (F4)."""
+    if latency_tracer is None:
+        return
+    try:
+        csv_path = os.path.join(PROJECT_ROOT, LATENCY_CSV_DIR,
+                                time.strftime('input_latency_%Y%m%d_%H%M%S.csv'))
+        rows = latency_tracer.export_csv(csv_path)
+        print(f"[Latency] {rows} amostras exportadas para {csv_path}")
+    except Exception as e:
+        print(f"[Latency] Erro ao exportar CSV: {e}")
+
+
 while running:
     # Render loop sem limite de FPS. A lógica usa fixed timestep de 60 ticks.
     dt_real = clock.tick(0)  # tempo real em ms desde último frame
@@ -563,6 +594,10 @@ while running:
                     toggle_fullscreen()
                 if ev.key == pygame.K_RETURN and (ev.mod & pygame.KMOD_ALT):
                     toggle_fullscreen()
+                if ev.key == pygame.K_F3:
+                    show_latency_overlay = not show_latency_overlay
+                if ev.key == pygame.K_F4:
+                    export_latency_csv()
                 if (not pause_menu.is_open) and globals().get('ui') is not None and hasattr(globals().get('ui'), 'process_key_event'):
                     try:
                         globals().get('ui').process_key_event(ev.key)
@@ -585,6 +620,12 @@ while running:
     except Exception:
         pass
 
+    # Distance field still being built in the background (cold map cache)
+    if distance_field is None and distance_field_pending is not None:
+        distance_field = distance_field_pending.result()
+        if distance_field is not None:
+            distance_field_pending = None
+
     # ========== FIXED LOGIC TIMESTEP (60 ticks/segundo) ==========
     # Processa quantos ticks de lógica forem necessários
     while accumulated_time >= LOGIC_TICK_TIME:
@@ -595,6 +636,14 @@ while running:
         player.logic_tick_count += 1
         trafo_caused_death = False
 
+        # CAN reader thread ('notifier'): use the frames decoded since poll()
+        try:
+            if getattr(joystick_controller, 'available', False) and hasattr(joystick_controller, 'refresh'):
+                if joystick_controller.refresh():
+                    player.lights = list(joystick_controller.lights)
+        except Exception:
+            pass
+
         # Process mode change from joystick
         try:
             if getattr(joystick_controller, 'available', False) and getattr(joystick_controller, 'hasChangedMode', False):
@@ -672,6 +721,12 @@ while running:
         except Exception:
             move_speed = 3
         
+        # Pose before moving: map collision is swept from here to the new pose
+        try:
+            pre_move_pose = player.get_pose()
+        except Exception:
+            pre_move_pose = None
+
         # Process movement
         if not pause_menu.is_open:
             try:
@@ -864,7 +919,21 @@ while running:
             pass
 
         # ========== COLLISION WITH MAP ==========
-        collided = check_player_collision_with_map(player, collision_grid, map_image)
+        # Swept test between the pre-move pose and the new one: stops the
+        # robot at the contact pose instead of tunneling through thin walls
+        try:
+            collided, _time_of_impact = sweep_player_collision_with_map(
+                player, pre_move_pose, collision_grid, map_image, footprints, distance_field
+            )
+        except Exception:
+            collided = check_player_collision_with_map(player, collision_grid, map_image)
+        
+        # Near-miss warning: hitbox clearance from the distance field (no pixel scan)
+        try:
+            hitbox_clearance = (distance_field.footprint_clearance(player, limit=PROXIMITY_WARNING_PX)
+                                if distance_field else None)
+        except Exception:
+            hitbox_clearance = None
         
         if collided:
             player.set_dead()
@@ -889,6 +958,10 @@ while running:
                     toggle_fullscreen()
                 if ev.key == pygame.K_RETURN and (ev.mod & pygame.KMOD_ALT):
                     toggle_fullscreen()
+                if ev.key == pygame.K_F3:
+                    show_latency_overlay = not show_latency_overlay
+                if ev.key == pygame.K_F4:
+                    export_latency_csv()
                 if (not pause_menu.is_open) and globals().get('ui') is not None and hasattr(globals().get('ui'), 'process_key_event'):
                     try:
                         globals().get('ui').process_key_event(ev.key)
@@ -905,6 +978,9 @@ while running:
         menu_action = pause_menu.handle_input(pygame.key.get_pressed(), input_handler.prev_keys)
         if menu_action is None:
             menu_action = pending_pause_action
+        if menu_action is not None:
+            # menus draw and flip on their own: show the next frame whole
+            frame_presenter.invalidate()
         
         if menu_action == 'exit_menu':
             try:
@@ -969,7 +1045,11 @@ while running:
 
                     screen = game_state['screen']
                     map_image = game_state['map_image']
+                    map_tiles = game_state.get('map_tiles')
                     collision_grid = game_state['collision_grid']
+                    footprints = game_state.get('footprints')
+                    distance_field = game_state.get('distance_field')
+                    distance_field_pending = game_state.get('distance_field_pending')
                     dialogue_manager = game_state['dialogue_manager']
                     player = game_state['player']
                     camera = game_state['camera']
@@ -1006,6 +1086,7 @@ while running:
 
                     can_movement_value = CAN_MOVEMENT_NEUTRAL
                     current_accelerometer_value = 0
+                    hitbox_clearance = None
                     trafo_pickup_time = 0
                     trafo_death_expire = 0
                     init_tutorial_state(selected_map_path, dialogue_manager, event_map)
@@ -1046,6 +1127,7 @@ while running:
                 player.respawn(spawn_point)
             
             camera.death_screen(screen, player, reset_player)
+            frame_presenter.invalidate()
             continue
         else:
             show_collision_overlay = True
@@ -1067,10 +1149,10 @@ while running:
         pass
 
     # Draw map
-    draw_map(screen, map_image, camera, world_view_rect)
+    draw_map(screen, map_image, camera, world_view_rect, tiles=map_tiles)
 
-    # Draw UI panels
-    draw_ui_panels(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
+    # Draw UI panels (bottom bar; the side panel column is blitted with the UI manager)
+    side_panel.draw_chrome(screen)
 
     # Draw trafo
     try:
@@ -1144,23 +1226,20 @@ while running:
 
     # Draw HUD
     draw_hud_info(screen, player, camera, control_mode, hardcore_mode, 
-                  ttc_control, current_accelerometer_value, ACCELEROMETER_MAX_VALUE)
+                  ttc_control, current_accelerometer_value, ACCELEROMETER_MAX_VALUE,
+                  clearance_px=hitbox_clearance)
 
     # Draw trafo carried badge
     if 'trafo' in globals() and getattr(trafo, 'picked', False):
         draw_trafo_carried_badge(screen)
 
-    # Draw player icamento UI
-    try:
-        if hasattr(player, 'draw_icamento_ui'):
-            player.draw_icamento_ui(screen)
-    except Exception:
-        pass
+    # Player icamento UI: part of the side panel layer (RetainedSidePanel)
 
     # Draw trafo pickup indicator
     draw_trafo_pickup_indicator(screen, trafo_pickup_time)
 
-    # Draw UI manager
+    # Draw UI manager (with the panel chrome and the icamento UI, redrawn on state changes)
+    panel_dirty = []
     try:
         curve_mode = getattr(player, 'curve_mode', 'desconhecido')
         if curve_mode in ('straight', 'curve'):
@@ -1185,7 +1264,7 @@ while running:
         if warning and warning.lower() == 'erro':
             warning = 'ERRO'
         
-        ui.draw(screen, mode_text=mode_text, warning=warning)
+        panel_dirty = side_panel.draw(screen, ui, player, mode_text=mode_text, warning=warning)
     except Exception:
         pass
 
@@ -1210,11 +1289,11 @@ while running:
             viewport_h = max(1, screen.get_height() - BOTTOM_BAR_HEIGHT)
             viewport_rect = pygame.Rect(0, 0, viewport_w, viewport_h)
 
-            title_font = pygame.font.SysFont(None, 86)
-            sub_font = pygame.font.SysFont(None, 34)
+            title_font = get_font(None, 86)
+            sub_font = get_font(None, 34)
 
-            title = title_font.render('FASE CONCLUIDA', True, (236, 255, 244))
-            subtitle = sub_font.render('Proxima fase desbloqueada', True, (198, 232, 255))
+            title = render_text(title_font, 'FASE CONCLUIDA', (236, 255, 244))
+            subtitle = render_text(sub_font, 'Proxima fase desbloqueada', (198, 232, 255))
 
             content_w = max(title.get_width(), subtitle.get_width())
             content_h = title.get_height() + 12 + subtitle.get_height()
@@ -1235,7 +1314,7 @@ while running:
             subtitle_x = box_x + (box_w - subtitle.get_width()) // 2
             subtitle_y = title_y + title.get_height() + 12
 
-            shadow = title_font.render('FASE CONCLUIDA', True, (10, 18, 30))
+            shadow = render_text(title_font, 'FASE CONCLUIDA', (10, 18, 30))
             screen.blit(shadow, (title_x + 2, title_y + 2))
             screen.blit(title, (title_x, title_y))
             screen.blit(subtitle, (subtitle_x, subtitle_y))
@@ -1246,7 +1325,19 @@ while running:
     if show_collision_overlay:
         draw_collision_overlay(screen, PANEL_WIDTH, BOTTOM_BAR_HEIGHT)
 
-    pygame.display.flip()
+    # Input latency overlay (F3)
+    if show_latency_overlay and latency_tracer is not None:
+        draw_latency_overlay(screen, latency_tracer, world_view_rect)
+
+    # Changed rects: the world view and the bottom bar every frame, the side panel when redrawn.
+    # The pause menu covers the whole screen: flip it (and the frame after it) whole.
+    bottom_bar_rect = pygame.Rect(0, world_view_rect.bottom, world_view_rect.width,
+                                  max(0, screen.get_height() - world_view_rect.bottom))
+    frame_presenter.present(screen, [world_view_rect, bottom_bar_rect] + panel_dirty,
+                            full=bool(getattr(pause_menu, 'is_open', False)))
+    # the joystick frames used by this frame's ticks are on screen now
+    if latency_tracer is not None:
+        latency_tracer.displayed()
 
 
 _close_joystick_controller(joystick_controller)
@@ -2,9 +2,10 @@
 import turtle
 import GVL
 import uptime # Módulo para verificar o tempo de atividade do sistema
-import struct # Módulo para empacotar e desempacotar dados binários 
 import time   # Módulo com funções de manipulação de tempo  
 import can    # Módulo Python-CAN para comunicação via barramento CAN
+# Tabela de codecs CAN (um struct.Struct pré-compilado por ID), igual à do simulador pygame
+from Application.can_codec import RX_CODECS, JOYSTICK_ID, SELECTOR_ID, LIGHTS_ID
 
 # Inicializa o pygame e o módulo de joystick
 
@@ -12,9 +13,15 @@ class Joystick:
     def __init__(self):
         # Constantes de configuração
         self.BITRATE = 500000     # Taxa de transmissão CAN em bits por segundo (500 kbps)
-        self.CAN_CHANNEL_JOYSTICK = 0x200 # Canal (ID) da mensagem CAN enviada pela TTC (11 bits padrão)
-        self.CAN_CHANNEL_SELETORA = 0x201
-        self.CAN_CHANNEL_LIGHTS = 0x202
+        self.CAN_CHANNEL_JOYSTICK = JOYSTICK_ID # Canal (ID) da mensagem CAN enviada pela TTC (11 bits padrão)
+        self.CAN_CHANNEL_SELETORA = SELECTOR_ID
+        self.CAN_CHANNEL_LIGHTS = LIGHTS_ID
+        # ID -> (decodificador do codec, função que aplica o valor)
+        self.canHandlers = {
+            self.CAN_CHANNEL_JOYSTICK: (RX_CODECS[JOYSTICK_ID].decode, self.onJoystickFrame),
+            self.CAN_CHANNEL_SELETORA: (RX_CODECS[SELECTOR_ID].decode, self.onSelectorFrame),
+            self.CAN_CHANNEL_LIGHTS: (RX_CODECS[LIGHTS_ID].decode, self.onLightsFrame),
+        }
         self.lights = [False, False, False, False,False] # Estado inicial das luzes (4 luzes)
         self.update_joystick()
         self.can_available = False
@@ -61,30 +68,26 @@ class Joystick:
         if not (msg is None):
             # Filtra apenas mensagens com o ID esperado e exatamente 4 bytes
             if  not msg.is_extended_id:
-                # Obtém os dados da mensagem
-                data = msg.data
-                if msg.arbitration_id == self.CAN_CHANNEL_JOYSTICK:
-                    # Decodifica dois inteiros de 2 bytes 
-                    Joystick_X_1 = struct.unpack('<h', data[0:2])[0]
-                    Joystick_Y_1 = struct.unpack('<h', data[2:4])[0]
-                    Joystick_X_2 = struct.unpack('<h', data[4:6])[0]
-                    Joystick_Y_2 = struct.unpack('<h', data[6:8])[0]
-                    # Converte para float com 1 casa decimal
-                    self.eixo_esquerdo_x = Joystick_X_1 / 10.0
-                    self.eixo_esquerdo_y = Joystick_Y_1 / 10.0
-                    self.eixo_direito_x = Joystick_X_2 / 10.0
-                    self.eixo_direito_y = Joystick_Y_2 / 10.0
-                elif msg.arbitration_id == self.CAN_CHANNEL_SELETORA:
-                    # Decodifica dois inteiros de 2 bytes 
-                    selectedMode = struct.unpack('<h', data[0:2])[0]
-                    if selectedMode != self.currentMode:
-                        self.currentMode = selectedMode
-                        self.hasChangedMode = True
-                elif msg.arbitration_id == self.CAN_CHANNEL_LIGHTS:
-                    # Decodifica o estado das luzes
-                    lightsState = struct.unpack('<B', data[0:1])[0]
-                    self.lights = [(lightsState & (1 << i)) != 0 for i in range(5)]
+                handler = self.canHandlers.get(msg.arbitration_id)
+                if handler is not None:
+                    decode, apply = handler
+                    # None: payload menor que o layout do ID, mensagem ignorada
+                    value = decode(msg.data)
+                    if value is not None:
+                        apply(value)
 
-                    
         turtle.ontimer(self.loopHearCan, GVL.CONTROLLER_TICK)
-        return
\ No newline at end of file
+        return
+
+    def onJoystickFrame(self, axes):
+        # Quatro inteiros de 2 bytes, já convertidos para float com 1 casa decimal
+        self.eixo_esquerdo_x, self.eixo_esquerdo_y, self.eixo_direito_x, self.eixo_direito_y = axes
+
+    def onSelectorFrame(self, selectedMode):
+        if selectedMode != self.currentMode:
+            self.currentMode = selectedMode
+            self.hasChangedMode = True
+
+    def onLightsFrame(self, lightsState):
+        # Estado das luzes: tupla de 5 booleanos (um bit cada)
+        self.lights = list(lightsState)
\ No newline at end of file